@@ -0,0 +1 @@
+# --- Benchmark offline do bot (python -m bench.run) ---
@@ -0,0 +1,89 @@
+import asyncio
+import itertools
+import random
+import time
+from types import SimpleNamespace
+
+# --- Discord simulado ---
+# Canais falsos que aceitam o mesmo channel.send(embed=..., file=...) usado pelo
+# bot, com latência configurável, e registram quando cada conta foi postada. O
+# anexo da grade é lido por inteiro (como o upload real) e a mensagem volta com
+# uma URL de CDN falsa, para que o reaproveitamento de anexos funcione igual.
+
+_message_ids = itertools.count(1)
+
+
+class FakeMessage:
+    def __init__(self, channel, embed, attachment_bytes):
+        self.id = next(_message_ids)
+        self.channel = channel
+        self.embeds = [embed] if embed is not None else []
+        self.attachment_bytes = attachment_bytes
+
+
+class FakeChannel:
+    """Canal de texto que só registra os envios."""
+
+    def __init__(self, sink, channel_id, name):
+        self.sink = sink
+        self.id = channel_id
+        self.name = name
+
+    async def send(self, content=None, embed=None, file=None):
+        attachment_bytes = 0
+        if file is not None:
+            attachment_bytes = len(file.fp.read())
+            if embed is not None and embed.image and str(embed.image.url).startswith("attachment://"):
+                embed.set_image(url=f"https://cdn.bench.local/attachments/{self.id}/{file.filename}")
+        await self.sink.delay()
+        message = FakeMessage(self, embed, attachment_bytes)
+        self.sink.record(self, message)
+        return message
+
+
+class DiscordSink:
+    """Conjunto de canais falsos e registro dos envios."""
+
+    def __init__(self, send_latency_ms=150, jitter_ms=50, seed=1):
+        self.send_latency_ms = send_latency_ms
+        self.jitter_ms = jitter_ms
+        self.channels = {}
+        self.sent = []  # (horário, canal, mensagem)
+        self._rng = random.Random(seed)
+        self._new_message = asyncio.Event()
+
+    def add_channel(self, channel_id, name):
+        self.channels[channel_id] = FakeChannel(self, channel_id, name)
+        return self.channels[channel_id]
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def delay(self):
+        jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        delay = max(0.0, self.send_latency_ms + jitter) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+    def record(self, channel, message):
+        self.sent.append((time.time(), channel, message))
+        self._new_message.set()
+
+    async def wait_for(self, count, timeout):
+        """Espera até haver `count` mensagens enviadas (ou o prazo acabar)."""
+        deadline = time.monotonic() + timeout
+        while len(self.sent) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._new_message.clear()
+            try:
+                await asyncio.wait_for(self._new_message.wait(), min(remaining, 1.0))
+            except asyncio.TimeoutError:
+                pass
+        return True
+
+    def attach(self, bot):
+        """Troca a busca de canais e o usuário do bot pelos falsos (sem conectar ao gateway)."""
+        bot.get_channel = self.get_channel
+        bot._connection.user = SimpleNamespace(name="bench", id=0, mention="@bench")
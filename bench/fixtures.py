@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import random
+import uuid
+from PIL import Image, ImageDraw
+
+# --- Fixtures do benchmark ---
+# Listagens, detalhes de contas, metadados de skins e ícones no formato das APIs
+# reais (LZT e valorant-api.com). Por padrão são gerados de forma determinística
+# a partir de uma semente; com um diretório gravado (skins.json com o `data` de
+# /weapons/skins e items/*.json com respostas de detalhe da LZT) os payloads
+# reais são usados como modelo.
+
+WEAPONS = ("Vandal", "Phantom", "Operator", "Sheriff", "Ghost", "Spectre", "Guardian", "Marshal", "Judge", "Odin")
+COLLECTIONS = ("Prime", "Reaver", "Glitchpop", "Oni", "Ion", "Sovereign", "Elderflame", "RGX", "Kuronami", "Forsaken")
+REGIONS_INTERNATIONAL = ("EU", "AP", "NA", "LA")
+RANKS = ("Ferro 2", "Bronze 1", "Prata 3", "Ouro 2", "Platina 1", "Diamante 3", "Ascendente 1")
+ICON_SIZE = (512, 128)  # Proporção dos displayIcon de armas
+
+
+def make_icon(seed):
+    """PNG RGBA de uma "arma" com fundo transparente (tamanho parecido com o dos ícones reais)."""
+    rng = random.Random(seed)
+    img = Image.new("RGBA", ICON_SIZE, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    color = tuple(rng.randrange(40, 255) for _ in range(3)) + (255,)
+    accent = tuple(rng.randrange(40, 255) for _ in range(3)) + (255,)
+    draw.rectangle((40, 48, 470, 78), fill=color)  # Cano e corpo
+    draw.polygon([(300, 78), (360, 78), (330, 120), (290, 120)], fill=accent)  # Cabo
+    draw.rectangle((20, 40, 120, 90), fill=accent)  # Coronha
+    for _ in range(12):
+        x, y = rng.randrange(40, 460), rng.randrange(48, 74)
+        draw.ellipse((x, y, x + 6, y + 6), fill=accent)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class Fixtures:
+    """Catálogo de skins, ícones e contas servidos pelo servidor simulado."""
+
+    def __init__(self, seed=1, skin_count=300, skins_per_item=(4, 16), recorded_dir=None):
+        self.rng = random.Random(seed)
+        self.skins_per_item = skins_per_item
+        self.skins = {}  # uuid -> dados no formato de /weapons/skins
+        self.icons = {}  # uuid -> bytes PNG (gerados sob demanda)
+        self.templates = []  # Detalhes gravados usados como modelo das contas
+        self._next_item_id = 100_000_000
+        if recorded_dir:
+            self._load_recorded(recorded_dir)
+        while len(self.skins) < skin_count:
+            self._add_skin()
+        self.skin_uuids = list(self.skins)
+
+    def _load_recorded(self, directory):
+        skins_path = os.path.join(directory, "skins.json")
+        if os.path.exists(skins_path):
+            with open(skins_path, encoding="utf-8") as f:
+                for skin in json.load(f):
+                    if skin.get('uuid') and skin.get('displayName') and skin.get('displayIcon'):
+                        self.skins[skin['uuid']] = skin
+        items_dir = os.path.join(directory, "items")
+        if os.path.isdir(items_dir):
+            for name in sorted(os.listdir(items_dir)):
+                if name.endswith(".json"):
+                    with open(os.path.join(items_dir, name), encoding="utf-8") as f:
+                        payload = json.load(f)
+                    self.templates.append(payload.get('item', payload))
+
+    def _add_skin(self):
+        skin_uuid = str(uuid.UUID(int=self.rng.getrandbits(128)))
+        name = f"{self.rng.choice(COLLECTIONS)} {self.rng.choice(WEAPONS)}"
+        self.skins[skin_uuid] = {
+            'uuid': skin_uuid,
+            'displayName': name,
+            'displayIcon': None,  # Preenchido pelo servidor com a própria URL
+            'levels': [],
+        }
+
+    def icon(self, skin_uuid):
+        data = self.icons.get(skin_uuid)
+        if data is None:
+            data = self.icons[skin_uuid] = make_icon(skin_uuid)
+        return data
+
+    # --- Contas ---
+    def new_item(self, published_at, international=False):
+        """Detalhes de uma conta nova (campos lidos pelos embeds do bot)."""
+        item_id = self._next_item_id
+        self._next_item_id += 1
+        low, high = self.skins_per_item
+        skins = self.rng.sample(self.skin_uuids, min(len(self.skin_uuids), self.rng.randint(low, high)))
+        knives = [skins.pop()] if len(skins) > 1 and self.rng.random() < 0.5 else []
+        template = dict(self.rng.choice(self.templates)) if self.templates else {}
+        template.update({
+            'item_id': item_id,
+            'published_date': published_at,
+            'item_state': 'active',
+            'title': template.get('title') or f"Conta Valorant #{item_id}",
+            'price': round(self.rng.uniform(8, 45), 2) if international else self.rng.randint(20, 50),
+            'price_currency': 'usd' if international else 'rub',
+            'riot_valorant_region': self.rng.choice(REGIONS_INTERNATIONAL) if international else 'BR',
+            'riot_valorant_skin_count': len(skins) + len(knives),
+            'riot_valorant_inventory_value': self.rng.randint(15000, 60000),
+            'riot_valorant_level': self.rng.randint(20, 300),
+            'riot_valorant_wallet_vp': self.rng.randint(0, 2000),
+            'riot_valorant_wallet_rp': self.rng.randint(0, 100),
+            'valorantRankTitle': self.rng.choice(RANKS),
+            'valorantLastRankTitle': self.rng.choice(RANKS),
+            'account_last_activity': int(published_at) - self.rng.randint(3600, 90 * 86400),
+            'valorantInventory': {'WeaponSkins': skins, 'KnifesSkins': knives},
+        })
+        return template
+
+    def listing_entry(self, item):
+        """Resumo da conta como aparece na listagem /riot/."""
+        return {key: item[key] for key in ('item_id', 'published_date', 'price', 'price_currency', 'title')}
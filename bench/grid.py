@@ -0,0 +1,235 @@
+import argparse
+import cProfile
+import glob
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+
+# --- Micro-benchmark da grade de skins ---
+# Renderiza grades de 1 a 12 skins a partir de ícones de fixture e mede cada
+# fase separadamente, com o mesmo código do bot:
+#   decode     PNG -> RGBA (decode_icon)
+#   resize     LANCZOS para a altura do cartão (resize_icon)
+#   text       rótulos dos nomes com o cache frio (SkinGridRenderer.label)
+#   composite  cartões, ícones e rótulos na tela (SkinGridRenderer.render)
+#   encode     codificação com a escada de formatos (encode_grid)
+# Uma segunda passada, com tracemalloc ligado, mede as alocações de cada fase:
+# pico de memória Python e imagens/blocos criados pelo alocador do Pillow.
+#
+# Uso (na raiz do repositório):
+#   python -m bench.grid
+#   python -m bench.grid --sizes 1,4,12 --repeat 50 --format webp
+#   python -m bench.grid --profile                # cProfile de todas as grades
+#   python -m bench.grid --show-profile render_profiles   # perfil gravado em produção
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ('decode', 'resize', 'text', 'composite', 'encode')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmark das fases da grade de skins.")
+    parser.add_argument('--sizes', default="1-12", help="Quantidades de skins (ex.: 1-12 ou 1,4,12)")
+    parser.add_argument('--repeat', type=int, default=20, help="Repetições por quantidade")
+    parser.add_argument('--cols', type=int, default=3, help="Colunas da grade (o bot usa 3)")
+    parser.add_argument('--card-width', type=int, default=150)
+    parser.add_argument('--card-height', type=int, default=90)
+    parser.add_argument('--icon-height', type=int, default=60)
+    parser.add_argument('--format', default='png-palette', help="Formato de saída (ver renderer.GRID_FORMATS)")
+    parser.add_argument('--target-kb', type=float, default=256, help="Tamanho alvo do anexo (0 = sem alvo)")
+    parser.add_argument('--quality', type=int, default=85)
+    parser.add_argument('--profile', action='store_true', help="Roda as grades sob o cProfile e mostra o topo")
+    parser.add_argument('--top', type=int, default=25, help="Funções mostradas no perfil")
+    parser.add_argument('--show-profile', default=None, metavar='DIR',
+                        help="Resume os perfis gravados em produção (RENDER_PROFILE_DIR) e sai")
+    parser.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    return parser.parse_args(argv)
+
+
+def parse_sizes(text):
+    sizes = []
+    for part in text.split(","):
+        low, _, high = part.strip().partition("-")
+        sizes.extend(range(int(low), int(high or low) + 1))
+    return sizes
+
+
+def median(values):
+    ordered = sorted(values)
+    return ordered[len(ordered) // 2] if ordered else None
+
+
+class GridBench:
+    """Executa as fases da grade com os mesmos componentes do bot."""
+
+    def __init__(self, args):
+        from bench.fixtures import Fixtures
+        from renderer import SkinGridRenderer
+
+        self.args = args
+        self.fixtures = Fixtures(seed=1, skin_count=max(parse_sizes(args.sizes)))
+        self.icons = [self.fixtures.icon(skin_uuid) for skin_uuid in self.fixtures.skin_uuids]
+        self.renderer = SkinGridRenderer(card_width=args.card_width, card_height=args.card_height)
+        self.target_bytes = int(args.target_kb * 1024) or None
+        self._label_round = 0
+
+    def phases(self, count):
+        """Uma grade de `count` skins; retorna ({fase: segundos}, bytes codificados)."""
+        from icon_cache import decode_icon, resize_icon
+        from renderer import encode_grid
+
+        timings = {}
+        started = time.perf_counter()
+        decoded = [decode_icon(data) for data in self.icons[:count]]
+        timings['decode'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        thumbnails = [resize_icon(img, self.args.card_width - 10, self.args.icon_height) for img in decoded]
+        timings['resize'] = time.perf_counter() - started
+
+        # Nomes novos a cada rodada: mede o desenho do texto, não o cache de rótulos
+        self._label_round += 1
+        names = [f"Skin {self._label_round:04d}-{index:02d}" for index in range(count)]
+        started = time.perf_counter()
+        for name in names:
+            self.renderer.label(name)
+        timings['text'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        canvas = self.renderer.render(list(zip(names, thumbnails)), self.args.cols)
+        timings['composite'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        data, _ = encode_grid(canvas, self.args.format, self.target_bytes, self.args.quality)
+        timings['encode'] = time.perf_counter() - started
+        return timings, data
+
+    def time_size(self, count):
+        samples = {phase: [] for phase in PHASES}
+        size = 0
+        for _ in range(self.args.repeat):
+            timings, data = self.phases(count)
+            for phase, seconds in timings.items():
+                samples[phase].append(seconds)
+            size = len(data)
+        result = {phase: median(values) for phase, values in samples.items()}
+        result['total'] = sum(result[phase] for phase in PHASES)
+        result['bytes'] = size
+        return result
+
+    def allocations(self, count):
+        """Alocações por fase numa grade (passada separada: o tracemalloc distorce os tempos)."""
+        from icon_cache import decode_icon, resize_icon
+        from profiling import pillow_delta, pillow_stats
+        from renderer import encode_grid
+
+        result = {}
+
+        def measure(phase, fn):
+            # Pico zerado antes de cada fase
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            before = pillow_stats()
+            value = fn()
+            _, peak = tracemalloc.get_traced_memory()
+            result[phase] = {'python_peak_kb': round((peak - base) / 1024, 1), **pillow_delta(before, pillow_stats())}
+            return value
+
+        tracemalloc.start()
+        try:
+            decoded = measure('decode', lambda: [decode_icon(data) for data in self.icons[:count]])
+            thumbnails = measure('resize', lambda: [
+                resize_icon(img, self.args.card_width - 10, self.args.icon_height) for img in decoded])
+            self._label_round += 1
+            names = [f"Skin {self._label_round:04d}-{index:02d}" for index in range(count)]
+            measure('text', lambda: [self.renderer.label(name) for name in names])
+            canvas = measure('composite', lambda: self.renderer.render(list(zip(names, thumbnails)), self.args.cols))
+            measure('encode', lambda: encode_grid(canvas, self.args.format, self.target_bytes, self.args.quality))
+        finally:
+            tracemalloc.stop()
+        return result
+
+
+def print_table(results):
+    header = f"{'skins':>5} " + " ".join(f"{phase:>10}" for phase in PHASES) + f" {'total':>10} {'KB':>7}"
+    print("Tempos (mediana, ms):")
+    print(header)
+    for count, result in results.items():
+        timings = result['timings']
+        print(f"{count:>5} " + " ".join(f"{timings[phase] * 1000:>10.2f}" for phase in PHASES)
+              + f" {timings['total'] * 1000:>10.2f} {timings['bytes'] / 1024:>7.1f}")
+    print()
+    print("Alocações por fase (pico Python KB / imagens Pillow / blocos novos):")
+    print(f"{'skins':>5} " + " ".join(f"{phase:>16}" for phase in PHASES))
+    for count, result in results.items():
+        cells = []
+        for phase in PHASES:
+            alloc = result['allocations'][phase]
+            cells.append(f"{alloc['python_peak_kb']:>7.1f}/{alloc['new_count']:>3}/{alloc['allocated_blocks']:>3}")
+        print(f"{count:>5} " + " ".join(f"{cell:>16}" for cell in cells))
+
+
+def print_profile(profile, top):
+    stats = pstats.Stats(profile)
+    stats.strip_dirs().sort_stats('cumulative').print_stats(top)
+
+
+def show_saved_profiles(directory, top):
+    """Resumo dos perfis gravados pelo bot (render-<pid>.jsonl e .prof)."""
+    entries = []
+    for path in sorted(glob.glob(os.path.join(directory, "render-*.jsonl"))):
+        with open(path, encoding='utf-8') as f:
+            entries.extend(json.loads(line) for line in f if line.strip())
+    if not entries:
+        print(f"Nenhum perfil em {directory}.")
+        return 1
+    durations = [entry['duration_ms'] for entry in entries]
+    print(f"{len(entries)} grades perfiladas: mediana {median(durations):.1f} ms, máximo {max(durations):.1f} ms")
+    by_size = {}
+    for entry in entries:
+        by_size.setdefault(entry.get('skins'), []).append(entry)
+    for skins, group in sorted(by_size.items(), key=lambda item: item[0] or 0):
+        print(f"  {skins} skins: {len(group)}x, mediana {median([e['duration_ms'] for e in group]):.1f} ms, "
+              f"pico Python {median([e['python_peak_kb'] for e in group]):.0f} KB, "
+              f"imagens Pillow {median([e['pillow']['new_count'] for e in group])}")
+    profiles = sorted(glob.glob(os.path.join(directory, "render-*.prof")))
+    if profiles:
+        print()
+        stats = pstats.Stats(*profiles)
+        stats.strip_dirs().sort_stats('cumulative').print_stats(top)
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sys.path.insert(0, REPO_ROOT)
+    if args.show_profile:
+        return show_saved_profiles(args.show_profile, args.top)
+
+    bench = GridBench(args)
+    bench.phases(1)  # Aquece imports, fonte e tela
+    results = {}
+    for count in parse_sizes(args.sizes):
+        results[count] = {'timings': bench.time_size(count), 'allocations': bench.allocations(count)}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    if args.profile:
+        profile = cProfile.Profile()
+        profile.enable()
+        for count in parse_sizes(args.sizes):
+            for _ in range(args.repeat):
+                bench.phases(count)
+        profile.disable()
+        print()
+        print_profile(profile, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
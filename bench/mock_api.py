@@ -0,0 +1,192 @@
+import asyncio
+import random
+import threading
+import time
+from aiohttp import web
+
+# --- Servidor simulado da LZT e da valorant-api.com ---
+# Um único servidor aiohttp, numa thread com loop próprio (fora do loop do bot
+# medido), atende as rotas usadas pelo bot:
+#   /riot/?...                      listagem de contas (feed BR ou internacional)
+#   /{item_id}                      detalhes de uma conta
+#   /v1/weapons/skins[/{uuid}]      metadados das skins
+#   /v1/weapons/skinlevels/{uuid}   sempre 404 (as fixtures só têm skins)
+#   /icons/{uuid}.png               ícones das skins
+# Latência, 429 e falhas 5xx são sorteados por requisição. 429 e falhas valem
+# para a LZT; a valorant-api e os ícones recebem só latência e falhas.
+
+LISTING_PAGE_SIZE = 40
+
+
+class MockAPI:
+    """Servidor HTTP local com as fixtures e injeção de latência/erros."""
+
+    def __init__(self, fixtures, latency_ms=80, jitter_ms=40, rate_429=0.0, failure_rate=0.0,
+                 retry_after=1, seed=1, host='127.0.0.1', port=0):
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.failure_rate = failure_rate
+        self.retry_after = retry_after  # Segundos no cabeçalho Retry-After dos 429
+        self.host = host
+        self.port = port
+        self.listings = {'br': [], 'international': []}  # Mais nova primeiro
+        self.items = {}  # item_id -> detalhes
+        self.requests = {}  # (rota, status) -> contagem
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._started = threading.Event()
+
+    # --- Roteiro ---
+    def publish(self, count, feed='br'):
+        """Publica `count` contas novas no feed agora; retorna os item_ids."""
+        now = time.time()
+        published = []
+        with self._lock:
+            for _ in range(count):
+                item = self.fixtures.new_item(now, international=(feed == 'international'))
+                self.items[item['item_id']] = item
+                self.listings[feed].insert(0, self.fixtures.listing_entry(item))
+                published.append(item['item_id'])
+        return published
+
+    def published_at(self, item_id):
+        item = self.items.get(item_id)
+        return item['published_date'] if item else None
+
+    @property
+    def lzt_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def valorant_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    # --- Injeção de latência e erros ---
+    def _count(self, route, status):
+        with self._lock:
+            self.requests[(route, status)] = self.requests.get((route, status), 0) + 1
+
+    async def _delay(self):
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        delay = max(0.0, self.latency_ms + jitter) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _fault(self, route, allow_429):
+        """Resposta de erro sorteada para esta requisição, ou None."""
+        with self._lock:
+            roll = self._rng.random()
+        if allow_429 and roll < self.rate_429:
+            self._count(route, 429)
+            return web.json_response({'errors': ['Too Many Requests']}, status=429,
+                                     headers={'Retry-After': str(self.retry_after)})
+        if roll < self.rate_429 + self.failure_rate:
+            self._count(route, 503)
+            return web.json_response({'errors': ['Service Unavailable']}, status=503)
+        return None
+
+    # --- Rotas ---
+    async def _listing(self, request):
+        await self._delay()
+        fault = self._fault('listing', allow_429=True)
+        if fault is not None:
+            return fault
+        regions = request.query.getall('valorant_region[]', [])
+        feed = 'br' if 'BR' in regions else 'international'
+        page = int(request.query.get('page', 1))
+        start = (page - 1) * LISTING_PAGE_SIZE
+        with self._lock:
+            items = list(self.listings[feed][start:start + LISTING_PAGE_SIZE])
+        self._count('listing', 200)
+        return web.json_response({'items': items, 'totalItems': len(self.listings[feed])})
+
+    async def _item(self, request):
+        await self._delay()
+        fault = self._fault('item', allow_429=True)
+        if fault is not None:
+            return fault
+        item = self.items.get(int(request.match_info['item_id']))
+        if item is None:
+            self._count('item', 404)
+            return web.json_response({'errors': ['Item not found']}, status=404)
+        self._count('item', 200)
+        return web.json_response({'item': item})
+
+    def _skin_payload(self, skin):
+        return dict(skin, displayIcon=f"{self.lzt_url}/icons/{skin['uuid']}.png")
+
+    async def _skins(self, request):
+        await self._delay()
+        self._count('skins', 200)
+        return web.json_response({'status': 200, 'data': [self._skin_payload(s) for s in self.fixtures.skins.values()]})
+
+    async def _skin(self, request):
+        await self._delay()
+        fault = self._fault('skin', allow_429=False)
+        if fault is not None:
+            return fault
+        skin = self.fixtures.skins.get(request.match_info['uuid'])
+        if skin is None:
+            self._count('skin', 404)
+            return web.json_response({'status': 404, 'error': 'not found'}, status=404)
+        self._count('skin', 200)
+        return web.json_response({'status': 200, 'data': self._skin_payload(skin)})
+
+    async def _skin_level(self, request):
+        await self._delay()
+        self._count('skinlevel', 404)
+        return web.json_response({'status': 404, 'error': 'not found'}, status=404)
+
+    async def _icon(self, request):
+        await self._delay()
+        fault = self._fault('icon', allow_429=False)
+        if fault is not None:
+            return fault
+        skin_uuid = request.match_info['uuid']
+        if skin_uuid not in self.fixtures.skins:
+            self._count('icon', 404)
+            raise web.HTTPNotFound()
+        self._count('icon', 200)
+        return web.Response(body=self.fixtures.icon(skin_uuid), content_type='image/png')
+
+    def _app(self):
+        app = web.Application()
+        app.router.add_get('/riot/', self._listing)
+        app.router.add_get('/v1/weapons/skins', self._skins)
+        app.router.add_get('/v1/weapons/skins/{uuid}', self._skin)
+        app.router.add_get('/v1/weapons/skinlevels/{uuid}', self._skin_level)
+        app.router.add_get('/icons/{uuid}.png', self._icon)
+        app.router.add_get('/{item_id:\\d+}', self._item)
+        return app
+
+    # --- Ciclo de vida ---
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, name="mock-api", daemon=True)
+        self._thread.start()
+        self._started.wait(10)
+        return self
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]  # Porta efetiva quando port=0
+        self._started.set()
+        self._loop.run_forever()
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+            self._loop = None
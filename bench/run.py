@@ -0,0 +1,345 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage
+    resource = None
+
+# --- Benchmark offline do bot ---
+# Sobe o servidor simulado da LZT/valorant-api e canais falsos do Discord, importa
+# o bot apontando para eles (estado e caches num diretório temporário) e publica
+# rajadas de contas roteirizadas. Os feeds são dirigidos por check_new_accounts /
+# check_new_international_accounts, como o agendador faria, e no fim a grade é
+# medida isoladamente com fetch_and_create_skin_grid_sync.
+#
+# Uso (na raiz do repositório):
+#   python -m bench.run --bursts 10,40,5 --latency-ms 80 --rate-429 0.02
+#   python -m bench.run --save bench_base.json
+#   python -m bench.run --baseline bench_base.json --tolerance 0.15
+#
+# Com --baseline, sai com código 1 se alguma métrica piorar além da tolerância.
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENT_CHANNEL_ID = 1001
+VENDOR_CHANNEL_ID = 1002
+INTERNATIONAL_CHANNEL_ID = 1003
+
+# Métricas comparadas com o baseline: (chave, maior é melhor)
+REGRESSION_KEYS = (
+    ('posts_per_second', True),
+    ('time_to_post_p50', False),
+    ('time_to_post_p99', False),
+    ('grid_p50', False),
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline do bot (LZT, valorant-api e Discord simulados).")
+    parser.add_argument('--bursts', default="10,40,5", help="Contas por rajada, separadas por vírgula")
+    parser.add_argument('--burst-interval', type=float, default=5.0, help="Segundos entre o início das rajadas")
+    parser.add_argument('--international-share', type=float, default=0.3, help="Fração das contas no feed internacional")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="Segundos entre ciclos de polling dos feeds")
+    parser.add_argument('--latency-ms', type=float, default=80, help="Latência média das APIs simuladas")
+    parser.add_argument('--jitter-ms', type=float, default=40, help="Variação (±) da latência das APIs")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="Probabilidade de 429 nas rotas da LZT")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Probabilidade de 503 em qualquer rota")
+    parser.add_argument('--send-latency-ms', type=float, default=150, help="Latência do channel.send simulado")
+    parser.add_argument('--lzt-rate', default=None,
+                        help="Limite da LZT como REQUISIÇÕES/SEGUNDOS (padrão: o do config, ex.: 20/60)")
+    parser.add_argument('--skins-per-item', default="4,16", help="Mínimo,máximo de skins por conta")
+    parser.add_argument('--no-preload', action='store_true', help="Não pré-carrega o catálogo (metadados sob demanda)")
+    parser.add_argument('--grid-runs', type=int, default=20, help="Grades medidas isoladamente no fim")
+    parser.add_argument('--fixtures', default=None, help="Diretório com fixtures gravadas (skins.json, items/*.json)")
+    parser.add_argument('--timeout', type=float, default=600, help="Prazo total para publicar todas as contas")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tracemalloc', action='store_true', help="Mede o pico de memória Python (mais lento)")
+    parser.add_argument('--log-level', default="WARNING")
+    parser.add_argument('--json', action='store_true', help="Imprime o relatório em JSON")
+    parser.add_argument('--save', default=None, help="Grava o relatório em JSON (para usar como baseline)")
+    parser.add_argument('--baseline', default=None, help="Relatório anterior para comparação")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Piora relativa aceita em relação ao baseline")
+    return parser.parse_args(argv)
+
+
+def percentile(values, quantile):
+    from tracing import percentile as nearest_rank
+    return nearest_rank(sorted(values), quantile)
+
+
+def configure_environment(args, mock, workdir):
+    """Variáveis lidas pelo config.py, definidas antes de importar o bot."""
+    env = {
+        'DISCORD_BOT_TOKEN': "bench",
+        'LZT_API_TOKEN': "bench",
+        'EXCHANGE_RATE_API_KEY': "",
+        'TARGET_CLIENT_CHANNEL_ID': str(CLIENT_CHANNEL_ID),
+        'TARGET_VENDOR_CHANNEL_ID': str(VENDOR_CHANNEL_ID),
+        'TARGET_INTERNATIONAL_CHANNEL_ID': str(INTERNATIONAL_CHANNEL_ID),
+        'LZT_API_BASE_URL': mock.lzt_url,
+        'VALORANT_API_BASE_URL': mock.valorant_url,
+        'METRICS_ENABLED': "false",
+        'LOG_LEVEL': args.log_level,
+        'TRACE_SAMPLES': "100000",
+    }
+    if args.lzt_rate:
+        requests_per_window, _, window = args.lzt_rate.partition("/")
+        env['LZT_RATE_LIMIT_REQUESTS'] = requests_per_window
+        env['LZT_RATE_LIMIT_WINDOW_SECONDS'] = window or "60"
+    os.environ.update(env)
+    # Estado, catálogo e ícones são caminhos relativos: ficam no diretório temporário
+    os.chdir(workdir)
+
+
+def burst_plan(args):
+    rng = random.Random(args.seed)
+    plan = []
+    for index, size in enumerate(int(part) for part in args.bursts.split(",") if part.strip()):
+        international = sum(1 for _ in range(size) if rng.random() < args.international_share)
+        plan.append((index * args.burst_interval, size - international, international))
+    return plan
+
+
+async def run_feeds(args, bot, mock, sink):
+    """Publica as rajadas, dirige os feeds e espera todas as contas saírem do pipeline."""
+    posted_at = {}
+    original_publish = bot.feed_engine.publish
+
+    async def publish(feed, item_id, item_data):
+        result = await original_publish(feed, item_id, item_data)
+        posted_at[item_id] = time.time()
+        return result
+
+    bot.feed_engine.publish = publish
+
+    plan = burst_plan(args)
+    published = []
+    started = time.time()
+    done_before = bot.posting_pipeline.posted + bot.posting_pipeline.failed
+
+    async def script():
+        for offset, br_count, international_count in plan:
+            await asyncio.sleep(max(0.0, started + offset - time.time()))
+            published.extend(mock.publish(br_count, 'br'))
+            published.extend(mock.publish(international_count, 'international'))
+
+    async def drive():
+        while True:
+            await asyncio.gather(bot.check_new_accounts(), bot.check_new_international_accounts())
+            await asyncio.sleep(args.poll_interval)
+
+    script_task = asyncio.create_task(script())
+    driver_task = asyncio.create_task(drive())
+    expected = sum(br + intl for _, br, intl in plan)
+    deadline = started + args.timeout
+    try:
+        while time.time() < deadline:
+            finished = bot.posting_pipeline.posted + bot.posting_pipeline.failed - done_before
+            if script_task.done() and finished >= expected:
+                break
+            await asyncio.sleep(0.2)
+    finally:
+        driver_task.cancel()
+        script_task.cancel()
+        await asyncio.gather(driver_task, script_task, return_exceptions=True)
+
+    times_to_post = [posted_at[item_id] - mock.published_at(item_id) for item_id in published if item_id in posted_at]
+    last_post = max(posted_at.values()) if posted_at else time.time()
+    elapsed = max(1e-9, last_post - started)
+    return {
+        'published': len(published),
+        'posted': len(posted_at),
+        'failed': bot.posting_pipeline.failed,
+        'elapsed_seconds': round(elapsed, 3),
+        'posts_per_second': round(len(posted_at) / elapsed, 3),
+        'time_to_post_p50': percentile(times_to_post, 0.5),
+        'time_to_post_p99': percentile(times_to_post, 0.99),
+        'discord_messages': len(sink.sent),
+        'attachment_kb_avg': round(
+            sum(message.attachment_bytes for _, _, message in sink.sent) / max(1, len(sink.sent)) / 1024, 1),
+    }
+
+
+async def run_grids(args, bot, fixtures):
+    """Mede fetch_and_create_skin_grid_sync isoladamente (caches já aquecidos pelos feeds)."""
+    rng = random.Random(args.seed + 1)
+    low, high = fixtures.skins_per_item
+    durations = []
+    for _ in range(args.grid_runs):
+        skins = rng.sample(fixtures.skin_uuids, min(len(fixtures.skin_uuids), rng.randint(low, high)))
+        started = time.perf_counter()
+        await bot.render_threads.run(bot.fetch_and_create_skin_grid_sync, skins)
+        durations.append(time.perf_counter() - started)
+    return {
+        'grid_runs': len(durations),
+        'grid_p50': percentile(durations, 0.5),
+        'grid_p99': percentile(durations, 0.99),
+    }
+
+
+def stage_percentiles(bot):
+    stages = {}
+    for feed in bot.latency_tracer.feeds():
+        stages[feed] = {
+            stage: {'count': count, 'p50': values[0], 'p99': values[-1]}
+            for stage, (count, values) in bot.latency_tracer.percentiles(feed, (0.5, 0.99)).items()
+        }
+    return stages
+
+
+def process_peak_rss_mb(pid):
+    """Pico de RSS de outro processo (Linux, /proc); None se indisponível."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def memory_report(render_pids):
+    report = {}
+    if resource is not None:
+        # ru_maxrss em KB no Linux e em bytes no macOS
+        scale = 1 if sys.platform == 'darwin' else 1024
+        report['rss_peak_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2 ** 20, 1)
+    # Os processos de renderização são filhos do forkserver: lidos antes do shutdown
+    render_peaks = [peak for peak in map(process_peak_rss_mb, render_pids) if peak is not None]
+    if render_peaks:
+        report['render_process_rss_peak_mb'] = max(render_peaks)
+    if tracemalloc.is_tracing():
+        report['python_heap_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+    return report
+
+
+async def benchmark(args, mock, fixtures):
+    import bot
+    from bench.fake_discord import DiscordSink
+
+    sink = DiscordSink(send_latency_ms=args.send_latency_ms, seed=args.seed)
+    for channel_id, name in ((CLIENT_CHANNEL_ID, "clientes"), (VENDOR_CHANNEL_ID, "vendedor"),
+                             (INTERNATIONAL_CHANNEL_ID, "internacional")):
+        sink.add_channel(channel_id, name)
+    sink.attach(bot.bot)
+
+    # Mesma preparação do on_ready, sem conectar ao Discord
+    bot.load_state()
+    for feed in bot.FEEDS:
+        bot.feed_engine.add_feed(feed, bot.load_seen_ids(feed.name))
+    bot.feed_engine.load_cursors()
+    bot.skin_catalog.load()
+    if not args.no_preload:
+        await bot.io_pool.run(bot.skin_catalog.preload)
+    bot.posting_pipeline.start()
+    bot.flush_state.start()
+
+    try:
+        report = await run_feeds(args, bot, mock, sink)
+        report.update(await run_grids(args, bot, fixtures))
+        report['stages'] = stage_percentiles(bot)
+        report['memory'] = memory_report(bot.grid_renderer.worker_pids())
+    finally:
+        bot.flush_state.cancel()
+        await bot.posting_pipeline.stop()
+        await bot.lzt_client.close()
+        await asyncio.to_thread(bot.executors.shutdown)
+        await asyncio.to_thread(bot.state_store.close)
+        await asyncio.to_thread(bot.grid_renderer.shutdown)
+
+    report['api_requests'] = {f"{route} {status}": count for (route, status), count in sorted(mock.requests.items())}
+    report['render_fallbacks'] = bot.grid_renderer.fallbacks
+    return report
+
+
+def format_seconds(value):
+    if value is None:
+        return "-"
+    return f"{value * 1000:.0f} ms" if value < 1 else f"{value:.2f} s"
+
+
+def print_report(report):
+    print(f"Contas publicadas: {report['posted']}/{report['published']} (falhas: {report['failed']}) "
+          f"em {report['elapsed_seconds']:.1f} s")
+    print(f"Vazão: {report['posts_per_second']:.2f} posts/s")
+    print(f"Tempo até o post: p50 {format_seconds(report['time_to_post_p50'])} · "
+          f"p99 {format_seconds(report['time_to_post_p99'])}")
+    print(f"Grade isolada ({report['grid_runs']}x): p50 {format_seconds(report['grid_p50'])} · "
+          f"p99 {format_seconds(report['grid_p99'])} · anexo médio {report['attachment_kb_avg']} KB")
+    for feed, stages in report['stages'].items():
+        print(f"Estágios ({feed}):")
+        for stage, values in stages.items():
+            print(f"  {stage:<12} p50 {format_seconds(values['p50']):>9} · p99 {format_seconds(values['p99']):>9}"
+                  f"  ({values['count']})")
+    print("Memória: " + ", ".join(f"{key} {value}" for key, value in report['memory'].items()))
+    print("Requisições: " + ", ".join(f"{key}: {value}" for key, value in report['api_requests'].items()))
+
+
+def compare(report, baseline, tolerance):
+    """Lista de regressões em relação ao baseline (vazia se tudo dentro da tolerância)."""
+    regressions = []
+    for key, higher_is_better in REGRESSION_KEYS:
+        old, new = baseline.get(key), report.get(key)
+        if not old or new is None:
+            continue
+        change = (old - new) / old if higher_is_better else (new - old) / old
+        if change > tolerance:
+            regressions.append(f"{key}: {old:.4g} -> {new:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sys.path.insert(0, REPO_ROOT)
+    from bench.fixtures import Fixtures
+    from bench.mock_api import MockAPI
+
+    low, high = (int(part) for part in args.skins_per_item.split(","))
+    fixtures = Fixtures(seed=args.seed, skins_per_item=(low, high), recorded_dir=args.fixtures)
+    mock = MockAPI(fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+                   failure_rate=args.failure_rate, seed=args.seed).start()
+    workdir = tempfile.mkdtemp(prefix="valbot-bench-")
+    previous_dir = os.getcwd()
+    if args.tracemalloc:
+        tracemalloc.start()
+    try:
+        configure_environment(args, mock, workdir)
+        report = asyncio.run(benchmark(args, mock, fixtures))
+    finally:
+        mock.stop()
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+        from logs import shutdown_logging
+        shutdown_logging()
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Regressões em relação ao baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("Sem regressões em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
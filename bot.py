@@ -1,1123 +1,1275 @@
-import discord
-from discord.ext import tasks, commands
-import config
-import requests
-import asyncio
-from datetime import datetime
-import json
-import io
-from PIL import Image, ImageDraw, ImageFont
-import concurrent.futures
-import os
-import time 
-import uuid  # Para gerar IDs únicos para os clientes
-
-
-# --- Constantes e Configuração ---
-SEEN_IDS_FILE = "seen_ids.json"
-SEEN_IDS_INTERNATIONAL_FILE = "seen_ids_international.json"  # Arquivo separado para contas internacionais
-ACCOUNT_MAPPING_FILE = "account_mapping.json"  # Para mapeamento entre IDs únicos e reais
-ACCOUNT_MAPPING_INTERNATIONAL_FILE = "account_mapping_international.json"  # Para contas internacionais
-MARGIN_CONFIG_FILE = "margin_config.json"  # Para armazenar a configuração de margem
-POLLING_INTERVAL_SECONDS = 90
-API_TIMEOUT = 20 
-kast_zero_ids_time = 0
-in_cooldown_mode = False
-last_zero_ids_time_international = 0
-in_cooldown_mode_international = False
-COOLDOWN_DURATION = 300
-MAX_SKINS_IN_GRID = 12
-SKIN_GRID_COLS = 3
-SKIN_THUMB_SIZE = (100, 40)
-MAX_NEW_ACCOUNTS_PER_CYCLE = 3
-FETCH_DETAILS_DELAY = 5
-EXCHANGE_RATE_UPDATE_HOURS = 6
-poll_international = False
-
-
-# Variáveis globais
-seen_item_ids = set()
-seen_item_ids_international = set()  # Conjunto separado para contas internacionais
-usd_to_brl_rate = None
-account_mapping = {}  # Mapeamento de ID único para ID real
-account_mapping_international = {}  # Mapeamento para contas internacionais
-price_margin = 0  # Porcentagem de margem de preço (0% por padrão)
-
-# --- Funções de Armazenamento ---
-def load_seen_ids():
-    global seen_item_ids
-   
-    try:
-        if os.path.exists(SEEN_IDS_FILE):
-            with open(SEEN_IDS_FILE, 'r') as f: ids_list = json.load(f); seen_item_ids = set(ids_list)
-            print(f"[INFO] Carregados {len(seen_item_ids)} IDs vistos.")
-        else: seen_item_ids = set()
-    except Exception as e: print(f"[ERRO] Falha ao carregar IDs: {e}"); seen_item_ids = set()
-
-def save_seen_ids():
-    try:
-        with open(SEEN_IDS_FILE, 'w') as f: json.dump(list(seen_item_ids), f)
-    except Exception as e: print(f"[ERRO] Falha ao salvar IDs: {e}")
-
-def load_seen_ids_international():
-    global seen_item_ids_international
-   
-    try:
-        if os.path.exists(SEEN_IDS_INTERNATIONAL_FILE):
-            with open(SEEN_IDS_INTERNATIONAL_FILE, 'r') as f: 
-                ids_list = json.load(f)
-                seen_item_ids_international = set(ids_list)
-            print(f"[INFO] Carregados {len(seen_item_ids_international)} IDs internacionais vistos.")
-        else: 
-            seen_item_ids_international = set()
-    except Exception as e: 
-        print(f"[ERRO] Falha ao carregar IDs internacionais: {e}")
-        seen_item_ids_international = set()
-
-def save_seen_ids_international():
-    try:
-        with open(SEEN_IDS_INTERNATIONAL_FILE, 'w') as f: 
-            json.dump(list(seen_item_ids_international), f)
-    except Exception as e: 
-        print(f"[ERRO] Falha ao salvar IDs internacionais: {e}")
-
-def load_account_mapping():
-    global account_mapping
-    
-    try:
-        if os.path.exists(ACCOUNT_MAPPING_FILE):
-            with open(ACCOUNT_MAPPING_FILE, 'r') as f: 
-                account_mapping = json.load(f)
-            print(f"[INFO] Carregados {len(account_mapping)} mapeamentos de conta.")
-        else: 
-            account_mapping = {}
-    except Exception as e: 
-        print(f"[ERRO] Falha ao carregar mapeamentos de conta: {e}")
-        account_mapping = {}
-
-def save_account_mapping():
-    try:
-        with open(ACCOUNT_MAPPING_FILE, 'w') as f: 
-            json.dump(account_mapping, f)
-    except Exception as e: 
-        print(f"[ERRO] Falha ao salvar mapeamentos de conta: {e}")
-
-def load_account_mapping_international():
-    global account_mapping_international
-    
-    try:
-        if os.path.exists(ACCOUNT_MAPPING_INTERNATIONAL_FILE):
-            with open(ACCOUNT_MAPPING_INTERNATIONAL_FILE, 'r') as f: 
-                account_mapping_international = json.load(f)
-            print(f"[INFO] Carregados {len(account_mapping_international)} mapeamentos de conta internacional.")
-        else: 
-            account_mapping_international = {}
-    except Exception as e: 
-        print(f"[ERRO] Falha ao carregar mapeamentos de conta internacional: {e}")
-        account_mapping_international = {}
-
-def save_account_mapping_international():
-    try:
-        with open(ACCOUNT_MAPPING_INTERNATIONAL_FILE, 'w') as f: 
-            json.dump(account_mapping_international, f)
-    except Exception as e: 
-        print(f"[ERRO] Falha ao salvar mapeamentos de conta internacional: {e}")
-
-def load_price_margin():
-    """Carrega a configuração de margem de preço do arquivo."""
-    global price_margin
-    
-    try:
-        if os.path.exists(MARGIN_CONFIG_FILE):
-            with open(MARGIN_CONFIG_FILE, 'r') as f:
-                config = json.load(f)
-                price_margin = config.get('margin', 0)
-            print(f"[INFO] Margem de preço carregada: {price_margin}%")
-        else:
-            price_margin = 0  # Valor padrão
-    except Exception as e:
-        print(f"[ERRO] Falha ao carregar configuração de margem: {e}")
-        price_margin = 0
-
-def save_price_margin():
-    """Salva a configuração de margem de preço no arquivo."""
-    try:
-        with open(MARGIN_CONFIG_FILE, 'w') as f:
-            json.dump({'margin': price_margin}, f)
-    except Exception as e:
-        print(f"[ERRO] Falha ao salvar configuração de margem: {e}")
-
-# --- Funções Síncronas (Executor) ---
-def fetch_listings_sync(url, headers):
-    """Busca a lista de contas da API LZT com mecanismo de retry."""
-    
-    max_retries = 3
-    retry_delay = 5  # segundos
-    
-    for attempt in range(max_retries):
-        try:
-            print(f"[LZT-LIST SYNC] GET: {url} (tentativa {attempt+1}/{max_retries})")
-            custom_headers = {
-                **headers,
-                "User-Agent": "Mozilla/5.0 (ValorantStoreBot/1.0)"
-            }
-            response = requests.get(url, headers=custom_headers, timeout=API_TIMEOUT)
-            print(f"[LZT-LIST SYNC] Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 429: # Tratar especificamente o erro 429
-                # Tenta obter o valor do cabeçalho 'Retry-After' se disponível
-                retry_after_header = response.headers.get('Retry-After')
-                wait_time = retry_delay * (attempt + 1) # Aumenta o delay a cada tentativa
-                if retry_after_header:
-                    try:
-                        wait_time = int(retry_after_header)
-                        print(f"[LZT-LIST SYNC] Erro 429 (Too Many Requests). Respeitando 'Retry-After': {wait_time} segundos.")
-                    except ValueError:
-                        print(f"[LZT-LIST SYNC] Erro 429 (Too Many Requests). 'Retry-After' com valor inválido: {retry_after_header}. Usando delay padrão: {wait_time} segundos.")
-                else:
-                    print(f"[LZT-LIST SYNC] Erro 429 (Too Many Requests). Tentando novamente em {wait_time} segundos...")
-                
-                if attempt < max_retries - 1: # Só tenta novamente se não for a última tentativa
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    print(f"[LZT-LIST SYNC] Erro 429 (Too Many Requests). Máximo de tentativas atingido.")
-                    return None # Retorna None após todas as tentativas falharem
-
-            elif response.status_code >= 500:  # Erro do servidor
-                print(f"[LZT-LIST SYNC] Erro do servidor: {response.status_code}. Tentando novamente em {retry_delay} segundos...")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                else:
-                    print(f"[LZT-LIST SYNC] Erro do servidor. Máximo de tentativas atingido.")
-                    return None
-            else:
-                print(f"[LZT-LIST SYNC] Erro não-recuperável: {response.status_code} - {response.text}")
-                return None
-                
-        except requests.exceptions.Timeout:
-            print(f"[LZT-LIST SYNC] Timeout. Tentando novamente em {retry_delay} segundos...")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-                continue
-            else:
-                print(f"[LZT-LIST SYNC] Timeout. Máximo de tentativas atingido.")
-                return None
-        except Exception as e:
-            print(f"[LZT-LIST SYNC] Exceção: {e}")
-            if attempt < max_retries - 1:
-                print(f"[LZT-LIST SYNC] Tentando novamente em {retry_delay} segundos...")
-                time.sleep(retry_delay)
-            else:
-                print(f"[LZT-LIST SYNC] Exceção. Máximo de tentativas atingido.")
-                return None
-    
-    print(f"[LZT-LIST SYNC] Falha ao buscar dados após {max_retries} tentativas.") # Mensagem se sair do loop sem retornar
-    return None
-
-def get_valorant_skin_details_sync(skin_uuid):
-    """Busca NOME e URL do ÍCONE de uma skin na valorant-api.com."""
-   
-    valorant_api_url_skin = f"https://valorant-api.com/v1/weapons/skins/{skin_uuid}"
-    valorant_api_url_level = f"https://valorant-api.com/v1/weapons/skinlevels/{skin_uuid}"
-    skin_data = None
-    try:
-        response = requests.get(valorant_api_url_skin, timeout=5)
-        if response.status_code == 200 and response.json().get('status') == 200: skin_data = response.json().get('data')
-        elif response.status_code == 404:
-            response = requests.get(valorant_api_url_level, timeout=5)
-            if response.status_code == 200 and response.json().get('status') == 200: skin_data = response.json().get('data')
-        if skin_data:
-            name = skin_data.get('displayName', 'Desconhecido'); icon_url = skin_data.get('displayIcon')
-            if name and 'standard' not in name.lower() and icon_url: return {'name': name, 'icon_url': icon_url, 'uuid': skin_uuid}
-        return None
-    except Exception as e: print(f"[VAL-API SYNC] Erro skin {skin_uuid}: {e}"); return None
-
-def download_image_sync(url):
-    """Baixa uma imagem de uma URL e retorna os bytes."""
-   
-    try:
-        response = requests.get(url, stream=True, timeout=10); response.raise_for_status()
-        return response.content
-    except Exception as e: print(f"[DOWNLOAD SYNC] Erro {url}: {e}"); return None
-
-def create_skin_grid_sync(skin_details_list, grid_cols=4, card_width=150, card_height=90, padding=5):
-    """Cria uma grade de cartões de skins com imagem e nome, exatamente no estilo do exemplo."""
-    
-    if not skin_details_list:
-        return None
-    
-    cards = []
-    # Fonte para o nome das skins
-    try:
-        # Tente carregar uma fonte, com fallback para a padrão
-        font = ImageFont.truetype("arial.ttf", 10)  # Fonte menor para caber nomes longos
-    except IOError:
-        font = ImageFont.load_default()
-    
-    for skin in skin_details_list:
-        try:
-            name = skin.get('name', 'Desconhecido')
-            img_bytes = skin.get('icon_bytes')
-            if not img_bytes:
-                continue
-                
-            # Crie o cartão base (fundo escuro igual ao da imagem)
-            card = Image.new('RGBA', (card_width, card_height), (24, 25, 28, 255))
-            
-            # Abra a imagem da skin
-            img = Image.open(io.BytesIO(img_bytes)).convert("RGBA")
-            
-            # Ajuste o tamanho da imagem com proporções fixas
-            img_height = 60  # Altura fixa para a imagem
-            ratio = img_height / img.height
-            img_width = int(img.width * ratio)
-            
-            # Se a largura for maior que o cartão, redimensione novamente
-            if img_width > (card_width - 10):
-                img_width = card_width - 10
-                ratio = img_width / img.width
-                img_height = int(img.height * ratio)
-            
-            img = img.resize((img_width, img_height), Image.Resampling.LANCZOS)
-            
-            # Posicione a imagem centralizada no cartão
-            x_offset = (card_width - img_width) // 2
-            y_offset = 5  # Margem superior pequena
-            
-            card.paste(img, (x_offset, y_offset), img)
-            
-            # Adicione o nome da skin na parte inferior
-            draw = ImageDraw.Draw(card)
-            
-            # Truncar texto se for muito longo
-            if len(name) > 20:
-                name = name[:18] + "..."
-                
-            text_width = draw.textlength(name, font=font)
-            text_x = (card_width - text_width) // 2
-            text_y = card_height - 18  # Posicionar o texto na parte inferior
-            
-            # Desenhar o texto com sombra para legibilidade
-            draw.text((text_x+1, text_y+1), name, font=font, fill=(0, 0, 0, 180))  # sombra
-            draw.text((text_x, text_y), name, font=font, fill=(255, 255, 255, 255))  # texto
-            
-            cards.append(card)
-        except Exception as e:
-            print(f"[PILLOW SYNC] Erro ao criar cartão para {name}: {e}")
-            continue
-    
-    if not cards:
-        return None
-    
-    # Calcule o tamanho da grade
-    num_cards = len(cards)
-    grid_cols = min(grid_cols, num_cards)
-    grid_rows = (num_cards + grid_cols - 1) // grid_cols
-    
-    # Crie a imagem da grade
-    grid_width = (card_width * grid_cols) + (padding * (grid_cols + 1))
-    grid_height = (card_height * grid_rows) + (padding * (grid_rows + 1))
-    grid_image = Image.new('RGBA', (grid_width, grid_height), (18, 18, 20, 255))  # Fundo bem escuro
-    
-    # Coloque os cartões na grade
-    current_x, current_y = padding, padding
-    for i, card in enumerate(cards):
-        grid_image.paste(card, (current_x, current_y), card)
-        current_x += card_width + padding
-        if (i + 1) % grid_cols == 0:
-            current_y += card_height + padding
-            current_x = padding
-    
-    # Salve e retorne os bytes da imagem final
-    final_image_bytes = io.BytesIO()
-    grid_image.save(final_image_bytes, format='PNG')
-    final_image_bytes.seek(0)
-    
-    print(f"[PILLOW SYNC] Grade {grid_cols}x{grid_rows} de cartões criada.")
-    return final_image_bytes
-
-def fetch_and_create_skin_grid_sync(skin_uuids):
-    """Busca detalhes, baixa ícones e cria a imagem da grade."""
-    
-    print(f"[SKIN SYNC] Buscando detalhes para {min(len(skin_uuids), MAX_SKINS_IN_GRID)} UUIDs...")
-    skin_details_list = []
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_uuid = {executor.submit(get_valorant_skin_details_sync, uuid): uuid for uuid in skin_uuids[:MAX_SKINS_IN_GRID]}
-        for future in concurrent.futures.as_completed(future_to_uuid):
-            details = future.result()
-            if details:
-                skin_details_list.append(details)
-
-    if not skin_details_list:
-        return None
-        
-    # Adicione os bytes das imagens aos detalhes das skins
-    processed_skins = []
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
-        for skin in skin_details_list:
-            if 'icon_url' in skin:
-                future = executor.submit(download_image_sync, skin['icon_url'])
-                icon_bytes = future.result()
-                if icon_bytes:
-                    # Crie uma nova entrada com nome e bytes da imagem
-                    processed_skins.append({
-                        'name': skin['name'],
-                        'icon_bytes': icon_bytes
-                    })
-                else:
-                    print(f"[SKIN SYNC] Falha ao baixar ícone para {skin['name']}")
-    
-    if not processed_skins:
-        return None
-        
-    print(f"[SKIN SYNC] Criando imagem da grade com {len(processed_skins)} skins...")
-    grid_image_bytes = create_skin_grid_sync(processed_skins, grid_cols=SKIN_GRID_COLS)
-    return grid_image_bytes
-
-def fetch_item_details_sync(item_id, headers):
-    """Busca os detalhes de um item específico da API LZT com mecanismo de retry."""
-    
-    api_endpoint = f"{config.API_BASE_URL}/{item_id}"
-    max_retries = 3
-    retry_delay = 5  # segundos
-    
-    for attempt in range(max_retries):
-        try:
-            print(f"[LZT-DETAIL SYNC] GET: {api_endpoint} (tentativa {attempt+1}/{max_retries})")
-            response = requests.get(api_endpoint, headers=headers, timeout=API_TIMEOUT)
-            print(f"[LZT-DETAIL SYNC] Status: {response.status_code}")
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code >= 500:  # Erro do servidor
-                print(f"[LZT-DETAIL SYNC] Erro do servidor: {response.status_code}. Tentando novamente...")
-                time.sleep(retry_delay)
-                continue
-            else:
-                print(f"[LZT-DETAIL SYNC] Erro não-recuperável: {response.status_code}")
-                return None
-                
-        except requests.exceptions.Timeout:
-            print(f"[LZT-DETAIL SYNC] Timeout. Tentando novamente...")
-            time.sleep(retry_delay)
-            continue
-        except Exception as e:
-            print(f"[LZT-DETAIL SYNC] Exceção: {e}")
-            if attempt < max_retries - 1:
-                print(f"[LZT-DETAIL SYNC] Tentando novamente em {retry_delay} segundos...")
-                time.sleep(retry_delay)
-            else:
-                return None
-    
-    return None
-
-def fetch_exchange_rate_sync():
-    """Busca a taxa de câmbio USD para BRL."""
-    if not config.EXCHANGE_RATE_API_KEY:
-        print("[RATE SYNC] Chave da API de Câmbio não configurada.")
-        return None
-    api_url = f"https://v6.exchangerate-api.com/v6/{config.EXCHANGE_RATE_API_KEY}/latest/USD"
-    try:
-        print(f"[RATE SYNC] Buscando taxa de câmbio de {api_url}")
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("result") == "success":
-            rate = data.get("conversion_rates", {}).get("BRL")
-            print(f"[RATE SYNC] Taxa USD->BRL obtida: {rate}")
-            return rate
-        else:
-            print(f"[RATE SYNC] Erro na resposta da API de Câmbio: {data.get('error-type')}")
-            return None
-    except Exception as e:
-        print(f"[RATE SYNC] Exceção ao buscar taxa de câmbio: {e}")
-        return None
-
-# --- Fim das Funções Síncronas ---
-
-# --- Configuração do Bot ---
-intents = discord.Intents.default()
-intents.message_content = True  # Necessário para comandos
-
-# Cria o cliente do bot com suporte a comandos
-bot = commands.Bot(command_prefix='/', intents=intents)
-
-async def generate_unique_id():
-    """Gera um ID único curto para identificação da conta pelo cliente."""
-    # Gera um UUID e pega apenas os primeiros 6 caracteres
-    return str(uuid.uuid4())[:6].upper()
-
-async def process_new_account(item_id, item_data):
-    """Processa uma nova conta, gerando ID único e enviando apenas para o canal do cliente."""
-    # Gerar um ID único para a conta
-    unique_id = await generate_unique_id()
-    
-    # Salvar o mapeamento para uso futuro
-    account_mapping[unique_id] = item_id
-    save_account_mapping()
-    
-    # Enviar apenas para o canal do cliente (informações limitadas com margem de preço)
-    await send_client_embed(config.TARGET_CLIENT_CHANNEL_ID, item_id, item_data, unique_id)
-    
-    print(f"[INFO] Conta {item_id} processada com ID de cliente {unique_id}")
-    return unique_id
-
-async def process_new_international_account(item_id, item_data):
-    """Processa uma nova conta internacional, gerando ID único e enviando apenas para o canal internacional."""
-    # Gerar um ID único para a conta
-    unique_id = await generate_unique_id()
-    
-    # Salvar o mapeamento para uso futuro
-    account_mapping_international[unique_id] = item_id
-    save_account_mapping_international()
-    
-    # Enviar para o canal internacional
-    await send_client_embed(config.TARGET_INTERNATIONAL_CHANNEL_ID, item_id, item_data, unique_id, is_international=True)
-    
-    print(f"[INFO] Conta internacional {item_id} processada com ID de cliente {unique_id}")
-    return unique_id
-
-async def send_vendor_embed(target_channel_id, item_id, item_data, unique_id):
-    """Formata e envia o embed com todas as informações para o canal do vendedor."""
-    channel = bot.get_channel(target_channel_id)
-    if not channel:
-        print(f"[ERRO] Canal do vendedor com ID {target_channel_id} não encontrado.")
-        try:
-            channel = await bot.fetch_channel(target_channel_id)
-        except Exception as e:
-            print(f"[ERRO] Não foi possível buscar o canal do vendedor: {e}")
-            return
-            
-        if not channel:
-            print(f"[ERRO CRÍTICO] Impossível encontrar o canal do vendedor {target_channel_id}.")
-            return
-
-    account_url = f"https://lzt.market/{item_id}"
-
-    # --- Extração de Dados Principais ---
-    region = item_data.get('riot_valorant_region', 'N/A')
-    title = item_data.get('title', 'Título N/A')
-    price_original = item_data.get('price', 0)
-    currency_original = item_data.get('price_currency', '').upper()
-    skin_count_total = item_data.get('riot_valorant_skin_count', 'N/A')
-    skin_count_guns = 0
-    skin_count_knifes = 0
-    
-    # Contar skins de armas e facas separadamente
-    if 'valorantInventory' in item_data and 'WeaponSkins' in item_data['valorantInventory']:
-        skin_count_guns = len(item_data['valorantInventory']['WeaponSkins'])
-    
-    if 'valorantInventory' in item_data and 'KnifesSkins' in item_data['valorantInventory']:
-        skin_count_knifes = len(item_data['valorantInventory']['KnifesSkins'])
-    
-    vp_amount = item_data.get('riot_valorant_wallet_vp', 'N/A')
-    rp_amount = item_data.get('riot_valorant_wallet_rp', 'N/A')
-    inventory_vp_value = item_data.get('riot_valorant_inventory_value', 'N/A')
-    current_rank = item_data.get('valorantRankTitle', 'N/A')
-    last_rank = item_data.get('valorantLastRankTitle', 'N/A')
-    level = item_data.get('riot_valorant_level', 'N/A')
-    
-    # Preparar descrição com skins especiais
-    description = f"**{title}**"
-    
-    # Conversão de Preço para BRL (sem margem para o vendedor)
-    price_display = f"{price_original} {currency_original}"
-    if currency_original == 'USD' and usd_to_brl_rate:
-        try:
-            price_in_brl = float(price_original) * usd_to_brl_rate
-            price_display = f"R$ {price_in_brl:.2f}"
-        except Exception as e:
-            print(f"[ERRO] Erro ao converter preço: {e}")
-    
-    # Formatação da data
-    timestamp = item_data.get('account_last_activity', None)
-    last_activity_str = "N/A"
-    if timestamp:
-        try:
-            last_activity_str = datetime.fromtimestamp(timestamp).strftime('%d/%m/%Y %H:%M:%S')
-        except Exception:
-            last_activity_str = "Data inválida"
-
-    # --- Montar Embed para Vendedor (informação completa) ---
-    embed = discord.Embed(
-        title=f"✨ Detalhes da Conta {region} ✨",
-        description=description,
-        color=0x2F3136
-    )
-    
-    # Primeira linha de campos
-    embed.add_field(name="💰 Inventário (VP)", value=f"{inventory_vp_value}", inline=True)
-    embed.add_field(name="🔫 Skins", value=f"{skin_count_total}", inline=True)
-    embed.add_field(name="💸 VP Carteira", value=f"{vp_amount}", inline=True)
-    
-    # Segunda linha de campos
-    embed.add_field(name="💎 RP Carteira", value=f"{rp_amount}", inline=True)
-    embed.add_field(name="🌍 Região", value=f"{region}", inline=True)
-    embed.add_field(name="💲 Preço Original", value=f"{price_display}", inline=True)
-    
-    # Terceira linha de campos
-    embed.add_field(name="🏆 Rank Atual", value=f"{current_rank}", inline=True)
-    embed.add_field(name="🏅 Último Rank", value=f"{last_rank}", inline=True)
-    embed.add_field(name="📊 Level", value=f"{level}", inline=True)
-    
-    # Última atividade
-    embed.add_field(name="📅 Última Atividade", value=last_activity_str, inline=False)
-    
-    # Link para o LZT Market
-    embed.add_field(name="🔗 Link para Compra", value=account_url, inline=False)
-    
-    # Adicionar o ID único para referência
-    embed.add_field(name="🔑 ID Cliente", value=unique_id, inline=False)
-    
-    # Mostrar informação sobre margem (se aplicável)
-    if price_margin > 0:
-        # Calcular o preço com margem para mostrar a diferença
-        price_with_margin = price_display
-        if currency_original == 'USD' and usd_to_brl_rate:
-            try:
-                price_in_brl = float(price_original) * usd_to_brl_rate
-                price_with_margin_value = price_in_brl * (1 + (price_margin / 100))
-                price_with_margin = f"R$ {price_with_margin_value:.2f}"
-            except Exception as e:
-                print(f"[ERRO] Erro ao calcular preço com margem: {e}")
-        elif price_original:
-            try:
-                price_with_margin_value = float(price_original) * (1 + (price_margin / 100))
-                price_with_margin = f"{price_with_margin_value:.2f} {currency_original}"
-            except Exception as e:
-                print(f"[ERRO] Erro ao calcular preço com margem: {e}")
-        
-        embed.add_field(name="📈 Informação de Margem", 
-                       value=f"Margem atual: **{price_margin}%**\nPreço mostrado ao cliente: **{price_with_margin}**", 
-                       inline=False)
-    
-    # Footer
-    embed.set_footer(text=f"ID Real: {item_id} | Verificado por {bot.user.name}")
-
-    # --- Geração e Envio da Grade de Skins ---
-    grid_image_file = None
-    skins_list_ids = []
-    
-    # Combinar skins de armas e facas
-    if 'valorantInventory' in item_data:
-        if 'WeaponSkins' in item_data['valorantInventory']:
-            skins_list_ids.extend(item_data['valorantInventory']['WeaponSkins'])
-        if 'KnifesSkins' in item_data['valorantInventory']:
-            skins_list_ids.extend(item_data['valorantInventory']['KnifesSkins'])
-    
-    if skins_list_ids:
-        print(f"[ASYNC] Gerando grade de {len(skins_list_ids)} skins para item {item_id}...")
-        loop = asyncio.get_running_loop()
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            grid_bytes = await loop.run_in_executor(
-                pool, fetch_and_create_skin_grid_sync, skins_list_ids
-            )
-
-        if grid_bytes:
-            grid_image_file = discord.File(fp=grid_bytes, filename="skin_grid.png")
-            embed.set_image(url="attachment://skin_grid.png")
-        else:
-            embed.add_field(name="🖼️ Skins Preview", value="Falha ao gerar preview.", inline=False)
-    else:
-        embed.add_field(name="🖼️ Skins Preview", value="Nenhuma skin listada para gerar preview.", inline=False)
-
-    # --- Enviar a Mensagem Final ---
-    try:
-        await channel.send(embed=embed, file=grid_image_file if grid_image_file else None)
-        print(f"[DISCORD] Embed do vendedor enviado para item {item_id} no canal {target_channel_id}")
-    except Exception as e:
-        print(f"[ERRO DISCORD] Erro ao enviar mensagem do vendedor para item {item_id}: {e}")
-
-
-async def send_client_embed(target_channel_id, item_id, item_data, unique_id, is_international=False):
-    """Formata e envia o embed com informações limitadas para o canal do cliente."""
-    channel = bot.get_channel(target_channel_id)
-    if not channel:
-        print(f"[ERRO] Canal do cliente com ID {target_channel_id} não encontrado.")
-        try:
-            channel = await bot.fetch_channel(target_channel_id)
-        except Exception as e:
-            print(f"[ERRO] Não foi possível buscar o canal do cliente: {e}")
-            return
-            
-        if not channel:
-            print(f"[ERRO CRÍTICO] Impossível encontrar o canal do cliente {target_channel_id}.")
-            return
-
-    # --- Extração de Dados Principais ---
-    region = item_data.get('riot_valorant_region', 'N/A')
-    price_original = item_data.get('price', 0)
-    currency_original = item_data.get('price_currency', '').upper()
-    skin_count_total = item_data.get('riot_valorant_skin_count', 'N/A')
-    vp_amount = item_data.get('riot_valorant_wallet_vp', 'N/A')
-    rp_amount = item_data.get('riot_valorant_wallet_rp', 'N/A')
-    inventory_vp_value = item_data.get('riot_valorant_inventory_value', 'N/A')
-    current_rank = item_data.get('valorantRankTitle', 'N/A')
-    last_rank = item_data.get('valorantLastRankTitle', 'N/A')
-    level = item_data.get('riot_valorant_level', 'N/A')
-    
-    # Conversão de Preço para BRL com aplicação da margem
-    price_display = f"{price_original} {currency_original}"
-    if currency_original == 'USD' and usd_to_brl_rate:
-        try:
-            # Aplica a conversão de moeda
-            price_in_brl = float(price_original) * usd_to_brl_rate
-            
-            # Aplica a margem de preço
-            if price_margin > 0:
-                price_with_margin = price_in_brl * (1 + (price_margin / 100))
-                price_display = f"R$ {price_with_margin:.2f}"
-            else:
-                price_display = f"R$ {price_in_brl:.2f}"
-        except Exception as e:
-            print(f"[ERRO] Erro ao converter/aplicar margem ao preço: {e}")
-    elif price_margin > 0:
-        # Se não for USD ou não tiver taxa de câmbio, mas tiver margem
-        try:
-            price_with_margin = float(price_original) * (1 + (price_margin / 100))
-            price_display = f"{price_with_margin:.2f} {currency_original}"
-        except Exception as e:
-            print(f"[ERRO] Erro ao aplicar margem ao preço: {e}")
-    
-    # --- Montar Embed para Cliente (informação limitada) ---
-    title_text = "✨ Nova Conta BR Disponível ✨"
-    description_text = "**Conta Valorant**"
-    
-    # Customizar para contas internacionais
-    if is_international:
-        title_text = f"✨ Nova Conta {region} Disponível ✨"
-        description_text = "**Conta Valorant Internacional**"
-    
-    embed = discord.Embed(
-        title=title_text,
-        description=description_text,
-        color=0x2F3136
-    )
-    
-    # Primeira linha de campos
-    embed.add_field(name="💰 Inventário (VP)", value=f"{inventory_vp_value}", inline=True)
-    embed.add_field(name="🔫 Skins", value=f"{skin_count_total}", inline=True)
-    embed.add_field(name="💸 VP Carteira", value=f"{vp_amount}", inline=True)
-    
-    # Segunda linha de campos
-    embed.add_field(name="💎 RP Carteira", value=f"{rp_amount}", inline=True)
-    embed.add_field(name="🌍 Região", value=f"{region}", inline=True)
-    embed.add_field(name="💲 Preço", value=f"{price_display}", inline=True)
-    
-    # Terceira linha de campos
-    embed.add_field(name="🏆 Rank Atual", value=f"{current_rank}", inline=True)
-    embed.add_field(name="🏅 Último Rank", value=f"{last_rank}", inline=True)
-    embed.add_field(name="📊 Level", value=f"{level}", inline=True)
-    
-    # Formatação da data para o cliente
-    timestamp = item_data.get('account_last_activity', None)
-    last_activity_str = "N/A"
-    if timestamp:
-        try:
-            last_activity_str = datetime.fromtimestamp(timestamp).strftime('%d/%m/%Y %H:%M:%S')
-        except Exception:
-            last_activity_str = "Data inválida"
-            
-    # Adicionar campo de última atividade
-    embed.add_field(name="📅 Última Atividade", value=last_activity_str, inline=False)
-    
-    # ID da conta para o cliente
-    embed.add_field(name="🔑 ID da Conta", value=unique_id, inline=False)
-    embed.add_field(name="📢 Como Comprar", value="Entre em contato com um vendedor e informe o ID da conta para adquirir.", inline=False)
-    
-    # Footer (sem o ID real)
-    embed.set_footer(text=f"Verificado por {bot.user.name}")
-
-    # --- Geração e Envio da Grade de Skins ---
-    grid_image_file = None
-    skins_list_ids = []
-    
-    # Combinar skins de armas e facas
-    if 'valorantInventory' in item_data:
-        if 'WeaponSkins' in item_data['valorantInventory']:
-            skins_list_ids.extend(item_data['valorantInventory']['WeaponSkins'])
-        if 'KnifesSkins' in item_data['valorantInventory']:
-            skins_list_ids.extend(item_data['valorantInventory']['KnifesSkins'])
-    
-    if skins_list_ids:
-        print(f"[ASYNC] Gerando grade de {len(skins_list_ids)} skins para item {item_id} (cliente)...")
-        loop = asyncio.get_running_loop()
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            grid_bytes = await loop.run_in_executor(
-                pool, fetch_and_create_skin_grid_sync, skins_list_ids
-            )
-
-        if grid_bytes:
-            grid_image_file = discord.File(fp=grid_bytes, filename="skin_grid.png")
-            embed.set_image(url="attachment://skin_grid.png")
-        else:
-            embed.add_field(name="🖼️ Skins Preview", value="Falha ao gerar preview.", inline=False)
-    else:
-        embed.add_field(name="🖼️ Skins Preview", value="Nenhuma skin listada para gerar preview.", inline=False)
-
-    # --- Enviar a Mensagem Final ---
-    try:
-        await channel.send(embed=embed, file=grid_image_file if grid_image_file else None)
-        print(f"[DISCORD] Embed do cliente enviado para item {item_id} no canal {target_channel_id}")
-    except Exception as e:
-        print(f"[ERRO DISCORD] Erro ao enviar mensagem do cliente para item {item_id}: {e}")
-
-
-# --- Comando de Busca por ID ---
-@bot.command(name="buscar")
-async def search_account(ctx, account_id: str):
-    """Comando para buscar uma conta pelo ID fornecido pelo cliente."""
-    # Verificar se o comando foi enviado no canal do vendedor
-    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
-        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
-        return
-    
-    # Carregar mapeamento de contas, se ainda não estiver carregado
-    if not account_mapping:
-        load_account_mapping()
-    
-    if not account_mapping_international:
-        load_account_mapping_international()
-    
-    # Verificar se o ID existe no mapeamento BR
-    if account_id in account_mapping:
-        real_item_id = account_mapping[account_id]
-        
-        # Buscar detalhes da conta
-        headers = {'Authorization': f'Bearer {config.LZT_TOKEN}'}
-        loop = asyncio.get_running_loop()
-        
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            item_details_data = await loop.run_in_executor(
-                pool, fetch_item_details_sync, real_item_id, headers
-            )
-        
-        if item_details_data and 'item' in item_details_data:
-            await ctx.send(f"✅ Conta BR encontrada! ID do cliente: {account_id}")
-            await send_vendor_embed(ctx.channel.id, real_item_id, item_details_data['item'], account_id)
-        else:
-            await ctx.send(f"⚠️ Conta com ID {account_id} encontrada no mapeamento BR, mas falha ao buscar detalhes atualizados. ID real: {real_item_id}")
-        return
-    
-    # Verificar se o ID existe no mapeamento internacional
-    if account_id in account_mapping_international:
-        real_item_id = account_mapping_international[account_id]
-        
-        # Buscar detalhes da conta
-        headers = {'Authorization': f'Bearer {config.LZT_TOKEN}'}
-        loop = asyncio.get_running_loop()
-        
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-            item_details_data = await loop.run_in_executor(
-                pool, fetch_item_details_sync, real_item_id, headers
-            )
-        
-        if item_details_data and 'item' in item_details_data:
-            region = item_details_data['item'].get('riot_valorant_region', 'N/A')
-            await ctx.send(f"✅ Conta Internacional ({region}) encontrada! ID do cliente: {account_id}")
-            await send_vendor_embed(ctx.channel.id, real_item_id, item_details_data['item'], account_id)
-        else:
-            await ctx.send(f"⚠️ Conta com ID {account_id} encontrada no mapeamento internacional, mas falha ao buscar detalhes atualizados. ID real: {real_item_id}")
-        return
-    
-    # Se chegou aqui, não encontrou em nenhum mapeamento
-    await ctx.send(f"❌ Nenhuma conta encontrada com o ID {account_id}.")
-
-# --- Comando para definir a margem de preço ---
-@bot.command(name="margem")
-async def set_price_margin(ctx, percentage: float):
-    """Define a margem de preço a ser adicionada para os clientes (em porcentagem)."""
-    global price_margin
-    
-    # Verificar se o comando foi enviado no canal do vendedor
-    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
-        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
-        return
-    
-    # Verificar se o valor é válido
-    if percentage < 0:
-        await ctx.send("❌ A margem não pode ser negativa.")
-        return
-    
-    # Atualizar a margem
-    price_margin = percentage
-    save_price_margin()
-    
-    await ctx.send(f"✅ Margem de preço definida para **{percentage}%**.\nOs preços mostrados aos clientes agora terão um aumento de {percentage}%.")
-
-# --- Comando para ver a margem atual ---
-@bot.command(name="vermargem")
-async def view_price_margin(ctx):
-    """Exibe a margem de preço atual."""
-    # Verificar se o comando foi enviado no canal do vendedor
-    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
-        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
-        return
-    
-    await ctx.send(f"📊 A margem de preço atual é de **{price_margin}%**.")
-
-# --- Loop de Tarefas para Verificar Novas Contas BR ---
-@tasks.loop(seconds=POLLING_INTERVAL_SECONDS)
-async def check_new_accounts():
-    global seen_item_ids, kast_zero_ids_time, in_cooldown_mode
-    current_time = time.time()
-    
-    # Verifica se estamos em período de cooldown
-    if in_cooldown_mode:
-        elapsed = current_time - kast_zero_ids_time
-        if elapsed < COOLDOWN_DURATION:
-            remaining = COOLDOWN_DURATION - elapsed
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Em cooldown BR por mais {remaining:.0f} segundos...")
-            return
-        else:
-            # Saímos do período de cooldown
-            in_cooldown_mode = False
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Saindo do período de cooldown BR!")
-    
-    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Iniciando verificação de novas contas BR...")
-    if not config.LZT_TOKEN or not config.TARGET_CLIENT_CHANNEL_ID:
-        print("[TASK ERRO] Token LZT ou Canal do Cliente não configurado.")
-        return
-
-    list_url = f"{config.API_BASE_URL}/riot/?pmax=50&daybreak=7&nsb=1&knife=1&valorant_region[]={config.TARGET_REGION}&order_by=published_date&order_direction=desc"
-    headers = {'Authorization': f'Bearer {config.LZT_TOKEN}'}
-    loop = asyncio.get_running_loop()
-
-    listing_data = None
-    with concurrent.futures.ThreadPoolExecutor() as pool:
-        listing_data = await loop.run_in_executor(pool, fetch_listings_sync, list_url, headers)
-
-    if listing_data is None or 'items' not in listing_data:
-        print("[TASK ERRO] Falha ao buscar/parsear lista de contas LZT.")
-        return
-
-    current_items = listing_data.get('items', [])
-    if not current_items: 
-        print("[TASK INFO] Nenhuma conta na listagem atual.")
-        return
-
-    current_item_ids = {item.get('item_id') for item in current_items if item.get('item_id')}
-    print(f"[TASK INFO] IDs atuais BR: {len(current_item_ids)}")
-    new_ids = sorted(list(current_item_ids - seen_item_ids), reverse=True)
-    print(f"[TASK INFO] IDs novos BR: {len(new_ids)}")
-
-    if not new_ids:
-        # Não há novos IDs, ativar o cooldown
-        print(f"[TASK INFO] Nenhum ID novo BR encontrado. Entrando em modo de cooldown por {COOLDOWN_DURATION} segundos...")
-        kast_zero_ids_time = current_time
-        in_cooldown_mode = True
-        
-        # Atualizar IDs vistos para evitar verificações desnecessárias depois do cooldown
-        if current_item_ids != seen_item_ids:
-            print("[TASK INFO] Atualizando vistos com IDs atuais BR.")
-            seen_item_ids = current_item_ids
-            save_seen_ids()
-        return
-    
-    # Processar novos IDs
-    print(f"[TASK INFO] Processando {min(len(new_ids), MAX_NEW_ACCOUNTS_PER_CYCLE)} novos IDs BR: {new_ids[:MAX_NEW_ACCOUNTS_PER_CYCLE]}")
-    newly_processed_ids = set()
-    processed_count = 0
-    for item_id in new_ids:
-        if item_id is None: continue
-        if processed_count >= MAX_NEW_ACCOUNTS_PER_CYCLE:
-             print(f"[TASK INFO] Limite de {MAX_NEW_ACCOUNTS_PER_CYCLE} contas BR por ciclo atingido.")
-             break # Sai do loop se atingir o limite
-
-        item_details_data = None
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-             item_details_data = await loop.run_in_executor(pool, fetch_item_details_sync, item_id, headers)
-
-        if item_details_data and 'item' in item_details_data:
-            # Processar a conta (enviar apenas para o canal do cliente)
-            await process_new_account(item_id, item_details_data['item'])
-            newly_processed_ids.add(item_id)
-            processed_count += 1
-            await asyncio.sleep(FETCH_DETAILS_DELAY) # Delay entre processar cada conta nova
-        else:
-            print(f"[TASK ERRO] Falha ao obter detalhes para ID BR: {item_id}")
-            newly_processed_ids.add(item_id) # Adiciona mesmo se falhar para não tentar de novo
-
-    seen_item_ids.update(newly_processed_ids)
-    save_seen_ids()
-
-# --- Loop de Tarefas para Verificar Novas Contas Internacionais ---
-@tasks.loop(seconds=POLLING_INTERVAL_SECONDS)
-async def check_new_international_accounts():
-    global seen_item_ids_international, last_zero_ids_time_international, in_cooldown_mode_international
-    current_time = time.time()
-    
-    # Verifica se estamos em período de cooldown
-    if in_cooldown_mode_international:
-        elapsed = current_time - last_zero_ids_time_international
-        if elapsed < COOLDOWN_DURATION:
-            remaining = COOLDOWN_DURATION - elapsed
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Em cooldown Internacional por mais {remaining:.0f} segundos...")
-            return
-        else:
-            # Saímos do período de cooldown
-            in_cooldown_mode_international = False
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Saindo do período de cooldown Internacional!")
-    
-    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Iniciando verificação de novas contas internacionais...")
-    if not config.LZT_TOKEN or not config.TARGET_INTERNATIONAL_CHANNEL_ID:
-        print("[TASK ERRO] Token LZT ou Canal Internacional não configurado.")
-        return
-
-    # URL para contas internacionais com filtros específicos:
-    # - Preço máximo equivalente a 230 BRL
-    # - VP mínimo de 15.000
-    # - Regiões EU, AP, NA e LA (excluindo BR e KR)
-    max_price_usd = 30  # Valor aproximado, será convertido
-    if usd_to_brl_rate:
-        try:
-            max_price_usd = 230 / usd_to_brl_rate
-            print(f"[TASK INFO] Preço máximo: R$ 230,00 → ${max_price_usd:.2f}")
-        except Exception as e:
-            print(f"[TASK ERRO] Erro ao calcular preço máximo em USD: {e}")
-    
-    # Montando a URL com todos os filtros
-    list_url = f"{config.API_BASE_URL}/riot/?pmax={max_price_usd:.2f}&inv_min=15000&valorant_region[]=EU&valorant_region[]=AP&valorant_region[]=NA&valorant_region[]=LA&daybreak=7&nsb=1&knife=1&order_by=published_date&order_direction=desc"
-    
-    headers = {'Authorization': f'Bearer {config.LZT_TOKEN}'}
-    loop = asyncio.get_running_loop()
-
-    listing_data = None
-    with concurrent.futures.ThreadPoolExecutor() as pool:
-        listing_data = await loop.run_in_executor(pool, fetch_listings_sync, list_url, headers)
-
-    if listing_data is None or 'items' not in listing_data:
-        print("[TASK ERRO] Falha ao buscar/parsear lista de contas LZT para Internacional.")
-        return
-
-    current_items = listing_data.get('items', [])
-    if not current_items: 
-        print("[TASK INFO] Nenhuma conta internacional na listagem atual.")
-        return
-
-    current_item_ids = {item.get('item_id') for item in current_items if item.get('item_id')}
-    print(f"[TASK INFO] IDs atuais Internacional: {len(current_item_ids)}")
-    new_ids = sorted(list(current_item_ids - seen_item_ids_international), reverse=True)
-    print(f"[TASK INFO] IDs novos Internacional: {len(new_ids)}")
-
-    if not new_ids:
-        # Não há novos IDs, ativar o cooldown
-        print(f"[TASK INFO] Nenhum ID novo Internacional encontrado. Entrando em modo de cooldown por {COOLDOWN_DURATION} segundos...")
-        last_zero_ids_time_international = current_time
-        in_cooldown_mode_international = True
-        
-        # Atualizar IDs vistos para evitar verificações desnecessárias depois do cooldown
-        if current_item_ids != seen_item_ids_international:
-            print("[TASK INFO] Atualizando vistos com IDs atuais Internacional.")
-            seen_item_ids_international = current_item_ids
-            save_seen_ids_international()
-        return
-    
-    # Processar novos IDs
-    print(f"[TASK INFO] Processando {min(len(new_ids), MAX_NEW_ACCOUNTS_PER_CYCLE)} novos IDs Internacional: {new_ids[:MAX_NEW_ACCOUNTS_PER_CYCLE]}")
-    newly_processed_ids = set()
-    processed_count = 0
-    
-    for item_id in new_ids:
-        if item_id is None: continue
-        if processed_count >= MAX_NEW_ACCOUNTS_PER_CYCLE:
-             print(f"[TASK INFO] Limite de {MAX_NEW_ACCOUNTS_PER_CYCLE} contas Internacional por ciclo atingido.")
-             break # Sai do loop se atingir o limite
-
-        item_details_data = None
-        with concurrent.futures.ThreadPoolExecutor() as pool:
-             item_details_data = await loop.run_in_executor(pool, fetch_item_details_sync, item_id, headers)
-
-        if item_details_data and 'item' in item_details_data:
-            # Como os filtros já foram aplicados na API, podemos processar diretamente
-            await process_new_international_account(item_id, item_details_data['item'])
-            newly_processed_ids.add(item_id)
-            processed_count += 1
-            await asyncio.sleep(FETCH_DETAILS_DELAY) # Delay entre processar cada conta nova
-        else:
-            print(f"[TASK ERRO] Falha ao obter detalhes para ID Internacional: {item_id}")
-            newly_processed_ids.add(item_id) # Adiciona mesmo se falhar para não tentar de novo
-
-    seen_item_ids_international.update(newly_processed_ids)
-    save_seen_ids_international()
-
-# --- Loop de Tarefas para Atualizar Taxa de Câmbio ---
-@tasks.loop(hours=EXCHANGE_RATE_UPDATE_HOURS)
-async def update_exchange_rate():
-    global usd_to_brl_rate
-    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Atualizando taxa de câmbio USD -> BRL...")
-    loop = asyncio.get_running_loop()
-    with concurrent.futures.ThreadPoolExecutor() as pool:
-        rate = await loop.run_in_executor(pool, fetch_exchange_rate_sync)
-
-    if rate is not None:
-        usd_to_brl_rate = rate
-        print(f"[INFO] Taxa de câmbio atualizada: 1 USD = {usd_to_brl_rate} BRL")
-    else:
-        print("[ERRO] Não foi possível atualizar a taxa de câmbio.")
-
-# --- Eventos do Bot e Inicialização ---
-
-@bot.event
-async def on_connect(): print("Bot conectado ao Discord.")
-@bot.event
-async def on_disconnect(): print("Bot desconectado do Discord.")
-
-@bot.event
-async def on_ready():
-    print(f'Bot conectado como {bot.user}')
-    
-    # Listar todos os servidores e canais visíveis
-    print('Servidores e canais visíveis:')
-    for guild in bot.guilds:
-        print(f'- Servidor: {guild.name} (ID: {guild.id})')
-        for channel in guild.text_channels:
-            try:
-                # Tenta acessar o canal para verificar permissões
-                await channel.guild.fetch_channel(channel.id)
-                print(f'  - Canal: {channel.name} (ID: {channel.id}) - Acessível')
-            except Exception as e:
-                print(f'  - Canal: {channel.name} (ID: {channel.id}) - Não acessível: {e}')
-    
-    print('------')
-    # Carrega IDs vistos, mapeamento de contas e configuração de margem
-    load_seen_ids()
-    load_seen_ids_international()
-    load_account_mapping()
-    load_account_mapping_international()
-    load_price_margin()
-    
-    if not update_exchange_rate.is_running():
-        update_exchange_rate.start() # Inicia loop da taxa de câmbio
-    
-    if not check_new_accounts.is_running():
-        check_new_accounts.start()
-    
-    # Adicionar um atraso antes de iniciar a tarefa de contas internacionais
-    # Ajuste o tempo de espera conforme necessário (ex: 10-15 segundos)
-    print("[INFO] Aguardando para iniciar a verificação de contas internacionais para evitar rate limit...")
-    await asyncio.sleep(15) 
-    
-    if not check_new_international_accounts.is_running():
-        check_new_international_accounts.start()
-
-# --- Bloco final para rodar o Bot ---
-if __name__ == "__main__":
-    # Verificações de token e canal alvo
-    if not config.TOKEN: print("ERRO CRÍTICO: Token Discord não encontrado!"); exit()
-    if not config.LZT_TOKEN: print("[AVISO] Token API LZT não encontrado.")
-    if not config.TARGET_CLIENT_CHANNEL_ID: print("[ERRO CRÍTICO] TARGET_CLIENT_CHANNEL_ID não definido!"); exit()
-    if not config.TARGET_VENDOR_CHANNEL_ID: print("[ERRO CRÍTICO] TARGET_VENDOR_CHANNEL_ID não definido!"); exit()
-    if not config.TARGET_INTERNATIONAL_CHANNEL_ID: print("[ERRO CRÍTICO] TARGET_INTERNATIONAL_CHANNEL_ID não definido!"); exit()
-    if not config.EXCHANGE_RATE_API_KEY: print("[AVISO] Chave da API de Câmbio não definida, a conversão para BRL não funcionará.")
-
-    try: bot.run(config.TOKEN)
-    except discord.errors.LoginFailure: print("ERRO CRÍTICO: Falha no login do Discord - Token inválido.")
-    except discord.errors.PrivilegedIntentsRequired: print("ERRO CRÍTICO: Intents Privilegiadas não habilitadas!")
+# Rodando como script (python bot.py): inicia por main.py. Os processos de
+# renderização reimportam o script principal, e este arquivo monta o bot inteiro
+# (config, logs, Discord, banco, métricas) só de ser importado.
+if __name__ == "__main__":
+    import os
+    import runpy
+    runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py"), run_name="__main__")
+    raise SystemExit
+
+import discord
+from discord.ext import tasks, commands
+import config
+import requests
+import asyncio
+from datetime import datetime
+import io
+import concurrent.futures
+import logging
+import time 
+from logs import setup_logging, shutdown_logging
+from lzt_client import LZTClient
+from rate_limiter import RateLimiter, PRIORITY_INTERACTIVE, PRIORITY_POLLING, PRIORITY_BACKGROUND
+from skin_cache import SkinCatalog
+from icon_cache import IconCache
+from renderer import image_filename
+from render_pool import RenderPool
+from executors import ExecutorRegistry
+from metrics import REGISTRY, MetricsServer, GRID_RENDER_SECONDS, DISCORD_SEND_SECONDS, ITEM_LATENCY_SECONDS
+from grid_cache import GridCache
+from pipeline import PostingPipeline, PublishFailed
+from polling import AdaptiveSchedule
+from feeds import FeedDefinition, FeedEngine
+from state_store import StateStore
+from seen_window import SeenIdWindow
+from client_ids import ClientIdAllocator
+from item_cache import ItemCache
+from revalidation import ListingRevalidator, STATUS_ACTIVE, STATUS_SOLD
+from tracing import LatencyTracer, NULL_TRACE, QUANTILES, STAGES
+
+# Logs em fila antes de qualquer módulo começar a registrar eventos
+setup_logging(config.LOG_LEVEL, config.LOG_FORMAT, config.LOG_LEVELS)
+log = logging.getLogger("valbot.bot")
+skin_log = logging.getLogger("valbot.skins")
+grid_log = logging.getLogger("valbot.render")
+discord_log = logging.getLogger("valbot.discord")
+revalidation_log = logging.getLogger("valbot.revalidate")
+
+# --- Constantes e Configuração ---
+SEEN_IDS_FILE = "seen_ids.json"
+SEEN_IDS_INTERNATIONAL_FILE = "seen_ids_international.json"  # Arquivo separado para contas internacionais
+ACCOUNT_MAPPING_FILE = "account_mapping.json"  # Para mapeamento entre IDs únicos e reais
+ACCOUNT_MAPPING_INTERNATIONAL_FILE = "account_mapping_international.json"  # Para contas internacionais
+MARGIN_CONFIG_FILE = "margin_config.json"  # Para armazenar a configuração de margem
+SKIN_CATALOG_FILE = "skin_catalog.json"  # Cache local dos metadados das skins (valorant-api.com)
+ICON_CACHE_DIR = "icon_cache"  # Miniaturas dos ícones das skins, indexadas pelo hash da URL
+POLL_CURSORS_FILE = "poll_cursors.json"  # Conta mais nova já processada por feed
+STATE_DB_FILE = "bot_state.db"  # Banco SQLite com IDs vistos, mapeamentos e configurações
+POLLING_INTERVAL_SECONDS = 90  # Intervalo inicial; depois é ajustado pelo agendador adaptativo
+API_TIMEOUT = 20 
+MAX_SKINS_IN_GRID = 12
+SKIN_GRID_COLS = 3
+SKIN_THUMB_SIZE = (100, 40)
+SKIN_CARD_WIDTH = 150
+SKIN_ICON_HEIGHT = 60  # Altura fixa dos ícones nos cartões
+EXCHANGE_RATE_UPDATE_HOURS = 6
+SKIN_CATALOG_CHECK_HOURS = 6
+poll_international = False
+FEED_TICK_SECONDS = 5  # Resolução do agendador de feeds
+STATE_FLUSH_SECONDS = 1  # Intervalo de gravação do estado em lote
+
+
+# Pools de threads compartilhados por todas as chamadas bloqueantes
+executors = ExecutorRegistry()
+io_pool = executors.register("io", config.IO_POOL_WORKERS)  # Rede avulsa: câmbio, catálogo
+skin_pool = executors.register("skins", config.SKIN_FETCH_CONCURRENCY)  # Metadados e ícones das skins (todas as grades somadas)
+render_threads = executors.register("render", config.RENDER_POOL_THREADS)  # Montagem das grades
+state_pool = executors.register("state", 1)  # Banco de estado (escritas serializadas)
+
+# Variáveis globais
+usd_to_brl_rate = None
+# Mapeamentos de ID de cliente para ID real; os códigos são únicos entre todos os namespaces
+client_ids = ClientIdAllocator()
+MAPPING_LABELS = {'br': 'BR', 'international': 'Internacional'}
+price_margin = 0  # Porcentagem de margem de preço (0% por padrão)
+skin_catalog = SkinCatalog(
+    SKIN_CATALOG_FILE,
+    config.VALORANT_API_BASE_URL,
+    ttl_seconds=config.SKIN_CATALOG_TTL_HOURS * 3600,
+    negative_ttl_seconds=config.SKIN_NEGATIVE_TTL_HOURS * 3600,
+)
+http_session = requests.Session()  # Conexões keep-alive para o download dos ícones
+grid_cache = GridCache(
+    max_entries=config.GRID_CACHE_MAX_ENTRIES,
+    max_bytes=config.GRID_CACHE_MAX_MB * 1024 * 1024,
+    url_ttl_seconds=config.GRID_ATTACHMENT_URL_TTL_HOURS * 3600,
+)
+grid_renders_in_flight = {}  # Renderizações em andamento por chave da grade
+item_cache = ItemCache(
+    max_entries=config.ITEM_CACHE_MAX_ENTRIES,
+    fresh_seconds=config.ITEM_CACHE_FRESH_MINUTES * 60,
+)
+item_refreshes_in_flight = {}  # Buscas de detalhes em andamento por item_id
+background_tasks = set()  # Referências das tasks disparadas pelos comandos
+# Latência de cada conta nova, do published_date da LZT até o envio ao cliente
+latency_tracer = LatencyTracer(config.TRACE_SAMPLES, histogram=ITEM_LATENCY_SECONDS)
+
+# --- Funções de Armazenamento ---
+# Arquivos JSON usados antes do SQLite (importados uma única vez na inicialização)
+LEGACY_SEEN_IDS_FILES = {'br': SEEN_IDS_FILE, 'international': SEEN_IDS_INTERNATIONAL_FILE}
+LEGACY_ACCOUNT_MAPPING_FILES = {'br': ACCOUNT_MAPPING_FILE, 'international': ACCOUNT_MAPPING_INTERNATIONAL_FILE}
+
+state_store = StateStore(STATE_DB_FILE)
+
+def load_state():
+    """Abre o banco de estado, importa os JSON antigos e carrega mapeamentos e margem."""
+    global price_margin
+    state_store.open()
+    state_store.migrate_json(LEGACY_SEEN_IDS_FILES, LEGACY_ACCOUNT_MAPPING_FILES, MARGIN_CONFIG_FILE, POLL_CURSORS_FILE)
+    
+    client_ids.load(state_store.load_mappings())
+    for namespace in MAPPING_LABELS:
+        log.info("Carregados %d mapeamentos de conta (%s).", client_ids.count(namespace), namespace)
+    
+    price_margin = state_store.get_setting('price_margin', 0)
+    log.info("Margem de preço carregada: %s%%", price_margin)
+
+def load_seen_ids(feed_name):
+    """Monta a janela de IDs vistos do feed só com o que ainda está dentro do horizonte."""
+    seen_ids = SeenIdWindow(config.SEEN_IDS_HORIZON_HOURS * 3600, config.SEEN_IDS_MAX)
+    since = time.time() - seen_ids.horizon_seconds
+    for item_id, seen_at in state_store.load_seen_ids(feed_name, since):
+        seen_ids.add(item_id, seen_at)
+    log.info("Carregados %d IDs vistos do feed %s.", len(seen_ids), feed_name, extra={'feed': feed_name})
+    return seen_ids
+
+def save_price_margin():
+    """Salva a configuração de margem de preço."""
+    state_store.set_setting('price_margin', price_margin)
+
+# --- Funções Síncronas (Executor) ---
+def get_valorant_skin_details_sync(skin_uuid):
+    """Busca NOME e URL do ÍCONE de uma skin (catálogo local, valorant-api.com em cache miss)."""
+    return skin_catalog.lookup(skin_uuid)
+
+def download_image_sync(url):
+    """Baixa uma imagem de uma URL e retorna os bytes."""
+   
+    try:
+        response = http_session.get(url, timeout=10); response.raise_for_status()
+        return response.content
+    except Exception as e: skin_log.warning("Erro ao baixar %s: %s", url, e, extra={'url': url}); return None
+
+icon_cache = IconCache(
+    ICON_CACHE_DIR,
+    download_image_sync,
+    max_memory_bytes=config.ICON_CACHE_MEMORY_MB * 1024 * 1024,
+    max_disk_bytes=config.ICON_CACHE_DISK_MB * 1024 * 1024,
+    thumb_max_width=SKIN_CARD_WIDTH - 10,
+    thumb_height=SKIN_ICON_HEIGHT,
+)
+
+# Composição e codificação das grades em processos dedicados (fora do GIL do bot);
+# cada processo prepara fonte, fundo dos cartões e rótulos dos nomes uma única vez
+grid_renderer = RenderPool(
+    dict(
+        card_width=SKIN_CARD_WIDTH,
+        card_height=90,
+        padding=5,
+        output_format=config.GRID_IMAGE_FORMAT,
+        target_bytes=int(config.GRID_IMAGE_TARGET_KB * 1024) or None,
+        quality=config.GRID_IMAGE_QUALITY,
+    ),
+    workers=config.RENDER_PROCESSES or None,
+    max_pending=config.RENDER_MAX_PENDING or None,
+    profile_dir=config.RENDER_PROFILE_DIR,
+    profile_renders=config.RENDER_PROFILE_RENDERS,
+)
+
+def fetch_skin_thumbnail_sync(skin_uuid, trace=NULL_TRACE):
+    """Etapa encadeada de uma skin: metadados -> miniatura do ícone. Retorna (nome, miniatura)."""
+    with trace.span('skins'):
+        details = get_valorant_skin_details_sync(skin_uuid)
+    if not details:
+        return None
+    
+    with trace.span('icons'):
+        thumbnail = icon_cache.get_thumbnail(details['icon_url'])
+    if thumbnail is None:
+        skin_log.warning("Falha ao baixar ícone para %s", details['name'], extra={'skin_uuid': skin_uuid})
+        return None
+    return details['name'], thumbnail
+
+def fetch_and_create_skin_grid_sync(skin_uuids, trace=NULL_TRACE):
+    """Busca detalhes, baixa ícones e cria a imagem da grade (retorna os bytes codificados)."""
+    
+    grid_uuids = skin_uuids[:MAX_SKINS_IN_GRID]
+    started = time.perf_counter()
+    skin_log.debug("Buscando detalhes para %d UUIDs...", len(grid_uuids))
+    
+    # Todas as skins seguem em paralelo pelo pipeline (limitado por SKIN_FETCH_CONCURRENCY, somando todas as grades)
+    cards = [None] * len(grid_uuids)
+    future_to_index = {
+        skin_pool.submit(fetch_skin_thumbnail_sync, skin_uuid, trace): index
+        for index, skin_uuid in enumerate(grid_uuids)
+    }
+    try:
+        for future in concurrent.futures.as_completed(future_to_index, timeout=config.SKIN_GRID_DEADLINE_SECONDS):
+            try:
+                cards[future_to_index[future]] = future.result()
+            except Exception as e:
+                skin_log.warning("Erro no pipeline da skin: %s", e)
+    except concurrent.futures.TimeoutError:
+        # Prazo total estourado: a grade sai com as skins que já chegaram.
+        # Downloads em andamento terminam em segundo plano e alimentam os caches.
+        for future in future_to_index:
+            future.cancel()
+        skin_log.warning("Prazo de %ss excedido, usando as skins já prontas.", config.SKIN_GRID_DEADLINE_SECONDS)
+    
+    # Persiste entradas novas do catálogo (não faz nada se nada mudou)
+    skin_catalog.save()
+    
+    # Mantém a ordem original do inventário
+    cards = [card for card in cards if card is not None]
+    if not cards:
+        return None
+        
+    fetched = time.perf_counter()
+    with trace.span('render'):
+        grid_bytes = grid_renderer.render(cards, grid_cols=SKIN_GRID_COLS)
+    grid_log.debug("Grade com %d skins criada.", len(cards), extra={
+        'skins': len(cards),
+        'fetch_ms': round((fetched - started) * 1000, 1),
+        'render_ms': round((time.perf_counter() - fetched) * 1000, 1),
+    })
+    return grid_bytes
+
+def fetch_exchange_rate_sync():
+    """Busca a taxa de câmbio USD para BRL."""
+    if not config.EXCHANGE_RATE_API_KEY:
+        log.warning("Chave da API de Câmbio não configurada.")
+        return None
+    api_url = f"https://v6.exchangerate-api.com/v6/{config.EXCHANGE_RATE_API_KEY}/latest/USD"
+    try:
+        response = http_session.get(api_url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("result") == "success":
+            rate = data.get("conversion_rates", {}).get("BRL")
+            log.debug("Taxa USD->BRL obtida: %s", rate)
+            return rate
+        else:
+            log.error("Erro na resposta da API de Câmbio: %s", data.get('error-type'))
+            return None
+    except Exception as e:
+        log.error("Exceção ao buscar taxa de câmbio: %s", e)
+        return None
+
+# --- Fim das Funções Síncronas ---
+
+# --- Configuração do Bot ---
+intents = discord.Intents.default()
+intents.message_content = True  # Necessário para comandos
+
+# Limitador de taxa único para todas as chamadas à API LZT
+lzt_rate_limiter = RateLimiter(
+    config.LZT_RATE_LIMIT_REQUESTS,
+    config.LZT_RATE_LIMIT_WINDOW_SECONDS,
+    burst=config.LZT_RATE_LIMIT_BURST,
+)
+
+# Cliente HTTP compartilhado para a API LZT (pool de conexões com keep-alive)
+lzt_client = LZTClient(
+    config.LZT_TOKEN,
+    config.API_BASE_URL,
+    limiter=lzt_rate_limiter,
+    timeout=API_TIMEOUT,
+    max_connections=config.LZT_MAX_CONNECTIONS,
+)
+
+class ValorantBot(commands.Bot):
+    async def close(self):
+        # Para primeiro tudo o que ainda usa o cliente LZT, os executores e o banco:
+        # os loops periódicos, os ciclos dos feeds e o pipeline
+        loops = (run_feeds, update_exchange_rate, flush_state, revalidate_listings, prune_seen_ids, refresh_skin_catalog)
+        for loop in loops:
+            loop.cancel()
+        await asyncio.gather(*filter(None, (loop.get_task() for loop in loops)), return_exceptions=True)
+        await feed_engine.stop()
+        await posting_pipeline.stop()
+        await lzt_client.close()
+        # Os encerramentos abaixo bloqueiam (esperam threads, processos e o banco): rodam fora do loop
+        await asyncio.to_thread(executors.shutdown)  # Descarta o que está na fila e espera o que já está rodando
+        await asyncio.to_thread(state_store.close)  # Última gravação do que ainda estiver pendente
+        await asyncio.to_thread(grid_renderer.shutdown)
+        await asyncio.to_thread(metrics_server.stop)
+        await super().close()
+        shutdown_logging()  # Escreve o que ainda estiver na fila de logs
+
+# Cria o cliente do bot com suporte a comandos
+bot = ValorantBot(command_prefix='/', intents=intents)
+
+def extract_skin_ids(item_data):
+    """Combina as skins de armas e facas do inventário, na ordem da API."""
+    skins_list_ids = []
+    inventory = item_data.get('valorantInventory') or {}
+    if 'WeaponSkins' in inventory:
+        skins_list_ids.extend(inventory['WeaponSkins'])
+    if 'KnifesSkins' in inventory:
+        skins_list_ids.extend(inventory['KnifesSkins'])
+    return skins_list_ids
+
+async def fetch_item_details_cached(item_id, priority=PRIORITY_POLLING):
+    """Busca os detalhes na LZT e guarda o payload no cache de contas."""
+    item_details_data = await lzt_client.fetch_item_details(item_id, priority=priority)
+    if item_details_data and 'item' in item_details_data:
+        item_cache.put(item_id, item_details_data['item'])
+    return item_details_data
+
+async def refresh_item_details(item_id, priority=PRIORITY_INTERACTIVE):
+    """Atualiza os detalhes de uma conta; pedidos simultâneos do mesmo item compartilham a busca."""
+    fetch = item_refreshes_in_flight.get(item_id)
+    if fetch is None:
+        fetch = asyncio.ensure_future(fetch_item_details_cached(item_id, priority))
+        item_refreshes_in_flight[item_id] = fetch
+        fetch.add_done_callback(lambda _: item_refreshes_in_flight.pop(item_id, None))
+    return await asyncio.shield(fetch)
+
+def spawn_background(coro):
+    """Dispara uma coroutine sem bloquear o comando, mantendo a referência da task."""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def format_age(seconds):
+    """Idade legível dos dados em cache."""
+    if seconds < 60:
+        return "agora mesmo"
+    if seconds < 3600:
+        return f"há {int(seconds // 60)} min"
+    return f"há {seconds / 3600:.1f} h"
+
+async def get_skin_grid(item_id, skins_list_ids):
+    """Retorna (bytes da imagem, URL de anexo reaproveitável) da grade, renderizando só uma vez por conta."""
+    key = GridCache.make_key(item_id, skins_list_ids[:MAX_SKINS_IN_GRID])
+    cached = grid_cache.get(key)
+    if cached:
+        grid_log.debug("Grade reaproveitada do cache.", extra={'item_id': item_id})
+        return cached
+
+    # Envios simultâneos da mesma conta compartilham a mesma renderização
+    render = grid_renders_in_flight.get(key)
+    if render is None:
+        trace = latency_tracer.get(item_id)
+        render = asyncio.ensure_future(render_threads.run(fetch_and_create_skin_grid_sync, skins_list_ids, trace))
+        grid_renders_in_flight[key] = render
+        try:
+            with GRID_RENDER_SECONDS.time():
+                grid_bytes = await render
+        finally:
+            grid_renders_in_flight.pop(key, None)
+        if grid_bytes:
+            grid_cache.put(key, grid_bytes)
+    else:
+        grid_bytes = await asyncio.shield(render)
+
+    # Grade recém-renderizada: devolve os bytes direto (reler pelo cache contaria um acerto falso)
+    return (grid_bytes, None) if grid_bytes else (None, None)
+
+def remember_grid_attachment(item_id, skins_list_ids, message):
+    """Guarda a URL do anexo enviado para que a próxima mensagem reaproveite a imagem."""
+    try:
+        if message.embeds and message.embeds[0].image and message.embeds[0].image.url:
+            key = GridCache.make_key(item_id, skins_list_ids[:MAX_SKINS_IN_GRID])
+            grid_cache.set_attachment_url(key, message.embeds[0].image.url)
+    except Exception as e:
+        grid_log.warning("Falha ao registrar anexo: %s", e, extra={'item_id': item_id})
+
+async def process_feed_account(feed, item_id, item_data):
+    """Processa uma nova conta de um feed, gerando ID único e enviando apenas para o canal do feed."""
+    # ID de cliente único em todos os namespaces (conta relistada mantém o código anterior)
+    unique_id, reused = client_ids.assign(item_id, feed.namespace)
+    if reused:
+        log.info("Conta já tinha ID de cliente (relistada ou reenvio); reaproveitando %s", unique_id,
+                 extra={'feed': feed.name, 'item_id': item_id, 'client_id': unique_id})
+    
+    # Enviar apenas para o canal do feed (informações limitadas com margem de preço)
+    message = await send_client_embed(feed.channel_id, item_id, item_data, unique_id, is_international=feed.international)
+    if message is None:
+        # Nada foi publicado: sem mapeamento, e o pipeline conta a falha e tenta de novo
+        raise PublishFailed(f"mensagem não enviada ao canal {feed.channel_id}")
+    
+    # Salvar o mapeamento para uso futuro (com o preço do momento da publicação e a
+    # mensagem enviada, que a revalidação edita se a conta for vendida ou mudar de preço)
+    state_store.add_mapping(
+        unique_id, item_id, feed.name, feed.namespace,
+        price=item_data.get('price'), currency=item_data.get('price_currency'),
+        channel_id=message.channel.id,
+        message_id=message.id,
+    )
+    
+    log.info("Conta processada com ID de cliente %s", unique_id,
+             extra={'feed': feed.name, 'item_id': item_id, 'client_id': unique_id})
+    return unique_id
+
+def vendor_price_display(item_data):
+    """Preço original da conta, convertido para BRL quando estiver em USD (sem margem)."""
+    price_original = item_data.get('price', 0)
+    currency_original = item_data.get('price_currency', '').upper()
+    price_display = f"{price_original} {currency_original}"
+    if currency_original == 'USD' and usd_to_brl_rate:
+        try:
+            price_in_brl = float(price_original) * usd_to_brl_rate
+            price_display = f"R$ {price_in_brl:.2f}"
+        except Exception as e:
+            log.error("Erro ao converter preço: %s", e)
+    return price_display
+
+async def send_vendor_embed(target_channel_id, item_id, item_data, unique_id):
+    """Formata e envia o embed com todas as informações para o canal do vendedor."""
+    channel = bot.get_channel(target_channel_id)
+    if not channel:
+        discord_log.warning("Canal do vendedor %s fora do cache; buscando na API.", target_channel_id)
+        try:
+            channel = await bot.fetch_channel(target_channel_id)
+        except Exception as e:
+            discord_log.error("Não foi possível buscar o canal do vendedor: %s", e, extra={'channel_id': target_channel_id})
+            return
+            
+        if not channel:
+            discord_log.critical("Impossível encontrar o canal do vendedor %s.", target_channel_id)
+            return
+
+    account_url = f"https://lzt.market/{item_id}"
+
+    # --- Extração de Dados Principais ---
+    region = item_data.get('riot_valorant_region', 'N/A')
+    title = item_data.get('title', 'Título N/A')
+    price_original = item_data.get('price', 0)
+    currency_original = item_data.get('price_currency', '').upper()
+    skin_count_total = item_data.get('riot_valorant_skin_count', 'N/A')
+    skin_count_guns = 0
+    skin_count_knifes = 0
+    
+    # Contar skins de armas e facas separadamente
+    if 'valorantInventory' in item_data and 'WeaponSkins' in item_data['valorantInventory']:
+        skin_count_guns = len(item_data['valorantInventory']['WeaponSkins'])
+    
+    if 'valorantInventory' in item_data and 'KnifesSkins' in item_data['valorantInventory']:
+        skin_count_knifes = len(item_data['valorantInventory']['KnifesSkins'])
+    
+    vp_amount = item_data.get('riot_valorant_wallet_vp', 'N/A')
+    rp_amount = item_data.get('riot_valorant_wallet_rp', 'N/A')
+    inventory_vp_value = item_data.get('riot_valorant_inventory_value', 'N/A')
+    current_rank = item_data.get('valorantRankTitle', 'N/A')
+    last_rank = item_data.get('valorantLastRankTitle', 'N/A')
+    level = item_data.get('riot_valorant_level', 'N/A')
+    
+    # Preparar descrição com skins especiais
+    description = f"**{title}**"
+    
+    # Conversão de Preço para BRL (sem margem para o vendedor)
+    price_display = vendor_price_display(item_data)
+    
+    # Formatação da data
+    timestamp = item_data.get('account_last_activity', None)
+    last_activity_str = "N/A"
+    if timestamp:
+        try:
+            last_activity_str = datetime.fromtimestamp(timestamp).strftime('%d/%m/%Y %H:%M:%S')
+        except Exception:
+            last_activity_str = "Data inválida"
+
+    # --- Montar Embed para Vendedor (informação completa) ---
+    embed = discord.Embed(
+        title=f"✨ Detalhes da Conta {region} ✨",
+        description=description,
+        color=0x2F3136
+    )
+    
+    # Primeira linha de campos
+    embed.add_field(name="💰 Inventário (VP)", value=f"{inventory_vp_value}", inline=True)
+    embed.add_field(name="🔫 Skins", value=f"{skin_count_total}", inline=True)
+    embed.add_field(name="💸 VP Carteira", value=f"{vp_amount}", inline=True)
+    
+    # Segunda linha de campos
+    embed.add_field(name="💎 RP Carteira", value=f"{rp_amount}", inline=True)
+    embed.add_field(name="🌍 Região", value=f"{region}", inline=True)
+    embed.add_field(name="💲 Preço Original", value=f"{price_display}", inline=True)
+    
+    # Terceira linha de campos
+    embed.add_field(name="🏆 Rank Atual", value=f"{current_rank}", inline=True)
+    embed.add_field(name="🏅 Último Rank", value=f"{last_rank}", inline=True)
+    embed.add_field(name="📊 Level", value=f"{level}", inline=True)
+    
+    # Última atividade
+    embed.add_field(name="📅 Última Atividade", value=last_activity_str, inline=False)
+    
+    # Link para o LZT Market
+    embed.add_field(name="🔗 Link para Compra", value=account_url, inline=False)
+    
+    # Adicionar o ID único para referência
+    embed.add_field(name="🔑 ID Cliente", value=unique_id, inline=False)
+    
+    # Mostrar informação sobre margem (se aplicável)
+    if price_margin > 0:
+        # Calcular o preço com margem para mostrar a diferença
+        price_with_margin = price_display
+        if currency_original == 'USD' and usd_to_brl_rate:
+            try:
+                price_in_brl = float(price_original) * usd_to_brl_rate
+                price_with_margin_value = price_in_brl * (1 + (price_margin / 100))
+                price_with_margin = f"R$ {price_with_margin_value:.2f}"
+            except Exception as e:
+                log.error("Erro ao calcular preço com margem: %s", e)
+        elif price_original:
+            try:
+                price_with_margin_value = float(price_original) * (1 + (price_margin / 100))
+                price_with_margin = f"{price_with_margin_value:.2f} {currency_original}"
+            except Exception as e:
+                log.error("Erro ao calcular preço com margem: %s", e)
+        
+        embed.add_field(name="📈 Informação de Margem", 
+                       value=f"Margem atual: **{price_margin}%**\nPreço mostrado ao cliente: **{price_with_margin}**", 
+                       inline=False)
+    
+    # Footer
+    embed.set_footer(text=f"ID Real: {item_id} | Verificado por {bot.user.name}")
+
+    # --- Geração e Envio da Grade de Skins ---
+    grid_image_file = None
+    skins_list_ids = extract_skin_ids(item_data)
+    
+    if skins_list_ids:
+        grid_bytes, grid_url = await get_skin_grid(item_id, skins_list_ids)
+
+        if grid_url:
+            # Grade idêntica já enviada antes: reaproveita o anexo da mensagem anterior
+            embed.set_image(url=grid_url)
+        elif grid_bytes:
+            grid_filename = image_filename(grid_bytes)
+            grid_image_file = discord.File(fp=io.BytesIO(grid_bytes), filename=grid_filename)
+            embed.set_image(url=f"attachment://{grid_filename}")
+        else:
+            embed.add_field(name="🖼️ Skins Preview", value="Falha ao gerar preview.", inline=False)
+    else:
+        embed.add_field(name="🖼️ Skins Preview", value="Nenhuma skin listada para gerar preview.", inline=False)
+
+    # --- Enviar a Mensagem Final ---
+    try:
+        with DISCORD_SEND_SECONDS.time('vendor') as timer:
+            message = await channel.send(embed=embed, file=grid_image_file if grid_image_file else None)
+        if grid_image_file:
+            remember_grid_attachment(item_id, skins_list_ids, message)
+        discord_log.info("Embed do vendedor enviado.", extra={
+            'item_id': item_id, 'channel_id': target_channel_id, 'duration_ms': timer.elapsed_ms()})
+    except Exception as e:
+        discord_log.error("Erro ao enviar mensagem do vendedor: %s", e, extra={'item_id': item_id})
+
+
+def client_price_display(price_original, currency_original):
+    """Preço mostrado ao cliente: convertido para BRL quando estiver em USD e com a margem aplicada."""
+    currency_original = (currency_original or '').upper()
+    price_display = f"{price_original} {currency_original}"
+    if currency_original == 'USD' and usd_to_brl_rate:
+        try:
+            # Aplica a conversão de moeda
+            price_in_brl = float(price_original) * usd_to_brl_rate
+            
+            # Aplica a margem de preço
+            if price_margin > 0:
+                price_with_margin = price_in_brl * (1 + (price_margin / 100))
+                price_display = f"R$ {price_with_margin:.2f}"
+            else:
+                price_display = f"R$ {price_in_brl:.2f}"
+        except Exception as e:
+            log.error("Erro ao converter/aplicar margem ao preço: %s", e)
+    elif price_margin > 0:
+        # Se não for USD ou não tiver taxa de câmbio, mas tiver margem
+        try:
+            price_with_margin = float(price_original) * (1 + (price_margin / 100))
+            price_display = f"{price_with_margin:.2f} {currency_original}"
+        except Exception as e:
+            log.error("Erro ao aplicar margem ao preço: %s", e)
+    return price_display
+
+async def send_client_embed(target_channel_id, item_id, item_data, unique_id, is_international=False):
+    """Formata e envia o embed com informações limitadas para o canal do cliente (retorna a mensagem)."""
+    channel = bot.get_channel(target_channel_id)
+    if not channel:
+        discord_log.warning("Canal do cliente %s fora do cache; buscando na API.", target_channel_id)
+        try:
+            channel = await bot.fetch_channel(target_channel_id)
+        except Exception as e:
+            discord_log.error("Não foi possível buscar o canal do cliente: %s", e, extra={'channel_id': target_channel_id})
+            return
+            
+        if not channel:
+            discord_log.critical("Impossível encontrar o canal do cliente %s.", target_channel_id)
+            return
+
+    # --- Extração de Dados Principais ---
+    region = item_data.get('riot_valorant_region', 'N/A')
+    price_original = item_data.get('price', 0)
+    currency_original = item_data.get('price_currency', '').upper()
+    skin_count_total = item_data.get('riot_valorant_skin_count', 'N/A')
+    vp_amount = item_data.get('riot_valorant_wallet_vp', 'N/A')
+    rp_amount = item_data.get('riot_valorant_wallet_rp', 'N/A')
+    inventory_vp_value = item_data.get('riot_valorant_inventory_value', 'N/A')
+    current_rank = item_data.get('valorantRankTitle', 'N/A')
+    last_rank = item_data.get('valorantLastRankTitle', 'N/A')
+    level = item_data.get('riot_valorant_level', 'N/A')
+    
+    # Conversão de Preço para BRL com aplicação da margem
+    price_display = client_price_display(price_original, currency_original)
+    
+    # --- Montar Embed para Cliente (informação limitada) ---
+    title_text = "✨ Nova Conta BR Disponível ✨"
+    description_text = "**Conta Valorant**"
+    
+    # Customizar para contas internacionais
+    if is_international:
+        title_text = f"✨ Nova Conta {region} Disponível ✨"
+        description_text = "**Conta Valorant Internacional**"
+    
+    embed = discord.Embed(
+        title=title_text,
+        description=description_text,
+        color=0x2F3136
+    )
+    
+    # Primeira linha de campos
+    embed.add_field(name="💰 Inventário (VP)", value=f"{inventory_vp_value}", inline=True)
+    embed.add_field(name="🔫 Skins", value=f"{skin_count_total}", inline=True)
+    embed.add_field(name="💸 VP Carteira", value=f"{vp_amount}", inline=True)
+    
+    # Segunda linha de campos
+    embed.add_field(name="💎 RP Carteira", value=f"{rp_amount}", inline=True)
+    embed.add_field(name="🌍 Região", value=f"{region}", inline=True)
+    embed.add_field(name="💲 Preço", value=f"{price_display}", inline=True)
+    
+    # Terceira linha de campos
+    embed.add_field(name="🏆 Rank Atual", value=f"{current_rank}", inline=True)
+    embed.add_field(name="🏅 Último Rank", value=f"{last_rank}", inline=True)
+    embed.add_field(name="📊 Level", value=f"{level}", inline=True)
+    
+    # Formatação da data para o cliente
+    timestamp = item_data.get('account_last_activity', None)
+    last_activity_str = "N/A"
+    if timestamp:
+        try:
+            last_activity_str = datetime.fromtimestamp(timestamp).strftime('%d/%m/%Y %H:%M:%S')
+        except Exception:
+            last_activity_str = "Data inválida"
+            
+    # Adicionar campo de última atividade
+    embed.add_field(name="📅 Última Atividade", value=last_activity_str, inline=False)
+    
+    # ID da conta para o cliente
+    embed.add_field(name="🔑 ID da Conta", value=unique_id, inline=False)
+    embed.add_field(name="📢 Como Comprar", value="Entre em contato com um vendedor e informe o ID da conta para adquirir.", inline=False)
+    
+    # Footer (sem o ID real)
+    embed.set_footer(text=f"Verificado por {bot.user.name}")
+
+    # --- Geração e Envio da Grade de Skins ---
+    grid_image_file = None
+    skins_list_ids = extract_skin_ids(item_data)
+    
+    if skins_list_ids:
+        grid_bytes, grid_url = await get_skin_grid(item_id, skins_list_ids)
+
+        if grid_url:
+            # Grade idêntica já enviada antes: reaproveita o anexo da mensagem anterior
+            embed.set_image(url=grid_url)
+        elif grid_bytes:
+            grid_filename = image_filename(grid_bytes)
+            grid_image_file = discord.File(fp=io.BytesIO(grid_bytes), filename=grid_filename)
+            embed.set_image(url=f"attachment://{grid_filename}")
+        else:
+            embed.add_field(name="🖼️ Skins Preview", value="Falha ao gerar preview.", inline=False)
+    else:
+        embed.add_field(name="🖼️ Skins Preview", value="Nenhuma skin listada para gerar preview.", inline=False)
+
+    # --- Enviar a Mensagem Final ---
+    try:
+        with DISCORD_SEND_SECONDS.time('client') as timer, latency_tracer.get(item_id).span('send'):
+            message = await channel.send(embed=embed, file=grid_image_file if grid_image_file else None)
+        if grid_image_file:
+            remember_grid_attachment(item_id, skins_list_ids, message)
+        discord_log.info("Embed do cliente enviado.", extra={
+            'item_id': item_id, 'channel_id': target_channel_id, 'duration_ms': timer.elapsed_ms()})
+        return message
+    except Exception as e:
+        discord_log.error("Erro ao enviar mensagem do cliente: %s", e, extra={'item_id': item_id})
+
+
+# --- Comando de Busca por ID ---
+async def refresh_searched_account(ctx, account_id, real_item_id, label, cached_item, announce):
+    """Atualiza em segundo plano uma conta respondida do cache e avisa se algo mudou."""
+    priority = PRIORITY_INTERACTIVE if announce else PRIORITY_BACKGROUND
+    item_details_data = await refresh_item_details(real_item_id, priority)
+    if not item_details_data or 'item' not in item_details_data:
+        if announce:
+            await ctx.send(f"⚠️ Falha ao atualizar os detalhes da conta {account_id}. ID real: {real_item_id}")
+        return
+    item_data = item_details_data['item']
+    changed = any(item_data.get(field) != cached_item.get(field) for field in ('price', 'price_currency', 'item_state'))
+    if announce or changed:
+        await ctx.send(f"🔄 Dados da conta {label} {account_id} atualizados{' (houve mudanças)' if changed else ''}.")
+        await send_vendor_embed(ctx.channel.id, real_item_id, item_data, account_id)
+
+@bot.command(name="buscar")
+async def search_account(ctx, account_id: str, opcao: str = ""):
+    """Comando para buscar uma conta pelo ID fornecido pelo cliente (`atualizar` força dados novos)."""
+    # Verificar se o comando foi enviado no canal do vendedor
+    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
+        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
+        return
+    
+    # Os códigos são únicos entre os namespaces: uma consulta basta
+    mapping = client_ids.lookup(account_id)
+    if mapping is None:
+        await ctx.send(f"❌ Nenhuma conta encontrada com o ID {account_id}.")
+        return
+    namespace, real_item_id = mapping
+    account_id = account_id.strip().upper()
+    label = MAPPING_LABELS.get(namespace, namespace)
+    force_refresh = opcao.strip().lower() in ("atualizar", "refresh")
+    
+    # Responde na hora com os detalhes que o pipeline já buscou
+    cached = item_cache.get(real_item_id)
+    if cached is not None:
+        item_data, age = cached
+        stale = not item_cache.is_fresh(age)
+        region = item_data.get('riot_valorant_region', 'N/A')
+        region_text = "" if region == label else f" ({region})"
+        refresh_text = " Atualizando em segundo plano..." if stale or force_refresh else ""
+        await ctx.send(f"✅ Conta {label}{region_text} encontrada! ID do cliente: {account_id} (dados de {format_age(age)}).{refresh_text}")
+        await send_vendor_embed(ctx.channel.id, real_item_id, item_data, account_id)
+        if stale or force_refresh:
+            spawn_background(refresh_searched_account(ctx, account_id, real_item_id, label, item_data, announce=force_refresh))
+        return
+    
+    # Fora do cache: busca os detalhes da conta na hora
+    item_details_data = await refresh_item_details(real_item_id, PRIORITY_INTERACTIVE)
+    
+    if item_details_data and 'item' in item_details_data:
+        region = item_details_data['item'].get('riot_valorant_region', 'N/A')
+        region_text = "" if region == label else f" ({region})"
+        await ctx.send(f"✅ Conta {label}{region_text} encontrada! ID do cliente: {account_id}")
+        await send_vendor_embed(ctx.channel.id, real_item_id, item_details_data['item'], account_id)
+    else:
+        await ctx.send(f"⚠️ Conta com ID {account_id} encontrada no mapeamento {label}, mas falha ao buscar detalhes atualizados. ID real: {real_item_id}")
+
+# --- Comando de Busca em Lote ---
+MAX_BATCH_LOOKUP = 20  # Códigos por comando (cada um vira um campo do embed de resumo)
+
+@bot.command(name="buscarvarios")
+async def search_accounts(ctx, *codes: str):
+    """Busca várias contas de uma vez (`grades` no final também envia o embed completo de cada uma)."""
+    # Verificar se o comando foi enviado no canal do vendedor
+    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
+        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
+        return
+    
+    send_grids = bool(codes) and codes[-1].lower() in ("grades", "grade")
+    if send_grids:
+        codes = codes[:-1]
+    # Aceita códigos separados por espaço ou vírgula, sem repetições
+    requested = list(dict.fromkeys(
+        part.strip().upper() for code in codes for part in code.split(',') if part.strip()
+    ))
+    if not requested:
+        await ctx.send("Uso: `/buscarvarios ID1 ID2 ... [grades]`")
+        return
+    if len(requested) > MAX_BATCH_LOOKUP:
+        await ctx.send(f"⚠️ Apenas os primeiros {MAX_BATCH_LOOKUP} IDs serão buscados.")
+        requested = requested[:MAX_BATCH_LOOKUP]
+    
+    # Resolve todos os códigos de uma vez (os códigos são únicos entre os namespaces)
+    resolved = {code: client_ids.lookup(code) for code in requested}
+    
+    # Detalhes frescos vêm do cache; o resto é buscado em paralelo sob o limitador compartilhado
+    details = {}
+    to_fetch = []
+    for code, mapping in resolved.items():
+        if mapping is None:
+            continue
+        cached = item_cache.get(mapping[1])
+        if cached is not None and item_cache.is_fresh(cached[1]):
+            details[code] = cached[0]
+        else:
+            to_fetch.append(code)
+    if to_fetch:
+        results = await asyncio.gather(
+            *(refresh_item_details(resolved[code][1], PRIORITY_INTERACTIVE) for code in to_fetch),
+            return_exceptions=True,
+        )
+        for code, result in zip(to_fetch, results):
+            if isinstance(result, dict) and 'item' in result:
+                details[code] = result['item']
+            else:
+                # Falhou agora: usa o que houver em cache, mesmo velho
+                cached = item_cache.get(resolved[code][1])
+                if cached is not None:
+                    details[code] = cached[0]
+    
+    # --- Embed de resumo (um campo por código) ---
+    found = sum(1 for mapping in resolved.values() if mapping is not None)
+    embed = discord.Embed(
+        title=f"🔎 Busca em lote: {found}/{len(requested)} contas encontradas",
+        color=0x2F3136
+    )
+    for code in requested:
+        mapping = resolved[code]
+        if mapping is None:
+            embed.add_field(name=f"❌ {code}", value="Nenhuma conta com este ID.", inline=False)
+            continue
+        namespace, real_item_id = mapping
+        label = MAPPING_LABELS.get(namespace, namespace)
+        item_data = details.get(code)
+        if item_data is None:
+            embed.add_field(
+                name=f"⚠️ {code} · {label}",
+                value=f"Falha ao buscar detalhes. ID real: {real_item_id}",
+                inline=False
+            )
+            continue
+        region = item_data.get('riot_valorant_region', 'N/A')
+        state = item_data.get('item_state')
+        state_text = f" · ⛔ {state}" if state and state != 'active' else ""
+        embed.add_field(
+            name=f"✅ {code} · {label} ({region}){state_text}",
+            value=(
+                f"💲 {vendor_price_display(item_data)} · 💰 {item_data.get('riot_valorant_inventory_value', 'N/A')} VP"
+                f" · 🔫 {item_data.get('riot_valorant_skin_count', 'N/A')} skins"
+                f" · 🏆 {item_data.get('valorantRankTitle', 'N/A')}\n"
+                f"https://lzt.market/{real_item_id}"
+            ),
+            inline=False
+        )
+    embed.set_footer(text=f"Verificado por {bot.user.name}")
+    await ctx.send(embed=embed)
+    
+    if send_grids:
+        # Renderiza as grades em paralelo e envia os embeds completos na ordem pedida
+        ready = [(code, resolved[code][1], details[code]) for code in requested if code in details]
+        await asyncio.gather(
+            *(get_skin_grid(item_id, extract_skin_ids(item_data)) for _, item_id, item_data in ready if extract_skin_ids(item_data)),
+            return_exceptions=True,
+        )
+        for code, item_id, item_data in ready:
+            await send_vendor_embed(ctx.channel.id, item_id, item_data, code)
+
+# --- Comando para definir a margem de preço ---
+@bot.command(name="margem")
+async def set_price_margin(ctx, percentage: float):
+    """Define a margem de preço a ser adicionada para os clientes (em porcentagem)."""
+    global price_margin
+    
+    # Verificar se o comando foi enviado no canal do vendedor
+    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
+        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
+        return
+    
+    # Verificar se o valor é válido
+    if percentage < 0:
+        await ctx.send("❌ A margem não pode ser negativa.")
+        return
+    
+    # Atualizar a margem
+    price_margin = percentage
+    save_price_margin()
+    
+    await ctx.send(f"✅ Margem de preço definida para **{percentage}%**.\nOs preços mostrados aos clientes agora terão um aumento de {percentage}%.")
+
+# --- Comando para ver a margem atual ---
+@bot.command(name="vermargem")
+async def view_price_margin(ctx):
+    """Exibe a margem de preço atual."""
+    # Verificar se o comando foi enviado no canal do vendedor
+    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
+        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
+        return
+    
+    await ctx.send(f"📊 A margem de preço atual é de **{price_margin}%**.")
+
+# --- Comando para ver a latência das publicações ---
+def format_duration(seconds):
+    """Duração curta legível (ms abaixo de 1 s)."""
+    if seconds is None:
+        return "-"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    if seconds < 120:
+        return f"{seconds:.1f} s"
+    return f"{seconds / 60:.1f} min"
+
+@bot.command(name="latencia")
+async def view_latency(ctx, feed_name: str = ""):
+    """Exibe os percentis de latência de cada estágio, por feed (published_date -> envio)."""
+    # Verificar se o comando foi enviado no canal do vendedor
+    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
+        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
+        return
+    
+    feeds = [feed_name.lower()] if feed_name else latency_tracer.feeds()
+    if not feeds or not any(latency_tracer.percentiles(name) for name in feeds):
+        await ctx.send("📭 Nenhuma conta publicada com latência registrada ainda.")
+        return
+    
+    header = " / ".join(f"p{int(quantile * 100)}" for quantile in QUANTILES)
+    for name in feeds:
+        stats = latency_tracer.percentiles(name)
+        if not stats:
+            await ctx.send(f"📭 Sem amostras para o feed {name}.")
+            continue
+        lines = []
+        for stage in sorted(stats, key=lambda stage: STAGES.index(stage) if stage in STAGES else len(STAGES)):
+            count, values = stats[stage]
+            lines.append(f"`{stage:<11}` {' / '.join(format_duration(value) for value in values)} ({count})")
+        embed = discord.Embed(
+            title=f"⏱️ Latência do feed {MAPPING_LABELS.get(name, name)}",
+            description=f"Estágio: {header} (amostras)\n" + "\n".join(lines),
+            color=0x2F3136
+        )
+        embed.set_footer(text=(
+            f"Publicadas: {latency_tracer.completed.get(name, 0)} · "
+            f"Falhas: {latency_tracer.failed.get(name, 0)} · Em andamento: {latency_tracer.active()}"
+        ))
+        await ctx.send(embed=embed)
+
+# --- Comando para perfilar a renderização das grades ---
+@bot.command(name="perfilgrade")
+async def profile_grid_renders(ctx, renders: int = 20):
+    """Liga o cProfile/tracemalloc para as próximas N grades renderizadas."""
+    # Verificar se o comando foi enviado no canal do vendedor
+    if ctx.channel.id != config.TARGET_VENDOR_CHANNEL_ID:
+        await ctx.send("Este comando só pode ser usado no canal do vendedor.")
+        return
+    
+    if renders < 0:
+        await ctx.send("❌ O número de grades não pode ser negativo.")
+        return
+    
+    grid_renderer.enable_profiling(renders)
+    if renders == 0:
+        await ctx.send("✅ Perfil das grades desligado.")
+        return
+    await ctx.send(
+        f"✅ As próximas **{renders}** grades serão perfiladas.\n"
+        f"Resultados em `{grid_renderer.profile_dir}` (render-<pid>.prof e .jsonl, um par por processo)."
+    )
+
+# --- Pipeline de Publicação ---
+async def prepare_skin_grid(item_id, item_data):
+    """Estágio de renderização: deixa a grade pronta no cache antes do envio."""
+    skins_list_ids = extract_skin_ids(item_data)
+    if skins_list_ids:
+        await get_skin_grid(item_id, skins_list_ids)
+
+posting_pipeline = PostingPipeline(
+    fetch_item_details_cached,
+    prepare_skin_grid,
+    detail_concurrency=config.PIPELINE_DETAIL_CONCURRENCY,
+    render_concurrency=config.PIPELINE_RENDER_CONCURRENCY,
+    send_concurrency=config.PIPELINE_SEND_CONCURRENCY,
+    max_attempts=config.PIPELINE_MAX_ATTEMPTS,
+)
+
+# --- Revalidação das Contas Publicadas ---
+async def apply_listing_change(row, status, item_data):
+    """Edita (preço novo) ou retira (vendida/removida) a mensagem publicada no canal do cliente."""
+    client_id, item_id, namespace, price, currency, channel_id, message_id = row
+    if item_data is not None:
+        item_cache.put(item_id, item_data)
+    channel = bot.get_channel(channel_id)
+    if channel is None:
+        channel = await bot.fetch_channel(channel_id)
+    try:
+        message = await channel.fetch_message(message_id)
+    except discord.NotFound:
+        revalidation_log.info("Mensagem da conta já não existe.", extra={'client_id': client_id, 'item_id': item_id})
+        return
+    
+    if status != STATUS_ACTIVE and config.REVALIDATION_DELETE_RETIRED:
+        await message.delete()
+        revalidation_log.info("Mensagem da conta apagada (%s).", status, extra={'client_id': client_id, 'item_id': item_id})
+        return
+    if not message.embeds:
+        return
+    
+    embed = message.embeds[0]
+    if status == STATUS_ACTIVE:
+        # Preço alterado: atualiza só o campo de preço (o anexo da grade continua o mesmo)
+        new_price = client_price_display(item_data.get('price', 0), item_data.get('price_currency', ''))
+        for index, field in enumerate(embed.fields):
+            if field.name == "💲 Preço":
+                embed.set_field_at(index, name=field.name, value=new_price, inline=field.inline)
+    else:
+        # Vendida ou removida: marca como indisponível e tira o preço e as instruções de compra
+        embed.title = "⛔ Conta Vendida" if status == STATUS_SOLD else "⛔ Conta Indisponível"
+        embed.colour = discord.Colour(0x747F8D)
+        for index in reversed(range(len(embed.fields))):
+            if embed.fields[index].name in ("💲 Preço", "📢 Como Comprar"):
+                embed.remove_field(index)
+    await message.edit(embed=embed)
+    revalidation_log.info("Mensagem da conta atualizada (%s).", status, extra={'client_id': client_id, 'item_id': item_id})
+
+listing_revalidator = ListingRevalidator(
+    lzt_client,
+    lzt_rate_limiter,
+    state_store,
+    apply_listing_change,
+    batch_size=config.REVALIDATION_BATCH_SIZE,
+    spare_tokens=config.REVALIDATION_SPARE_TOKENS,
+    min_age_seconds=config.REVALIDATION_MIN_AGE_MINUTES * 60,
+    run_blocking=state_pool.run,
+)
+
+# --- Definição dos Feeds ---
+def international_query():
+    """Filtros das contas internacionais: até R$ 230, 15.000+ VP, regiões EU/AP/NA/LA (sem BR e KR)."""
+    max_price_usd = 30  # Valor aproximado, será convertido
+    if usd_to_brl_rate:
+        try:
+            max_price_usd = 230 / usd_to_brl_rate
+        except Exception as e:
+            log.error("Erro ao calcular preço máximo em USD: %s", e)
+    return {
+        'pmax': f"{max_price_usd:.2f}",
+        'inv_min': 15000,
+        'valorant_region[]': ['EU', 'AP', 'NA', 'LA'],
+        'daybreak': 7,
+        'nsb': 1,
+        'knife': 1,
+        'order_by': 'published_date',
+        'order_direction': 'desc',
+    }
+
+FEEDS = [
+    FeedDefinition(
+        "br", "BR",
+        query={
+            'pmax': 50,
+            'daybreak': 7,
+            'nsb': 1,
+            'knife': 1,
+            'valorant_region[]': [config.TARGET_REGION],
+            'order_by': 'published_date',
+            'order_direction': 'desc',
+        },
+        channel_id=config.TARGET_CLIENT_CHANNEL_ID,
+        namespace='br',
+    ),
+    FeedDefinition(
+        "international", "Internacional",
+        query=international_query,
+        channel_id=config.TARGET_INTERNATIONAL_CHANNEL_ID,
+        namespace='international',
+        international=True,
+    ),
+]
+
+def make_schedule(feed):
+    """Agendador adaptativo do feed (limites do feed ou os padrões do config)."""
+    return AdaptiveSchedule(
+        feed.label,
+        initial_interval=POLLING_INTERVAL_SECONDS,
+        min_interval=feed.min_interval or config.POLL_MIN_INTERVAL_SECONDS,
+        max_interval=feed.max_interval or config.POLL_MAX_INTERVAL_SECONDS,
+        budget_per_hour=feed.budget_per_hour or config.POLL_BUDGET_PER_HOUR,
+        target_per_poll=config.POLL_TARGET_NEW_PER_POLL,
+    )
+
+feed_engine = FeedEngine(
+    lzt_client,
+    posting_pipeline,
+    config.API_BASE_URL,
+    publish=process_feed_account,
+    make_schedule=make_schedule,
+    on_seen=lambda feed, item_id: state_store.add_seen(feed.name, item_id),
+    store=state_store,
+    max_pages=config.LZT_POLL_MAX_PAGES,
+    tracer=latency_tracer,
+)
+
+# --- Loop de Tarefas do Agendador de Feeds ---
+@tasks.loop(seconds=FEED_TICK_SECONDS)
+async def run_feeds():
+    if not config.LZT_TOKEN:
+        return
+    feed_engine.tick()
+
+async def check_new_accounts():
+    """Executa um ciclo avulso do feed BR."""
+    await feed_engine.run_feed("br")
+
+async def check_new_international_accounts():
+    """Executa um ciclo avulso do feed internacional."""
+    await feed_engine.run_feed("international")
+
+# --- Loop de Tarefas para Atualizar Taxa de Câmbio ---
+@tasks.loop(hours=EXCHANGE_RATE_UPDATE_HOURS)
+async def update_exchange_rate():
+    global usd_to_brl_rate
+    log.debug("Atualizando taxa de câmbio USD -> BRL...")
+    rate = await io_pool.run(fetch_exchange_rate_sync)
+
+    if rate is not None:
+        usd_to_brl_rate = rate
+        log.info("Taxa de câmbio atualizada: 1 USD = %s BRL", usd_to_brl_rate)
+    else:
+        log.error("Não foi possível atualizar a taxa de câmbio.")
+
+# --- Loop de Tarefas para Gravar o Estado em Lote ---
+@tasks.loop(seconds=STATE_FLUSH_SECONDS)
+async def flush_state():
+    if not state_store.has_pending():
+        return
+    await state_pool.run(state_store.flush)
+
+# --- Loop de Tarefas para Revalidar as Contas Publicadas ---
+@tasks.loop(seconds=config.REVALIDATION_INTERVAL_SECONDS)
+async def revalidate_listings():
+    if not config.LZT_TOKEN:
+        return
+    try:
+        await listing_revalidator.run_once()
+    except Exception as e:
+        revalidation_log.exception("Erro na rodada de revalidação: %s", e)
+
+# --- Loop de Tarefas para Expirar IDs Vistos ---
+@tasks.loop(hours=1)
+async def prune_seen_ids():
+    for state in feed_engine.states.values():
+        state.seen_ids.expire()
+    before = time.time() - config.SEEN_IDS_HORIZON_HOURS * 3600
+    await state_pool.run(state_store.prune_seen, before)
+
+# --- Loop de Tarefas para Pré-carregar o Catálogo de Skins ---
+@tasks.loop(hours=SKIN_CATALOG_CHECK_HOURS)
+async def refresh_skin_catalog():
+    if not skin_catalog.needs_preload():
+        return
+    skin_log.info("Pré-carregando catálogo de skins...")
+    await io_pool.run(skin_catalog.preload)
+
+# --- Métricas e Saúde ---
+def cache_hit_ratio(hits, misses):
+    total = hits + misses
+    return hits / total if total else 0.0
+
+REGISTRY.gauge('valbot_pipeline_queue_depth', 'Contas esperando em cada estágio do pipeline.',
+               posting_pipeline.queue_depths, ('stage',))
+REGISTRY.gauge('valbot_pipeline_items_total', 'Contas concluídas pelo pipeline por resultado.',
+               lambda: {'posted': posting_pipeline.posted, 'failed': posting_pipeline.failed}, ('result',), kind='counter')
+REGISTRY.gauge('valbot_executor_tasks', 'Tarefas na fila e em execução em cada pool de threads.',
+               lambda: {(name, state): stats[state] for name, stats in executors.stats().items() for state in ('queued', 'running')},
+               ('pool', 'state'))
+REGISTRY.gauge('valbot_render_pending', 'Renderizações no pool de processos (incluindo as que esperam vaga).',
+               grid_renderer.pending)
+REGISTRY.gauge('valbot_lzt_limiter_waiting', 'Requisições LZT esperando ficha no limitador de taxa.',
+               lzt_rate_limiter.pending)
+REGISTRY.gauge('valbot_lzt_limiter_slowdown', 'Fator de desaceleração do limitador após 429 (1 = ritmo normal).',
+               lambda: lzt_rate_limiter.slowdown)
+REGISTRY.gauge('valbot_cache_requests_total', 'Consultas aos caches por resultado.',
+               lambda: {
+                   ('grid', 'hit'): grid_cache.hits, ('grid', 'miss'): grid_cache.misses,
+                   ('icon', 'hit'): icon_cache.hits + icon_cache.disk_hits, ('icon', 'miss'): icon_cache.misses,
+                   ('item', 'hit'): item_cache.hits, ('item', 'miss'): item_cache.misses,
+               },
+               ('cache', 'result'), kind='counter')
+REGISTRY.gauge('valbot_cache_hit_ratio', 'Proporção de acertos de cada cache desde o início.',
+               lambda: {
+                   'grid': cache_hit_ratio(grid_cache.hits, grid_cache.misses),
+                   'icon': cache_hit_ratio(icon_cache.hits + icon_cache.disk_hits, icon_cache.misses),
+                   'item': cache_hit_ratio(item_cache.hits, item_cache.misses),
+               },
+               ('cache',))
+REGISTRY.gauge('valbot_discord_gateway_latency_seconds', 'Latência do heartbeat do gateway do Discord.',
+               lambda: bot.latency)
+
+def health_status():
+    """Saudável se o bot está conectado e todo feed ativo fez polling recentemente."""
+    now = time.time()
+    healthy = bot.is_ready()
+    feeds = {}
+    for name, state in feed_engine.states.items():
+        age = None if state.last_success is None else now - state.last_success
+        feeds[name] = None if age is None else round(age, 1)
+        if state.feed.enabled and state.feed.channel_id and (age is None or age > 3 * state.schedule.max_interval):
+            healthy = False
+    return healthy, {
+        'discord_ready': bot.is_ready(),
+        'seconds_since_poll': feeds,
+        'pipeline_queues': posting_pipeline.queue_depths(),
+    }
+
+metrics_server = MetricsServer(REGISTRY, health_status, host=config.METRICS_HOST, port=config.METRICS_PORT)
+
+# --- Eventos do Bot e Inicialização ---
+
+@bot.event
+async def on_connect(): discord_log.info("Bot conectado ao Discord.")
+@bot.event
+async def on_disconnect(): discord_log.warning("Bot desconectado do Discord.")
+
+@bot.event
+async def on_ready():
+    discord_log.info('Bot conectado como %s', bot.user)
+    
+    # Listar todos os servidores e canais visíveis
+    discord_log.info('Servidores e canais visíveis:')
+    for guild in bot.guilds:
+        discord_log.info('- Servidor: %s (ID: %s)', guild.name, guild.id)
+        for channel in guild.text_channels:
+            try:
+                # Tenta acessar o canal para verificar permissões
+                await channel.guild.fetch_channel(channel.id)
+                discord_log.info('  - Canal: %s (ID: %s) - Acessível', channel.name, channel.id)
+            except Exception as e:
+                discord_log.warning('  - Canal: %s (ID: %s) - Não acessível: %s', channel.name, channel.id, e)
+    
+    # Carrega IDs vistos, mapeamento de contas e configuração de margem
+    # (só na primeira conexão: o estado dos feeds continua vivo nas reconexões)
+    if not feed_engine.states:
+        load_state()
+        for feed in FEEDS:
+            feed_engine.add_feed(feed, load_seen_ids(feed.name))
+        feed_engine.load_cursors()
+        skin_catalog.load()
+        icon_cache.prune_disk()
+    
+    posting_pipeline.start()
+    
+    if not update_exchange_rate.is_running():
+        update_exchange_rate.start() # Inicia loop da taxa de câmbio
+    
+    if not refresh_skin_catalog.is_running():
+        refresh_skin_catalog.start() # Mantém o catálogo de skins atualizado
+    
+    if not flush_state.is_running():
+        flush_state.start() # Grava o estado acumulado em lote
+    
+    if not prune_seen_ids.is_running():
+        prune_seen_ids.start() # Descarta IDs vistos fora do horizonte
+    
+    # Um único agendador executa todos os feeds; o limitador de taxa coordena as chamadas
+    if not run_feeds.is_running():
+        run_feeds.start()
+    
+    if not revalidate_listings.is_running():
+        revalidate_listings.start() # Usa só o orçamento que sobra do polling
+
+# --- Bloco final para rodar o Bot (chamado por main.py) ---
+def main():
+    # Verificações de token e canal alvo
+    if not config.TOKEN: print("ERRO CRÍTICO: Token Discord não encontrado!"); return
+    if not config.LZT_TOKEN: print("[AVISO] Token API LZT não encontrado.")
+    if not config.TARGET_CLIENT_CHANNEL_ID: print("[ERRO CRÍTICO] TARGET_CLIENT_CHANNEL_ID não definido!"); return
+    if not config.TARGET_VENDOR_CHANNEL_ID: print("[ERRO CRÍTICO] TARGET_VENDOR_CHANNEL_ID não definido!"); return
+    if not config.TARGET_INTERNATIONAL_CHANNEL_ID: print("[ERRO CRÍTICO] TARGET_INTERNATIONAL_CHANNEL_ID não definido!"); return
+    if not config.EXCHANGE_RATE_API_KEY: print("[AVISO] Chave da API de Câmbio não definida, a conversão para BRL não funcionará.")
+
+    # Métricas e saúde rodam numa thread própria, ao lado do bot
+    if config.METRICS_ENABLED:
+        try: metrics_server.start()
+        except OSError as e: log.error("Não foi possível abrir a porta de métricas %s: %s", config.METRICS_PORT, e)
+
+    try: bot.run(config.TOKEN)
+    except discord.errors.LoginFailure: print("ERRO CRÍTICO: Falha no login do Discord - Token inválido.")
+    except discord.errors.PrivilegedIntentsRequired: print("ERRO CRÍTICO: Intents Privilegiadas não habilitadas!")
     except Exception as e: print(f"ERRO CRÍTICO ao iniciar: {e}"); import traceback; traceback.print_exc()
\ No newline at end of file
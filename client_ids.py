@@ -0,0 +1,68 @@
+import logging
+import secrets
+
+# --- Alocador de IDs de cliente ---
+# Os códigos curtos mostrados aos clientes são únicos entre todos os namespaces
+# (BR, internacional, ...): cada código novo é conferido contra o índice antes
+# de ser entregue. O índice reverso (item_id -> código) faz uma conta relistada
+# reaproveitar o código que já tinha em vez de ganhar outro mapeamento.
+
+log = logging.getLogger("valbot.client_ids")
+
+CODE_ALPHABET = "0123456789ABCDEF"  # Mesmo formato dos códigos antigos (hex maiúsculo)
+
+
+class ClientIdAllocator:
+    """Índice bidirecional código <-> conta com alocação sem colisões."""
+
+    def __init__(self, code_length=6, max_attempts=20):
+        self.code_length = code_length
+        self.max_attempts = max_attempts
+        self._by_code = {}  # código -> (namespace, item_id)
+        self._by_item = {}  # item_id -> código
+
+    def __len__(self):
+        return len(self._by_code)
+
+    def load(self, mappings):
+        """Carrega {namespace: {código: item_id}} vindo do banco de estado."""
+        for namespace, mapping in mappings.items():
+            for code, item_id in mapping.items():
+                if code in self._by_code:
+                    log.warning("Código duplicado %s ignorado em %s.", code, namespace)
+                    continue
+                self._by_code[code] = (namespace, item_id)
+                self._by_item[item_id] = code
+
+    def lookup(self, code):
+        """Retorna (namespace, item_id) do código ou None."""
+        return self._by_code.get(code.strip().upper())
+
+    def code_for(self, item_id):
+        return self._by_item.get(item_id)
+
+    def count(self, namespace):
+        return sum(1 for ns, _ in self._by_code.values() if ns == namespace)
+
+    def _new_code(self):
+        length = self.code_length
+        # Espaço de códigos ficando cheio: aumenta o tamanho em vez de colidir
+        while len(self._by_code) * 2 > len(CODE_ALPHABET) ** length:
+            length += 1
+        while True:
+            for _ in range(self.max_attempts):
+                code = ''.join(secrets.choice(CODE_ALPHABET) for _ in range(length))
+                if code not in self._by_code:
+                    return code
+            length += 1
+
+    def assign(self, item_id, namespace):
+        """Retorna (código, reaproveitado). Contas já mapeadas mantêm o código antigo."""
+        code = self._by_item.get(item_id)
+        if code is not None:
+            self._by_code[code] = (namespace, item_id)
+            return code, True
+        code = self._new_code()
+        self._by_code[code] = (namespace, item_id)
+        self._by_item[item_id] = code
+        return code, False
@@ -1,28 +1,96 @@
-import os
-from dotenv import load_dotenv
-
-load_dotenv() # Carrega as variáveis do arquivo .env
-
-# --- Tokens e IDs ---
-TOKEN = os.getenv('DISCORD_BOT_TOKEN')
-LZT_TOKEN = os.getenv('LZT_API_TOKEN')
-EXCHANGE_RATE_API_KEY = os.getenv('EXCHANGE_RATE_API_KEY')
-
-# --- IDs dos canais ---
-TARGET_CLIENT_CHANNEL_ID = int(os.getenv('TARGET_CLIENT_CHANNEL_ID', 0))
-TARGET_VENDOR_CHANNEL_ID = int(os.getenv('TARGET_VENDOR_CHANNEL_ID', 0))
-TARGET_INTERNATIONAL_CHANNEL_ID = int(os.getenv('TARGET_INTERNATIONAL_CHANNEL_ID', 0))
-
-# --- Configurações Gerais ---
-API_BASE_URL = "https://api.lzt.market"
-TARGET_REGION = "BR"
-VALORANT_CATEGORY_ID = 13 # ID para Valorant
-VALORANT_CATEGORY_NAME = "valorant"
-
-# --- Verifica se variáveis essenciais foram carregadas ---
-if not TOKEN: print("[CONFIG ERRO] DISCORD_BOT_TOKEN não encontrado no .env")
-if not LZT_TOKEN: print("[CONFIG AVISO] LZT_API_TOKEN não encontrado no .env")
-if not TARGET_CLIENT_CHANNEL_ID: print("[CONFIG ERRO] TARGET_CLIENT_CHANNEL_ID não encontrado ou inválido no .env")
-if not TARGET_VENDOR_CHANNEL_ID: print("[CONFIG ERRO] TARGET_VENDOR_CHANNEL_ID não encontrado ou inválido no .env")
-if not TARGET_INTERNATIONAL_CHANNEL_ID: print("[CONFIG ERRO] TARGET_INTERNATIONAL_CHANNEL_ID não encontrado ou inválido no .env")
+import os
+from dotenv import load_dotenv
+
+load_dotenv() # Carrega as variáveis do arquivo .env
+
+# --- Tokens e IDs ---
+TOKEN = os.getenv('DISCORD_BOT_TOKEN')
+LZT_TOKEN = os.getenv('LZT_API_TOKEN')
+EXCHANGE_RATE_API_KEY = os.getenv('EXCHANGE_RATE_API_KEY')
+
+# --- IDs dos canais ---
+TARGET_CLIENT_CHANNEL_ID = int(os.getenv('TARGET_CLIENT_CHANNEL_ID', 0))
+TARGET_VENDOR_CHANNEL_ID = int(os.getenv('TARGET_VENDOR_CHANNEL_ID', 0))
+TARGET_INTERNATIONAL_CHANNEL_ID = int(os.getenv('TARGET_INTERNATIONAL_CHANNEL_ID', 0))
+
+# --- Configurações Gerais ---
+API_BASE_URL = os.getenv('LZT_API_BASE_URL', "https://api.lzt.market")  # Sobrescrito pelo benchmark local
+TARGET_REGION = "BR"
+VALORANT_CATEGORY_ID = 13 # ID para Valorant
+VALORANT_CATEGORY_NAME = "valorant"
+VALORANT_API_BASE_URL = os.getenv('VALORANT_API_BASE_URL', "https://valorant-api.com/v1")
+
+# --- Cliente HTTP ---
+LZT_MAX_CONNECTIONS = int(os.getenv('LZT_MAX_CONNECTIONS', 10))  # Tamanho do pool de conexões com a API LZT
+LZT_RATE_LIMIT_REQUESTS = int(os.getenv('LZT_RATE_LIMIT_REQUESTS', 20))  # Requisições permitidas por janela
+LZT_RATE_LIMIT_WINDOW_SECONDS = float(os.getenv('LZT_RATE_LIMIT_WINDOW_SECONDS', 60))  # Tamanho da janela
+LZT_RATE_LIMIT_BURST = int(os.getenv('LZT_RATE_LIMIT_BURST', 5))  # Rajada máxima acima da taxa média
+LZT_POLL_MAX_PAGES = int(os.getenv('LZT_POLL_MAX_PAGES', 5))  # Páginas buscadas por ciclo durante rajadas
+
+# --- Agendamento do polling ---
+POLL_MIN_INTERVAL_SECONDS = float(os.getenv('POLL_MIN_INTERVAL_SECONDS', 30))  # Intervalo mínimo com o feed quente
+POLL_MAX_INTERVAL_SECONDS = float(os.getenv('POLL_MAX_INTERVAL_SECONDS', 300))  # Intervalo máximo com o feed parado
+POLL_BUDGET_PER_HOUR = int(os.getenv('POLL_BUDGET_PER_HOUR', 40))  # Requisições de listagem por feed por hora
+POLL_TARGET_NEW_PER_POLL = float(os.getenv('POLL_TARGET_NEW_PER_POLL', 1.0))  # Contas novas desejadas por ciclo
+
+# --- Pipeline de publicação ---
+PIPELINE_DETAIL_CONCURRENCY = int(os.getenv('PIPELINE_DETAIL_CONCURRENCY', 4))  # Buscas de detalhes simultâneas
+PIPELINE_RENDER_CONCURRENCY = int(os.getenv('PIPELINE_RENDER_CONCURRENCY', 2))  # Grades renderizadas simultaneamente
+PIPELINE_SEND_CONCURRENCY = int(os.getenv('PIPELINE_SEND_CONCURRENCY', 2))  # Envios simultâneos ao Discord
+PIPELINE_MAX_ATTEMPTS = int(os.getenv('PIPELINE_MAX_ATTEMPTS', 3))  # Tentativas de uma conta (uma por ciclo: detalhes, grade ou envio) antes de desistir
+
+# --- IDs vistos ---
+SEEN_IDS_HORIZON_HOURS = float(os.getenv('SEEN_IDS_HORIZON_HOURS', 72))  # Tempo em que um ID visto é lembrado
+SEEN_IDS_MAX = int(os.getenv('SEEN_IDS_MAX', 200000))  # Teto de IDs vistos em memória por feed
+
+# --- Grade de skins ---
+SKIN_FETCH_CONCURRENCY = int(os.getenv('SKIN_FETCH_CONCURRENCY', 12))  # Buscas simultâneas de metadados/ícones (pool próprio)
+SKIN_GRID_DEADLINE_SECONDS = float(os.getenv('SKIN_GRID_DEADLINE_SECONDS', 15))  # Prazo total para montar uma grade
+GRID_IMAGE_FORMAT = os.getenv('GRID_IMAGE_FORMAT', 'png-palette')  # png, png-optimized, png-palette, webp-lossless ou webp
+GRID_IMAGE_TARGET_KB = float(os.getenv('GRID_IMAGE_TARGET_KB', 256))  # Tamanho alvo do anexo (0 = sem alvo)
+GRID_IMAGE_QUALITY = int(os.getenv('GRID_IMAGE_QUALITY', 85))  # Qualidade do WebP com perdas
+RENDER_PROCESSES = int(os.getenv('RENDER_PROCESSES', 0))  # Processos de renderização (0 = um por núcleo)
+RENDER_MAX_PENDING = int(os.getenv('RENDER_MAX_PENDING', 0))  # Renderizações pendentes antes de segurar o pipeline (0 = 2x processos)
+RENDER_PROFILE_RENDERS = int(os.getenv('RENDER_PROFILE_RENDERS', 0))  # Grades perfiladas desde a inicialização (0 = desligado)
+RENDER_PROFILE_DIR = os.getenv('RENDER_PROFILE_DIR', 'render_profiles')  # Saída do perfil (render-<pid>.prof/.jsonl)
+
+# --- Executores ---
+IO_POOL_WORKERS = int(os.getenv('IO_POOL_WORKERS', 4))  # Threads de rede avulsa (câmbio, catálogo); as skins têm pool próprio
+RENDER_POOL_THREADS = int(os.getenv('RENDER_POOL_THREADS', 4))  # Grades montadas ao mesmo tempo (esperam a rede e os processos)
+
+# --- Caches ---
+SKIN_CATALOG_TTL_HOURS = float(os.getenv('SKIN_CATALOG_TTL_HOURS', 168))  # Validade dos metadados de skins
+SKIN_NEGATIVE_TTL_HOURS = float(os.getenv('SKIN_NEGATIVE_TTL_HOURS', 24))  # Validade do cache de UUIDs desconhecidos
+ICON_CACHE_MEMORY_MB = float(os.getenv('ICON_CACHE_MEMORY_MB', 32))  # Limite de memória das miniaturas de ícones
+ICON_CACHE_DISK_MB = float(os.getenv('ICON_CACHE_DISK_MB', 256))  # Limite do diretório de ícones em disco
+GRID_CACHE_MAX_ENTRIES = int(os.getenv('GRID_CACHE_MAX_ENTRIES', 200))  # Grades renderizadas mantidas em memória
+GRID_CACHE_MAX_MB = float(os.getenv('GRID_CACHE_MAX_MB', 64))  # Limite de memória das grades renderizadas
+GRID_ATTACHMENT_URL_TTL_HOURS = float(os.getenv('GRID_ATTACHMENT_URL_TTL_HOURS', 12))  # Validade das URLs de anexo do Discord
+ITEM_CACHE_MAX_ENTRIES = int(os.getenv('ITEM_CACHE_MAX_ENTRIES', 1000))  # Detalhes de contas mantidos em memória
+ITEM_CACHE_FRESH_MINUTES = float(os.getenv('ITEM_CACHE_FRESH_MINUTES', 10))  # Idade até a qual os detalhes são considerados atuais
+
+# --- Revalidação das contas publicadas ---
+REVALIDATION_INTERVAL_SECONDS = int(os.getenv('REVALIDATION_INTERVAL_SECONDS', 60))  # Intervalo entre lotes de verificação
+REVALIDATION_BATCH_SIZE = int(os.getenv('REVALIDATION_BATCH_SIZE', 5))  # Contas consultadas por lote (no máximo)
+REVALIDATION_SPARE_TOKENS = int(os.getenv('REVALIDATION_SPARE_TOKENS', 3))  # Fichas do limitador reservadas para o polling
+REVALIDATION_MIN_AGE_MINUTES = float(os.getenv('REVALIDATION_MIN_AGE_MINUTES', 30))  # Tempo mínimo entre verificações da mesma conta
+REVALIDATION_DELETE_RETIRED = os.getenv('REVALIDATION_DELETE_RETIRED', 'false').lower() == 'true'  # Apaga (em vez de marcar) mensagens de contas vendidas
+
+# --- Métricas ---
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'  # Servidor /metrics e /health
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', 9105))
+TRACE_SAMPLES = int(os.getenv('TRACE_SAMPLES', 500))  # Contas por feed na janela dos percentis de latência
+
+# --- Logs ---
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')  # Nível padrão de todos os subsistemas
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # json (uma linha por evento) ou text
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')  # Níveis por subsistema, ex.: "lzt=DEBUG,render=WARNING"
+
+# --- Verifica se variáveis essenciais foram carregadas ---
+if not TOKEN: print("[CONFIG ERRO] DISCORD_BOT_TOKEN não encontrado no .env")
+if not LZT_TOKEN: print("[CONFIG AVISO] LZT_API_TOKEN não encontrado no .env")
+if not TARGET_CLIENT_CHANNEL_ID: print("[CONFIG ERRO] TARGET_CLIENT_CHANNEL_ID não encontrado ou inválido no .env")
+if not TARGET_VENDOR_CHANNEL_ID: print("[CONFIG ERRO] TARGET_VENDOR_CHANNEL_ID não encontrado ou inválido no .env")
+if not TARGET_INTERNATIONAL_CHANNEL_ID: print("[CONFIG ERRO] TARGET_INTERNATIONAL_CHANNEL_ID não encontrado ou inválido no .env")
 if not EXCHANGE_RATE_API_KEY: print("[CONFIG AVISO] EXCHANGE_RATE_API_KEY não encontrado no .env")
\ No newline at end of file
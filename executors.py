@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+# --- Executores compartilhados ---
+# Todo trabalho bloqueante do bot roda em poucos pools de threads nomeados e de
+# vida longa (rede, renderização, banco de estado), criados uma vez na
+# inicialização e encerrados junto com o bot. Cada pool conta as tarefas na
+# fila e em execução, para acompanhar a profundidade das filas.
+
+
+class NamedExecutor(Executor):
+    """Pool de threads nomeado com contadores de fila/execução."""
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0  # Enviadas e ainda não iniciadas
+        self.running = 0
+        self.completed = 0
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            self.queued += 1
+        future = self._pool.submit(self._run, fn, args, kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, fn, args, kwargs):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _on_done(self, future):
+        if future.cancelled():
+            # Cancelada antes de começar: nunca passou por _run
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, fn, *args):
+        """Executa `fn(*args)` no pool sem bloquear o loop de eventos."""
+        return await asyncio.get_running_loop().run_in_executor(self, fn, *args)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'queued': self.queued,
+                'running': self.running,
+                'completed': self.completed,
+            }
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+class ExecutorRegistry:
+    """Conjunto dos pools nomeados do bot."""
+
+    def __init__(self):
+        self._pools = {}
+
+    def register(self, name, max_workers):
+        if name in self._pools:
+            raise ValueError(f"Executor '{name}' já registrado")
+        pool = self._pools[name] = NamedExecutor(name, max_workers)
+        return pool
+
+    def get(self, name):
+        return self._pools[name]
+
+    def stats(self):
+        return {name: pool.stats() for name, pool in self._pools.items()}
+
+    def shutdown(self, wait=True):
+        """Cancela o que ainda está na fila e espera as tarefas em execução."""
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,196 @@
+import asyncio
+import logging
+import time
+from urllib.parse import urlencode
+from metrics import FEED_POLL_SECONDS, FEED_NEW_IDS
+from pipeline import PostingJob
+from polling import IncrementalPoller
+from tracing import NULL_TRACE
+
+# --- Motor de feeds de listagens ---
+# Cada feed é uma definição declarativa (filtros da busca, canal de destino,
+# namespace dos IDs de cliente e limites de agendamento). Todos rodam no mesmo
+# agendador e compartilham o cliente HTTP, o limitador de taxa e o pipeline.
+
+log = logging.getLogger("valbot.feed")
+
+
+class FeedDefinition:
+    """Definição declarativa de um feed de contas."""
+
+    def __init__(self, name, label, query, channel_id, namespace, international=False,
+                 min_interval=None, max_interval=None, budget_per_hour=None, enabled=True):
+        self.name = name  # Identificador estável (cursores, estado salvo)
+        self.label = label  # Nome exibido nos logs
+        self.query = query  # dict de filtros ou função que retorna o dict
+        self.channel_id = channel_id
+        self.namespace = namespace  # Mapeamento de IDs de cliente usado pelo feed
+        self.international = international  # Estilo do embed do cliente
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget_per_hour = budget_per_hour
+        self.enabled = enabled
+
+    def build_url(self, base_url):
+        params = self.query() if callable(self.query) else self.query
+        return f"{base_url}/riot/?{urlencode(params, doseq=True)}"
+
+
+class FeedState:
+    """Estado de execução de um feed."""
+
+    def __init__(self, feed, poller, schedule, seen_ids):
+        self.feed = feed
+        self.poller = poller
+        self.schedule = schedule
+        self.seen_ids = seen_ids
+        self.next_due = 0.0
+        self.running = False
+        self.last_success = None  # Horário do último ciclo concluído
+
+
+class FeedEngine:
+    """Agendador único que executa todos os feeds quando cada um vence."""
+
+    def __init__(self, client, pipeline, base_url, publish, make_schedule, on_seen, store, max_pages=5, tracer=None):
+        self.client = client
+        self.pipeline = pipeline
+        self.base_url = base_url
+        self.publish = publish  # async (feed, item_id, item_data) -> publica a conta
+        self.make_schedule = make_schedule  # feed -> AdaptiveSchedule
+        self.on_seen = on_seen  # (feed, item_id) -> persiste o ID visto
+        self.store = store  # StateStore (cursores dos feeds)
+        self.max_pages = max_pages
+        self.tracer = tracer  # LatencyTracer das contas novas (opcional)
+        self.states = {}
+        self._tasks = set()
+        self._stopped = False
+
+    def add_feed(self, feed, seen_ids):
+        poller = IncrementalPoller(feed.name, max_pages=self.max_pages)
+        self.states[feed.name] = FeedState(feed, poller, self.make_schedule(feed), seen_ids)
+
+    def load_cursors(self):
+        """Restaura o cursor salvo de cada feed."""
+        for name, state in self.states.items():
+            cursor = self.store.get_setting(f"cursor:{name}")
+            if cursor:
+                state.poller.cursor = tuple(cursor)
+
+    def save_cursor(self, state):
+        self.store.set_setting(f"cursor:{state.feed.name}", list(state.poller.cursor))
+
+    def tick(self):
+        """Dispara os feeds vencidos (cada um roda em sua própria task)."""
+        if self._stopped:
+            return
+        now = time.time()
+        for state in self.states.values():
+            if state.feed.enabled and not state.running and state.next_due <= now:
+                state.running = True
+                task = asyncio.create_task(self._run(state))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def run_feed(self, name):
+        """Executa um ciclo de um feed imediatamente."""
+        state = self.states[name]
+        if state.running or self._stopped:
+            return
+        state.running = True
+        await self._run(state)
+
+    async def stop(self):
+        """Cancela os ciclos em andamento e não dispara mais nenhum."""
+        self._stopped = True
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, state):
+        try:
+            with FEED_POLL_SECONDS.time(state.feed.name):
+                await self._poll(state)
+        except Exception as e:
+            log.exception("Erro no ciclo: %s", e, extra={'feed': state.feed.name})
+            state.next_due = time.time() + state.schedule.interval
+        finally:
+            state.running = False
+
+    async def _poll(self, state):
+        feed = state.feed
+        log.debug("Iniciando verificação de novas contas %s.", feed.label, extra={'feed': feed.name})
+        if not feed.channel_id:
+            log.error("Canal do feed %s não configurado.", feed.label, extra={'feed': feed.name})
+            state.next_due = time.time() + state.schedule.max_interval
+            return
+
+        # Só as contas publicadas depois do cursor (paginando em rajadas)
+        poll_started = time.time()
+        current_items = await state.poller.poll(self.client, feed.build_url(self.base_url))
+        polled_at = time.time()
+
+        if current_items is None:
+            log.error("Falha ao buscar/parsear lista de contas LZT para %s.", feed.label, extra={'feed': feed.name})
+            state.next_due = time.time() + state.schedule.interval
+            return
+
+        current_item_ids = {item.get('item_id') for item in current_items if item.get('item_id')}
+        new_ids = sorted([i for i in current_item_ids if i not in state.seen_ids and not self.pipeline.is_pending(i)], reverse=True)
+        log.info("Ciclo %s: %d IDs atuais, %d novos.", feed.label, len(current_item_ids), len(new_ids),
+                 extra={'feed': feed.name, 'pages': state.poller.last_pages, 'new_ids': len(new_ids)})
+        FEED_NEW_IDS.observe(len(new_ids), feed.name)
+        state.last_success = time.time()
+
+        # Ajusta o intervalo do próximo ciclo pela taxa de chegada do feed
+        interval = state.schedule.record(len(new_ids), state.poller.last_pages)
+        state.next_due = time.time() + interval
+        rate_per_hour = (state.schedule.arrival_rate or 0) * 3600
+        log.debug("~%.1f contas/h, próximo ciclo em %.0fs.", rate_per_hour, interval,
+                  extra={'feed': feed.name, 'interval_s': round(interval, 1)})
+
+        if new_ids:
+            # Enviar novos IDs para o pipeline (detalhes -> grade -> envio)
+            queued = 0
+            published = {item['item_id']: item.get('published_date') for item in current_items if item.get('item_id')}
+            for item_id in new_ids:
+                trace = self._start_trace(feed, item_id, published.get(item_id), poll_started, polled_at)
+                job = PostingJob(item_id, feed.name, self._publisher(feed), self._marker(state), trace)
+                if self.pipeline.submit(job):
+                    queued += 1
+                elif trace is not NULL_TRACE:
+                    self.tracer.discard(item_id)
+            log.info("%d novos IDs %s enviados ao pipeline (pendentes: %d).", queued, feed.label, len(new_ids) - queued,
+                     extra={'feed': feed.name})
+
+        # Avança o cursor só até onde todas as contas já foram concluídas (vistas).
+        # Contas ainda no pipeline seguram o cursor, para que nada se perca se o bot
+        # reiniciar antes de publicá-las.
+        previous_cursor = state.poller.cursor
+        state.poller.advance(current_items, lambda item: item['item_id'] in state.seen_ids)
+        if state.poller.cursor != previous_cursor:
+            self.save_cursor(state)
+
+    def _start_trace(self, feed, item_id, published_at, poll_started, polled_at):
+        """Abre o rastro de latência com o polling e o atraso desde o published_date."""
+        if self.tracer is None:
+            return NULL_TRACE
+        trace = self.tracer.start(feed.name, item_id, published_at, polled_at)
+        trace.add('poll', poll_started, polled_at)
+        if published_at:
+            trace.add('discovery', published_at, polled_at)
+        return trace
+
+    def _publisher(self, feed):
+        async def publish(item_id, item_data):
+            await self.publish(feed, item_id, item_data)
+        return publish
+
+    def _marker(self, state):
+        def mark_seen(item_id, success):
+            # Marca como visto quando o pipeline termina (com ou sem sucesso; contas que
+            # ainda serão tentadas de novo no próximo ciclo não chegam aqui)
+            state.seen_ids.add(item_id)
+            self.on_seen(state.feed, item_id)
+        return mark_seen
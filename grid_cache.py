@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+
+# --- Cache de grades de skins já renderizadas ---
+# A mesma conta gera a mesma grade para o canal do cliente e para o /buscar do
+# vendedor. A grade fica guardada por item_id + lista ordenada de skins, junto
+# com a URL do anexo no Discord quando a imagem já foi enviada uma vez.
+
+
+class GridCache:
+    """LRU de grades codificadas (PNG/WebP) limitado por número de entradas e por bytes."""
+
+    def __init__(self, max_entries, max_bytes, url_ttl_seconds):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.url_ttl_seconds = url_ttl_seconds  # URLs de anexos do Discord expiram
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # chave -> {'image': bytes, 'url': str|None, 'url_ts': float}
+
+    @staticmethod
+    def make_key(item_id, skin_ids):
+        return (str(item_id), tuple(skin_ids))
+
+    def get(self, key):
+        """Retorna (bytes da imagem, URL do anexo ainda válida ou None) ou None se não houver."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        url = entry['url']
+        if url and time.time() - entry['url_ts'] >= self.url_ttl_seconds:
+            url = entry['url'] = None
+        return entry['image'], url
+
+    def put(self, key, image_bytes):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= len(old['image'])
+        self._entries[key] = {'image': image_bytes, 'url': None, 'url_ts': 0}
+        self.total_bytes += len(image_bytes)
+        # Remove as grades menos usadas até caber nos limites
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted['image'])
+
+    def set_attachment_url(self, key, url):
+        """Registra a URL do anexo de uma mensagem já enviada com esta grade."""
+        entry = self._entries.get(key)
+        if entry is not None and url:
+            entry['url'] = url
+            entry['url_ts'] = time.time()
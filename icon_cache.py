@@ -0,0 +1,145 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from PIL import Image
+
+# --- Cache de ícones das skins ---
+# Guarda a miniatura já redimensionada (RGBA) de cada ícone: em memória num LRU
+# limitado por bytes e em disco num diretório indexado pelo hash da URL. Skins
+# repetidas não precisam de download nem de decode+resize.
+
+log = logging.getLogger("valbot.icons")
+
+
+def make_thumbnail(img_bytes, max_width, height):
+    """Decodifica o ícone e redimensiona para a altura fixa do cartão (LANCZOS)."""
+    return resize_icon(decode_icon(img_bytes), max_width, height)
+
+
+def decode_icon(img_bytes):
+    return Image.open(io.BytesIO(img_bytes)).convert("RGBA")
+
+
+def resize_icon(img, max_width, height):
+    # Ajuste o tamanho da imagem com proporções fixas
+    img_height = height
+    ratio = img_height / img.height
+    img_width = int(img.width * ratio)
+
+    # Se a largura for maior que o cartão, redimensione novamente
+    if img_width > max_width:
+        img_width = max_width
+        ratio = img_width / img.width
+        img_height = int(img.height * ratio)
+
+    return img.resize((img_width, img_height), Image.Resampling.LANCZOS)
+
+
+class IconCache:
+    """Cache em dois níveis (LRU em memória + disco) de miniaturas RGBA dos ícones."""
+
+    def __init__(self, directory, download, max_memory_bytes, max_disk_bytes, thumb_max_width=140, thumb_height=60):
+        self.directory = directory
+        self.download = download  # Função url -> bytes (ou None)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.thumb_max_width = thumb_max_width
+        self.thumb_height = thumb_height
+        self.memory_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # chave -> Image RGBA
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _key(self, url):
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return f"{digest}_{self.thumb_max_width}x{self.thumb_height}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    @staticmethod
+    def _cost(thumb):
+        return thumb.width * thumb.height * 4
+
+    def _remember(self, key, thumb):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = thumb
+            self.memory_bytes += self._cost(thumb)
+            # Remove as miniaturas menos usadas até caber no limite de memória
+            while self.memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self.memory_bytes -= self._cost(evicted)
+
+    def get_thumbnail(self, url):
+        """Retorna a miniatura do ícone (memória -> disco -> download)."""
+        key = self._key(url)
+        with self._lock:
+            thumb = self._memory.get(key)
+            if thumb is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return thumb
+
+        path = self._path(key)
+        if os.path.exists(path):
+            try:
+                with Image.open(path) as img:
+                    thumb = img.convert("RGBA")
+                os.utime(path)  # Marca como usado recentemente para a limpeza do disco
+                self.disk_hits += 1
+                self._remember(key, thumb)
+                return thumb
+            except Exception as e:
+                log.warning("Arquivo inválido %s: %s", path, e)
+
+        self.misses += 1
+        img_bytes = self.download(url)
+        if not img_bytes:
+            return None
+        try:
+            thumb = make_thumbnail(img_bytes, self.thumb_max_width, self.thumb_height)
+        except Exception as e:
+            log.warning("Erro ao processar ícone: %s", e, extra={'url': url})
+            return None
+
+        self._remember(key, thumb)
+        try:
+            tmp_path = f"{path}.tmp"
+            thumb.save(tmp_path, format='PNG')
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log.warning("Falha ao gravar %s: %s", path, e)
+        return thumb
+
+    def prune_disk(self):
+        """Remove os arquivos mais antigos até o diretório caber no limite de disco."""
+        try:
+            files = []
+            total = 0
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if os.path.isfile(path):
+                    stat = os.stat(path)
+                    files.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            files.sort()
+            removed = 0
+            for _, size, path in files:
+                if total <= self.max_disk_bytes:
+                    break
+                os.remove(path)
+                total -= size
+                removed += 1
+            if removed:
+                log.info("%d ícones antigos removidos do disco.", removed)
+        except Exception as e:
+            log.warning("Falha ao limpar o diretório de ícones: %s", e)
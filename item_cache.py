@@ -0,0 +1,45 @@
+import time
+from collections import OrderedDict
+
+# --- Cache dos detalhes das contas ---
+# O pipeline de publicação já busca os detalhes completos de cada conta nova; o
+# payload fica guardado aqui por item_id para que o /buscar responda na hora. Cada
+# entrada guarda o horário da busca e é "fresca" enquanto estiver dentro da janela
+# de validade; entradas velhas continuam servindo, mas pedem atualização.
+
+
+class ItemCache:
+    """LRU de detalhes de contas (dict 'item' da API LZT) com janela de validade."""
+
+    def __init__(self, max_entries, fresh_seconds):
+        self.max_entries = max_entries
+        self.fresh_seconds = fresh_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # item_id -> (detalhes, horário da busca)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, item_id):
+        """Retorna (detalhes, idade em segundos) ou None se não houver."""
+        entry = self._entries.get(item_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(item_id)
+        self.hits += 1
+        item_data, fetched_at = entry
+        return item_data, time.time() - fetched_at
+
+    def is_fresh(self, age):
+        return age < self.fresh_seconds
+
+    def put(self, item_id, item_data, fetched_at=None):
+        self._entries.pop(item_id, None)
+        self._entries[item_id] = (item_data, time.time() if fetched_at is None else fetched_at)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, item_id):
+        self._entries.pop(item_id, None)
@@ -0,0 +1,117 @@
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+# --- Logging estruturado ---
+# Todos os módulos usam loggers "valbot.<subsistema>" da biblioteca padrão. Os
+# registros entram numa fila (QueueHandler) e uma thread própria formata e
+# escreve no stdout, então o loop de eventos e as threads de trabalho nunca
+# esperam pela escrita. A saída é uma linha JSON por evento, com os campos
+# extras passados em `extra=` (item_id, feed, duration_ms, ...). Mensagens de
+# nível desligado são descartadas antes de qualquer formatação.
+
+ROOT_LOGGER = "valbot"
+
+# Atributos padrão do LogRecord (o resto veio de `extra=`)
+_STANDARD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+_listener = None
+_exc_formatter = logging.Formatter()
+
+
+def _extra_fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRS}
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos extras no topo do objeto."""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato legível para uso local: horário, nível, subsistema, mensagem e campos extras."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(name)s] %(message)s", datefmt="%H:%M:%S")
+
+    def format(self, record):
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record, self.datefmt)
+        line = self.formatMessage(record)
+        fields = _extra_fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line += "\n" + record.exc_text  # Traceback abaixo da linha, depois dos campos extras
+        return line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que mantém o traceback fora da mensagem.
+
+    O prepare() padrão formata o registro inteiro em `msg` (com o traceback
+    junto) e limpa exc_info, então o JSON perderia o campo `exc`. Aqui só os
+    argumentos são resolvidos; o traceback vai já formatado em exc_text.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None  # Já formatado; os frames não precisam atravessar a fila
+        return record
+
+
+def setup_logging(level="INFO", fmt="json", overrides=""):
+    """Configura os loggers do bot com escrita assíncrona por fila.
+
+    `overrides` ajusta níveis por subsistema, ex.: "lzt=DEBUG,render=WARNING".
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+    log_queue = queue.SimpleQueue()
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level.upper())
+    root.handlers[:] = [_QueueHandler(log_queue)]
+    root.propagate = False
+
+    for override in filter(None, (part.strip() for part in overrides.split(","))):
+        name, _, sub_level = override.partition("=")
+        logging.getLogger(f"{ROOT_LOGGER}.{name.strip()}").setLevel(sub_level.strip().upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+
+
+def shutdown_logging():
+    """Esvazia a fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+import aiohttp
+from metrics import LZT_REQUEST_SECONDS, LZT_RESPONSES
+from rate_limiter import PRIORITY_POLLING, PRIORITY_BACKGROUND
+
+# --- Cliente assíncrono da API LZT Market ---
+# Uma única sessão aiohttp (pool de conexões com keep-alive) é compartilhada por
+# todas as chamadas, evitando um novo handshake TCP+TLS e uma thread por requisição.
+
+USER_AGENT = "Mozilla/5.0 (ValorantStoreBot/1.0)"
+
+log = logging.getLogger("valbot.lzt")
+
+
+class LZTClient:
+    """Cliente HTTP assíncrono para a API LZT com retry e backoff não-bloqueante."""
+
+    def __init__(self, token, base_url, limiter=None, timeout=20, max_connections=10, max_retries=3, retry_delay=5):
+        self.token = token
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay  # segundos
+        self.limiter = limiter  # RateLimiter compartilhado por todas as chamadas
+        self._session = None
+
+    def _get_session(self):
+        """Cria a sessão compartilhada na primeira chamada (precisa de um loop ativo)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    'Authorization': f'Bearer {self.token}',
+                    'User-Agent': USER_AGENT,
+                },
+            )
+        return self._session
+
+    async def close(self):
+        """Fecha a sessão e libera as conexões do pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_json(self, url, tag="LZT", priority=PRIORITY_POLLING):
+        """GET com retry: respeita 'Retry-After' em 429 e tenta de novo em 5xx/timeout."""
+        session = self._get_session()
+
+        for attempt in range(self.max_retries):
+            last_attempt = attempt >= self.max_retries - 1
+            if self.limiter is not None:
+                await self.limiter.acquire(priority)
+            try:
+                log.debug("GET %s (tentativa %d/%d)", url, attempt + 1, self.max_retries,
+                          extra={'endpoint': tag, 'url': url})
+                started = time.perf_counter()
+                async with session.get(url) as response:
+                    duration = time.perf_counter() - started
+                    log.debug("Status %d", response.status,
+                              extra={'endpoint': tag, 'status': response.status, 'duration_ms': round(duration * 1000, 1)})
+                    LZT_REQUEST_SECONDS.observe(duration, tag)
+                    LZT_RESPONSES.inc(tag, str(response.status))
+
+                    if response.status == 200:
+                        if self.limiter is not None:
+                            self.limiter.report_success()
+                        try:
+                            return await response.json(content_type=None)
+                        except ValueError as e:
+                            # Corpo não é JSON (página de erro, resposta truncada): não adianta repetir
+                            log.error("Resposta 200 com JSON inválido: %s", e, extra={'endpoint': tag, 'url': url})
+                            return None
+                    elif response.status == 429:
+                        # Tenta obter o valor do cabeçalho 'Retry-After' se disponível
+                        retry_after_header = response.headers.get('Retry-After')
+                        wait_time = self.retry_delay * (attempt + 1)  # Aumenta o delay a cada tentativa
+                        if retry_after_header:
+                            try:
+                                wait_time = int(retry_after_header)
+                            except ValueError:
+                                log.warning("'Retry-After' com valor inválido: %s", retry_after_header, extra={'endpoint': tag})
+                        log.warning("Erro 429 (Too Many Requests). Aguardando %s segundos.", wait_time,
+                                    extra={'endpoint': tag, 'status': 429, 'url': url})
+
+                        if self.limiter is not None:
+                            # A pausa vale para todas as chamadas, não só para esta
+                            self.limiter.penalize(wait_time)
+                        if last_attempt:
+                            log.error("Erro 429: máximo de tentativas atingido.", extra={'endpoint': tag, 'url': url})
+                            return None
+                        if self.limiter is None:
+                            await asyncio.sleep(wait_time)
+                        continue
+                    elif response.status >= 500:  # Erro do servidor
+                        if last_attempt:
+                            log.error("Erro do servidor %d: máximo de tentativas atingido.", response.status,
+                                      extra={'endpoint': tag, 'status': response.status, 'url': url})
+                            return None
+                        log.warning("Erro do servidor %d. Tentando novamente em %s segundos.", response.status, self.retry_delay,
+                                    extra={'endpoint': tag, 'status': response.status, 'url': url})
+                        await asyncio.sleep(self.retry_delay)
+                        continue
+                    else:
+                        body = await response.text()
+                        log.error("Erro não-recuperável %d: %s", response.status, body[:300],
+                                  extra={'endpoint': tag, 'status': response.status, 'url': url})
+                        return None
+
+            except asyncio.TimeoutError:
+                LZT_RESPONSES.inc(tag, 'timeout')
+                if last_attempt:
+                    log.error("Timeout: máximo de tentativas atingido.", extra={'endpoint': tag, 'url': url})
+                    return None
+                log.warning("Timeout. Tentando novamente em %s segundos.", self.retry_delay, extra={'endpoint': tag, 'url': url})
+                await asyncio.sleep(self.retry_delay)
+            except aiohttp.ClientError as e:
+                LZT_RESPONSES.inc(tag, 'error')
+                if last_attempt:
+                    log.error("Exceção: %s. Máximo de tentativas atingido.", e, extra={'endpoint': tag, 'url': url})
+                    return None
+                log.warning("Exceção: %s. Tentando novamente em %s segundos.", e, self.retry_delay,
+                            extra={'endpoint': tag, 'url': url})
+                await asyncio.sleep(self.retry_delay)
+
+        log.error("Falha ao buscar dados após %d tentativas.", self.max_retries, extra={'endpoint': tag, 'url': url})
+        return None
+
+    async def fetch_listings(self, url, priority=PRIORITY_POLLING):
+        """Busca a lista de contas da API LZT."""
+        return await self.get_json(url, tag="LZT-LIST", priority=priority)
+
+    async def fetch_item_details(self, item_id, priority=PRIORITY_POLLING):
+        """Busca os detalhes de um item específico da API LZT."""
+        return await self.get_json(f"{self.base_url}/{item_id}", tag="LZT-DETAIL", priority=priority)
+
+    async def probe_item(self, item_id, priority=PRIORITY_BACKGROUND):
+        """Consulta de um item (uma tentativa, sem retry): retorna (status HTTP ou None, JSON ou None).
+
+        Usa o mesmo endpoint completo de detalhes (a LZT não tem um endpoint só de
+        estado); a economia está em não repetir e não esperar backoff.
+        """
+        session = self._get_session()
+        if self.limiter is not None:
+            await self.limiter.acquire(priority)
+        url = f"{self.base_url}/{item_id}"
+        try:
+            started = time.perf_counter()
+            async with session.get(url) as response:
+                LZT_REQUEST_SECONDS.observe(time.perf_counter() - started, "LZT-PROBE")
+                LZT_RESPONSES.inc("LZT-PROBE", str(response.status))
+                if response.status == 200:
+                    if self.limiter is not None:
+                        self.limiter.report_success()
+                    try:
+                        return response.status, await response.json(content_type=None)
+                    except ValueError as e:
+                        log.warning("Resposta 200 com JSON inválido: %s", e, extra={'endpoint': "LZT-PROBE", 'item_id': item_id})
+                        return None, None
+                if response.status == 429 and self.limiter is not None:
+                    retry_after = response.headers.get('Retry-After')
+                    self.limiter.penalize(int(retry_after) if retry_after and retry_after.isdigit() else self.retry_delay)
+                return response.status, None
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            LZT_RESPONSES.inc("LZT-PROBE", 'timeout' if isinstance(e, asyncio.TimeoutError) else 'error')
+            log.warning("Falha ao consultar item: %r", e, extra={'endpoint': "LZT-PROBE", 'item_id': item_id})
+            return None, None
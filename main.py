@@ -0,0 +1,9 @@
+# --- Ponto de entrada do bot ---
+# O pool de renderização usa forkserver/spawn, e cada processo reimporta o
+# módulo principal do programa. Este arquivo não faz nada quando importado, então
+# os processos carregam só render_pool/renderer; o bot (config, logs, Discord,
+# banco, métricas) é montado em bot.py, importado aqui só no processo principal.
+
+if __name__ == "__main__":
+    import bot
+    bot.main()
@@ -0,0 +1,252 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from flask import Flask, Response
+from werkzeug.serving import make_server
+
+# --- Métricas e saúde do bot ---
+# Registro em memória de contadores, histogramas e gauges, exposto no formato
+# de texto do Prometheus por um servidor Flask embutido (thread própria, ao lado
+# do bot.run). Os módulos registram as medições nas métricas declaradas aqui;
+# gauges são lidos na hora da coleta por funções registradas pelo bot.
+
+log = logging.getLogger("valbot.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+ITEM_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value != value:
+        return "NaN"
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Contador monotônico com labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self):
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Histogram:
+    """Histograma de buckets fixos com labels."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [contagem por bucket..., soma, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def time(self, *label_values):
+        """Context manager que observa a duração do bloco em segundos."""
+        return _Timer(self, label_values)
+
+    def collect(self):
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for label_values, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                labels = _format_labels(self.labels, label_values, ('le', _format_value(float(bound))))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, label_values, ('le', "+Inf"))
+            yield f"{self.name}_bucket{labels} {series[-1]}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(float(series[-2]))}"
+            yield f"{self.name}_count{labels} {series[-1]}"
+
+
+class _Timer:
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = None
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        self.histogram.observe(self.elapsed, *self.label_values)
+        return False
+
+    def elapsed_ms(self):
+        """Duração medida em milissegundos (para os logs)."""
+        return round(self.elapsed * 1000, 1) if self.elapsed is not None else None
+
+
+class Gauge:
+    """Valor lido na coleta: a função retorna um número ou {labels: número}.
+
+    Com `kind='counter'` expõe contadores mantidos por outros objetos (hits de cache etc.).
+    """
+
+    def __init__(self, name, help_text, labels, read, kind='gauge'):
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.labels = labels
+        self.read = read
+
+    def collect(self):
+        try:
+            values = self.read()
+        except Exception as e:
+            log.warning("Falha ao ler %s: %s", self.name, e)
+            return
+        if not isinstance(values, dict):
+            values = {(): values}
+        for label_values, value in sorted(values.items()):
+            if not isinstance(label_values, tuple):
+                label_values = (label_values,)
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Conjunto das métricas do bot, na ordem em que foram registradas."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Métrica '{metric.name}' já registrada")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def gauge(self, name, help_text, read, labels=(), kind='gauge'):
+        return self._register(Gauge(name, help_text, labels, read, kind))
+
+    def render(self):
+        """Todas as métricas no formato de texto do Prometheus."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# --- Métricas medidas pelos módulos ---
+FEED_POLL_SECONDS = REGISTRY.histogram(
+    'valbot_feed_poll_seconds', 'Duração de um ciclo de polling do feed.', ('feed',))
+FEED_NEW_IDS = REGISTRY.histogram(
+    'valbot_feed_new_ids', 'Contas novas encontradas por ciclo de polling.', ('feed',), buckets=COUNT_BUCKETS)
+LZT_REQUEST_SECONDS = REGISTRY.histogram(
+    'valbot_lzt_request_seconds', 'Latência das requisições à API LZT (por tentativa).', ('endpoint',))
+LZT_RESPONSES = REGISTRY.counter(
+    'valbot_lzt_responses_total', 'Respostas da API LZT por status (timeout/error para falhas de rede).',
+    ('endpoint', 'status'))
+GRID_RENDER_SECONDS = REGISTRY.histogram(
+    'valbot_grid_render_seconds', 'Tempo para montar uma grade de skins (busca + renderização).')
+DISCORD_SEND_SECONDS = REGISTRY.histogram(
+    'valbot_discord_send_seconds', 'Latência do envio de mensagens ao Discord.', ('kind',))
+ITEM_LATENCY_SECONDS = REGISTRY.histogram(
+    'valbot_item_latency_seconds', 'Duração de cada estágio de uma conta publicada (total = published_date até o envio).',
+    ('feed', 'stage'), buckets=ITEM_LATENCY_BUCKETS)
+
+
+# --- Servidor HTTP ---
+class MetricsServer:
+    """Servidor Flask com /metrics (Prometheus) e /health (JSON) numa thread daemon."""
+
+    def __init__(self, registry, health, host='127.0.0.1', port=9105):
+        self.registry = registry
+        self.health = health  # () -> (saudável, dict de detalhes)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+        self.app = Flask("valbot-metrics")
+        self.app.add_url_rule('/metrics', 'metrics', self._metrics)
+        self.app.add_url_rule('/health', 'health', self._health)
+
+    def _metrics(self):
+        return Response(self.registry.render(), mimetype='text/plain; version=0.0.4')
+
+    def _health(self):
+        try:
+            healthy, details = self.health()
+        except Exception as e:
+            healthy, details = False, {'error': str(e)}
+        body = json.dumps({'status': 'ok' if healthy else 'degraded', **details})
+        return Response(body, status=200 if healthy else 503, mimetype='application/json')
+
+    def start(self):
+        if self._thread is not None:
+            return
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)  # Sem uma linha de log por coleta
+        self._server = make_server(self.host, self.port, self.app, threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        log.info("Servidor de métricas em http://%s:%d/metrics", self.host, self.port)
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+            self._thread = None
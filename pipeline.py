@@ -0,0 +1,175 @@
+import asyncio
+import logging
+import time
+from tracing import NULL_TRACE
+
+# --- Pipeline de publicação de contas novas ---
+# Três estágios ligados por filas limitadas, cada um com seu próprio limite de
+# concorrência: detalhes (API LZT) -> grade de skins -> envio ao Discord.
+# O ritmo das buscas de detalhes é dado pelo limitador de taxa do cliente LZT.
+# Uma conta que falha em qualquer estágio não é marcada como vista: o feed a
+# oferece de novo no próximo ciclo, até `max_attempts` falhas seguidas.
+
+log = logging.getLogger("valbot.pipeline")
+
+
+class PublishFailed(Exception):
+    """O envio da conta falhou sem publicar nada; a conta pode ser oferecida de novo."""
+
+
+class PostingJob:
+    """Uma conta nova atravessando o pipeline."""
+
+    __slots__ = ('item_id', 'feed', 'process', 'on_done', 'item_data', 'trace', 'enqueued_at')
+
+    def __init__(self, item_id, feed, process, on_done, trace=NULL_TRACE):
+        self.item_id = item_id
+        self.feed = feed  # feed.name (campo 'feed' dos logs, igual ao do polling e dos rastros)
+        self.process = process  # async (item_id, item_data) -> publica a conta
+        self.on_done = on_done  # (item_id, sucesso) -> marca como visto (não chamado quando a conta volta a ser tentada)
+        self.item_data = None
+        self.trace = trace  # Rastro de latência da conta
+        self.enqueued_at = None  # Entrada na fila do estágio atual
+
+
+class PostingPipeline:
+    """Pipeline produtor/consumidor limitado para publicar contas novas."""
+
+    def __init__(self, fetch_details, prepare_grid, detail_concurrency=4, render_concurrency=2,
+                 send_concurrency=2, queue_size=100, max_attempts=3, failure_ttl=3600):
+        self.fetch_details = fetch_details  # async item_id -> dict de detalhes ou None
+        self.prepare_grid = prepare_grid  # async (item_id, item_data) -> aquece o cache da grade
+        self.detail_concurrency = detail_concurrency
+        self.render_concurrency = render_concurrency
+        self.send_concurrency = send_concurrency
+        self.queue_size = queue_size
+        self.max_attempts = max_attempts  # Tentativas (uma por ciclo) antes de desistir da conta
+        self.failure_ttl = failure_ttl  # Falhas mais antigas são esquecidas (a conta saiu da listagem)
+        self.posted = 0
+        self.failed = 0
+        self._in_flight = set()  # item_ids aceitos e ainda não concluídos
+        self._failures = {}  # item_id -> (falhas até agora, horário da última)
+        self._queues = None
+        self._workers = []
+
+    # --- Ciclo de vida ---
+    def start(self):
+        if self._workers:
+            return
+        self._queues = {
+            'detail': asyncio.Queue(self.queue_size),
+            'render': asyncio.Queue(self.queue_size),
+            'send': asyncio.Queue(self.queue_size),
+        }
+        stages = (
+            ('detail', self._detail_stage, self.detail_concurrency),
+            ('render', self._render_stage, self.render_concurrency),
+            ('send', self._send_stage, self.send_concurrency),
+        )
+        for name, stage, concurrency in stages:
+            for _ in range(concurrency):
+                self._workers.append(asyncio.create_task(self._worker(name, stage)))
+        log.info("Iniciado: %d detalhes, %d grades, %d envios.", self.detail_concurrency, self.render_concurrency, self.send_concurrency)
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # --- Entrada ---
+    def is_pending(self, item_id):
+        return item_id in self._in_flight
+
+    def submit(self, job):
+        """Enfileira uma conta. Retorna False se já estiver no pipeline ou se a fila estiver cheia."""
+        if job.item_id in self._in_flight or self._queues is None:
+            return False
+        try:
+            job.enqueued_at = time.time()
+            self._queues['detail'].put_nowait(job)
+        except asyncio.QueueFull:
+            # Não marca como visto: a conta volta a ser oferecida no próximo ciclo
+            return False
+        self._in_flight.add(job.item_id)
+        return True
+
+    def queue_depths(self):
+        if self._queues is None:
+            return {}
+        return {name: queue.qsize() for name, queue in self._queues.items()}
+
+    # --- Estágios ---
+    async def _worker(self, name, stage):
+        queue = self._queues[name]
+        while True:
+            job = await queue.get()
+            job.trace.add(f"wait_{name}", job.enqueued_at, time.time())
+            try:
+                await stage(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.exception("Erro no estágio '%s': %s", name, e, extra={'item_id': job.item_id, 'feed': job.feed})
+                if name == 'send':
+                    # A mensagem pode ter saído antes do erro: não arrisca publicar duas vezes
+                    self._finish(job, False)
+                else:
+                    self._fail(job, name, e)
+            finally:
+                queue.task_done()
+
+    async def _detail_stage(self, job):
+        with job.trace.span('detail'):
+            item_details_data = await self.fetch_details(job.item_id)
+        if not item_details_data or 'item' not in item_details_data:
+            self._fail(job, 'detail', "detalhes indisponíveis")
+            return
+        job.item_data = item_details_data['item']
+        job.enqueued_at = time.time()
+        await self._queues['render'].put(job)
+
+    async def _render_stage(self, job):
+        await self.prepare_grid(job.item_id, job.item_data)
+        job.enqueued_at = time.time()
+        await self._queues['send'].put(job)
+
+    async def _send_stage(self, job):
+        try:
+            await job.process(job.item_id, job.item_data)
+        except PublishFailed as e:
+            self._fail(job, 'send', e)
+            return
+        self._finish(job, True)
+
+    def _fail(self, job, stage, reason):
+        """Conta a falha; a conta volta no próximo ciclo até esgotar as tentativas."""
+        now = time.time()
+        for item_id, (_, failed_at) in list(self._failures.items()):
+            if now - failed_at > self.failure_ttl:
+                del self._failures[item_id]
+        attempts = self._failures.get(job.item_id, (0, now))[0] + 1
+        if attempts < self.max_attempts:
+            # Não marca como vista: o feed oferece a conta de novo no próximo ciclo
+            self._failures[job.item_id] = (attempts, now)
+            log.warning("Falha no estágio '%s' (%d/%d); a conta volta no próximo ciclo: %s", stage, attempts, self.max_attempts,
+                        reason, extra={'item_id': job.item_id, 'feed': job.feed})
+            self._finish(job, False, retry=True)
+        else:
+            log.error("Falha no estágio '%s' (%d tentativas); desistindo da conta: %s", stage, attempts, reason,
+                      extra={'item_id': job.item_id, 'feed': job.feed})
+            self._finish(job, False)
+
+    def _finish(self, job, success, retry=False):
+        self._in_flight.discard(job.item_id)
+        if success:
+            self.posted += 1
+        else:
+            self.failed += 1
+        if not retry:
+            self._failures.pop(job.item_id, None)
+            try:
+                job.on_done(job.item_id, success)
+            except Exception as e:
+                log.exception("Erro ao finalizar item: %s", e, extra={'item_id': job.item_id})
+        job.trace.finish(success)
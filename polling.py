@@ -0,0 +1,133 @@
+import logging
+import time
+from collections import deque
+
+# --- Polling incremental das listagens ---
+# Cada feed guarda um cursor com o (published_date, item_id) mais novo já
+# processado. A cada ciclo só interessam as contas mais novas que o cursor: a
+# paginação avança enquanto a página inteira for nova (rajadas que passam da
+# primeira página) e para na primeira conta já conhecida.
+#
+# O filtro pelo cursor é feito aqui, no cliente: a listagem da LZT não tem um
+# parâmetro de "publicadas depois de" em que possamos confiar. Um ciclo sem
+# novidades ainda custa a primeira página inteira (uma requisição, o mesmo de
+# antes); a economia está nas páginas seguintes, que só são buscadas enquanto
+# tudo for novo, e em não reprocessar contas já vistas.
+
+log = logging.getLogger("valbot.poll")
+
+
+def listing_key(item):
+    """Chave de ordenação de uma conta na listagem (published_date, item_id)."""
+    return (item.get('published_date') or 0, item.get('item_id') or 0)
+
+
+class IncrementalPoller:
+    """Busca só as contas publicadas depois do cursor do feed."""
+
+    def __init__(self, name, max_pages=5):
+        self.name = name
+        self.max_pages = max_pages
+        self.cursor = None  # (published_date, item_id) da conta mais nova já processada
+        self.last_pages = 0  # Páginas buscadas no último ciclo
+
+    async def poll(self, client, url):
+        """Retorna as contas mais novas que o cursor (mais nova primeiro) ou None em caso de falha.
+
+        A primeira página é sempre buscada por completo; o cursor só decide o
+        que é novo e se vale buscar a próxima.
+        """
+        new_items = []
+        self.last_pages = 0
+        for page in range(1, self.max_pages + 1):
+            page_url = url if page == 1 else f"{url}&page={page}"
+            listing_data = await client.fetch_listings(page_url)
+            self.last_pages = page
+            if listing_data is None or 'items' not in listing_data:
+                # Falha na primeira página invalida o ciclo; nas seguintes usa o que já veio
+                return None if page == 1 else new_items
+
+            items = [item for item in listing_data.get('items', []) if item.get('item_id')]
+            fresh = [item for item in items if self.cursor is None or listing_key(item) > self.cursor]
+            new_items.extend(fresh)
+
+            # Sem cursor (primeira execução) a primeira página basta
+            if self.cursor is None or len(fresh) < len(items):
+                break
+            per_page = listing_data.get('perPage') or len(items)
+            if not items or len(items) < per_page:
+                break  # Última página
+        else:
+            log.warning("Limite de %d páginas atingido; contas mais antigas ficam para o próximo ciclo.", self.max_pages,
+                        extra={'feed': self.name})
+
+        return new_items
+
+    def advance(self, items, accepted):
+        """Move o cursor até a conta mais nova concluída sem pular nenhuma pendente."""
+        for item in sorted(items, key=listing_key):
+            if not accepted(item):
+                break
+            key = listing_key(item)
+            if self.cursor is None or key > self.cursor:
+                self.cursor = key
+
+
+class AdaptiveSchedule:
+    """Intervalo de polling adaptativo pela taxa de chegada de contas do feed.
+
+    Mantém uma EWMA de contas novas por segundo e escolhe o intervalo que
+    renderia cerca de `target_per_poll` contas por ciclo: feeds quentes são
+    consultados com mais frequência e feeds parados vão recuando até o máximo.
+    O total de requisições na última hora nunca passa de `budget_per_hour`.
+    No primeiro ciclo (sem intervalo medido) a taxa é estimada como se as
+    contas novas tivessem chegado ao longo de `initial_interval`, e o intervalo
+    não passa de `initial_interval`.
+    """
+
+    def __init__(self, name, initial_interval, min_interval, max_interval, budget_per_hour,
+                 target_per_poll=1.0, alpha=0.3):
+        self.name = name
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget_per_hour = budget_per_hour
+        self.target_per_poll = target_per_poll
+        self.alpha = alpha
+        self.initial_interval = initial_interval
+        self.arrival_rate = None  # EWMA de contas novas por segundo
+        self.interval = initial_interval
+        self._last_poll_at = None
+        self._requests = deque()  # Horários das requisições de listagem na última hora
+
+    def record(self, new_count, requests=1, now=None):
+        """Registra o resultado de um ciclo e retorna o próximo intervalo (segundos)."""
+        now = time.time() if now is None else now
+        for _ in range(requests):
+            self._requests.append(now)
+        while self._requests and now - self._requests[0] >= 3600:
+            self._requests.popleft()
+
+        cold_start = self._last_poll_at is None
+        if cold_start:
+            # Partida a frio: ainda não há intervalo medido, a taxa parte do intervalo inicial
+            self.arrival_rate = new_count / max(1.0, self.initial_interval)
+        else:
+            elapsed = max(1.0, now - self._last_poll_at)
+            sample = new_count / elapsed
+            self.arrival_rate = self.alpha * sample + (1 - self.alpha) * self.arrival_rate
+        self._last_poll_at = now
+
+        if self.arrival_rate:
+            interval = self.target_per_poll / self.arrival_rate
+        else:
+            interval = self.max_interval
+        if cold_start:
+            interval = min(interval, self.initial_interval)
+        interval = min(self.max_interval, max(self.min_interval, interval))
+
+        # Orçamento esgotado: espera a requisição mais antiga sair da janela de uma hora
+        if len(self._requests) >= self.budget_per_hour:
+            interval = max(interval, self._requests[0] + 3600 - now)
+
+        self.interval = interval
+        return interval
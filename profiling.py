@@ -0,0 +1,97 @@
+import cProfile
+import json
+import logging
+import os
+import time
+import tracemalloc
+from PIL import Image
+
+# --- Perfil opcional das renderizações ---
+# Ligado por RENDER_PROFILE_RENDERS (na inicialização) ou pelo comando do
+# vendedor, perfila só as próximas N grades. Cada processo de renderização
+# acumula um cProfile (render-<pid>.prof, para o pstats/snakeviz) e grava uma
+# linha JSON por grade perfilada em render-<pid>.jsonl com a duração e as
+# alocações: pico de memória Python (tracemalloc) e imagens/blocos criados pelo
+# Pillow, cuja memória de pixels não passa pelo tracemalloc.
+# Fora das grades perfiladas não há custo algum.
+
+log = logging.getLogger("valbot.render")
+
+TOP_ALLOCATIONS = 5
+
+
+def pillow_stats():
+    """Contadores do alocador de imagens do Pillow (imagens criadas, blocos alocados/reaproveitados)."""
+    return Image.core.get_stats()
+
+
+def pillow_delta(before, after):
+    return {key: after[key] - before[key] for key in ('new_count', 'allocated_blocks', 'reused_blocks')}
+
+
+class RenderProfiler:
+    """Perfil acumulado (cProfile + alocações) das grades marcadas para perfilar.
+
+    Não é seguro para chamadas simultâneas: o cProfile é um só e o tracemalloc
+    vale para o processo inteiro. Quem usa de várias threads serializa as chamadas.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.profile = cProfile.Profile()
+        self.renders = 0
+        self._pid = os.getpid()
+
+    @property
+    def stats_path(self):
+        return os.path.join(self.directory, f"render-{self._pid}.prof")
+
+    @property
+    def log_path(self):
+        return os.path.join(self.directory, f"render-{self._pid}.jsonl")
+
+    def run(self, fn, *args, **details):
+        """Executa `fn(*args)` sob o perfil e registra duração e alocações da chamada."""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        snapshot_before = tracemalloc.take_snapshot()
+        pillow_before = pillow_stats()
+        started = time.perf_counter()
+
+        self.profile.enable()
+        try:
+            result = fn(*args)
+        finally:
+            self.profile.disable()
+            duration = time.perf_counter() - started
+            pillow_after = pillow_stats()
+            _, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().compare_to(snapshot_before, 'lineno')[:TOP_ALLOCATIONS]
+            if started_tracing:
+                tracemalloc.stop()
+
+        self.renders += 1
+        entry = {
+            'ts': round(time.time(), 3),
+            'duration_ms': round(duration * 1000, 2),
+            'python_peak_kb': round(peak / 1024, 1),
+            'pillow': pillow_delta(pillow_before, pillow_after),
+            'top_allocations': [str(stat) for stat in top],
+            **details,
+        }
+        self._write(entry)
+        return result
+
+    def _write(self, entry):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.profile.dump_stats(self.stats_path)  # Acumulado de todas as grades perfiladas
+        except OSError as e:
+            log.warning("Não foi possível gravar o perfil de renderização: %s", e)
+            return
+        log.info("Grade perfilada: %.1f ms.", entry['duration_ms'],
+                 extra={'profile': self.stats_path, 'renders': self.renders, 'duration_ms': entry['duration_ms']})
@@ -0,0 +1,97 @@
+import asyncio
+import heapq
+import itertools
+import logging
+
+# --- Limitador de taxa compartilhado da API LZT ---
+# Token bucket único por onde passam todas as requisições (polling BR,
+# internacional e /buscar). Quem espera é atendido por prioridade, e um 429
+# pausa o bucket pelo 'Retry-After' e reduz a taxa até as respostas normalizarem.
+
+log = logging.getLogger("valbot.ratelimit")
+
+PRIORITY_INTERACTIVE = 0  # Comandos do vendedor (/buscar)
+PRIORITY_POLLING = 1  # Loops de verificação e pipeline de publicação
+PRIORITY_BACKGROUND = 2  # Tarefas que só usam o orçamento que sobrar
+
+
+class RateLimiter:
+    """Token bucket com fila de prioridades e desaceleração adaptativa."""
+
+    def __init__(self, max_requests, window_seconds, burst=None, min_slowdown=0.25, recovery_step=0.05):
+        self.rate = max_requests / window_seconds  # Tokens por segundo na taxa cheia
+        self.capacity = burst if burst else max_requests
+        self.min_slowdown = min_slowdown
+        self.recovery_step = recovery_step
+        self.slowdown = 1.0  # Fração da taxa cheia em uso (cai a cada 429)
+        self.throttled = 0  # Quantidade de 429 recebidos
+        self._tokens = float(self.capacity)
+        self._updated_at = None
+        self._paused_until = 0.0
+        self._waiters = []  # heap de (prioridade, sequência, future)
+        self._seq = itertools.count()
+        self._dispatcher = None
+
+    def _now(self):
+        return asyncio.get_running_loop().time()
+
+    def _refill(self):
+        now = self._now()
+        if self._updated_at is not None:
+            elapsed = now - self._updated_at
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate * self.slowdown)
+        self._updated_at = now
+        return now
+
+    async def acquire(self, priority=PRIORITY_POLLING):
+        """Aguarda um token. Prioridades menores são atendidas primeiro."""
+        now = self._refill()
+        if not self._waiters and self._tokens >= 1 and now >= self._paused_until:
+            self._tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)  # Espera cancelada
+                continue
+            now = self._refill()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / (self.rate * self.slowdown))
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+
+    def penalize(self, retry_after):
+        """Recebeu 429: pausa o bucket e reduz a taxa."""
+        now = self._refill()
+        self.throttled += 1
+        self._tokens = 0.0
+        self._paused_until = max(self._paused_until, now + retry_after)
+        self.slowdown = max(self.min_slowdown, self.slowdown * 0.5)
+        log.warning("429 recebido. Pausando por %ss, taxa reduzida para %.0f%%.", retry_after, self.slowdown * 100,
+                    extra={'retry_after': retry_after})
+
+    def report_success(self):
+        """Resposta normal: recupera a taxa aos poucos depois de um 429."""
+        if self.slowdown < 1.0:
+            self.slowdown = min(1.0, self.slowdown + self.recovery_step)
+
+    def has_spare(self, tokens=1):
+        """Indica se há orçamento sobrando (sem ninguém esperando e sem pausa)."""
+        now = self._refill()
+        return not self._waiters and now >= self._paused_until and self._tokens >= tokens
+
+    def pending(self):
+        return sum(1 for _, _, future in self._waiters if not future.done())
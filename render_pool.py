@@ -0,0 +1,155 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from PIL import Image
+from profiling import RenderProfiler
+from renderer import SkinGridRenderer
+
+# --- Pool de processos para renderizar as grades ---
+# Composição e codificação das grades são trabalho de CPU (Pillow) e, em
+# threads, disputam o GIL com o loop do discord.py. Aqui elas rodam em processos
+# de vida longa, um por núcleo, com entrada e saída só em bytes: as miniaturas
+# seguem como pixels RGBA crus e a grade volta já codificada. Um semáforo limita
+# as renderizações pendentes; quando enche, quem pede espera, e a espera sobe
+# pelo estágio de renderização até as filas limitadas do pipeline.
+# Grades marcadas para perfilar (enable_profiling) rodam sob o RenderProfiler
+# do processo que as recebe.
+
+log = logging.getLogger("valbot.render")
+
+_worker_renderer = None  # Renderizador de cada processo do pool
+_worker_profiler = None  # Perfil do processo (criado na primeira grade perfilada)
+_worker_profile_dir = None
+
+
+def _init_worker(renderer_options, profile_dir=None):
+    global _worker_renderer, _worker_profile_dir
+    _worker_renderer = SkinGridRenderer(**renderer_options)
+    _worker_profile_dir = profile_dir
+
+
+def _render_in_worker(raw_skins, grid_cols, profile=False):
+    global _worker_profiler
+    skins = [
+        (name, Image.frombytes('RGBA', size, pixels))
+        for name, size, pixels in raw_skins
+    ]
+    if not profile:
+        return _worker_renderer.render_bytes(skins, grid_cols)
+    if _worker_profiler is None:
+        _worker_profiler = RenderProfiler(_worker_profile_dir)
+    return _worker_profiler.run(_worker_renderer.render_bytes, skins, grid_cols, skins=len(skins))
+
+
+def pack_skins(skins):
+    """[(nome, miniatura RGBA)] -> [(nome, (largura, altura), pixels)] para envio barato ao processo."""
+    return [(name, thumbnail.size, thumbnail.tobytes()) for name, thumbnail in skins]
+
+
+class RenderPool:
+    """Processos dedicados à renderização, com fila limitada e contrapressão."""
+
+    def __init__(self, renderer_options, workers=None, max_pending=None, profile_dir="render_profiles", profile_renders=0):
+        self.renderer_options = renderer_options
+        self.profile_dir = os.path.abspath(profile_dir)  # Os processos não herdam mudanças de diretório
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * 2
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._fallback = None  # Renderizador local se o pool de processos quebrar
+        self._fallback_profiler = None
+        self._fallback_profile_lock = threading.Lock()  # Um cProfile e um tracemalloc por processo: uma grade perfilada por vez
+        self._profile_remaining = profile_renders  # Próximas grades a perfilar
+        self._profile_lock = threading.Lock()
+        self.rendered = 0
+        self.fallbacks = 0
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                # forkserver/spawn: os processos não herdam as threads e locks do bot
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.renderer_options, self.profile_dir),
+                )
+                log.info("%d processos de renderização iniciados (até %d pendentes).", self.workers, self.max_pending)
+            return self._executor
+
+    def pending(self):
+        return self._pending
+
+    def enable_profiling(self, renders):
+        """Perfila as próximas `renders` grades (cProfile + alocações em profile_dir)."""
+        with self._profile_lock:
+            self._profile_remaining = max(0, renders)
+        log.info("Perfil ligado para as próximas %d grades (%s).", renders, self.profile_dir)
+
+    def _take_profile_slot(self):
+        with self._profile_lock:
+            if self._profile_remaining <= 0:
+                return False
+            self._profile_remaining -= 1
+            return True
+
+    def worker_pids(self):
+        """PIDs dos processos de renderização ativos (vazio antes da primeira grade)."""
+        with self._executor_lock:
+            processes = getattr(self._executor, '_processes', None) or {}
+            return list(processes)
+
+    def render(self, skins, grid_cols):
+        """Renderiza [(nome, miniatura)] e retorna os bytes codificados (bloqueia enquanto o pool estiver cheio)."""
+        if not skins:
+            return None
+        raw_skins = pack_skins(skins)
+        profile = self._take_profile_slot()
+        with self._pending_lock:
+            self._pending += 1  # Inclui quem está esperando vaga
+        with self._slots:
+            try:
+                future = self._get_executor().submit(_render_in_worker, raw_skins, grid_cols, profile)
+                data = future.result()
+                self.rendered += 1
+                return data
+            except BrokenProcessPool as e:
+                log.error("Pool de processos indisponível (%s); renderizando na thread.", e)
+                self._reset_executor()
+                return self._render_locally(skins, grid_cols, profile)
+            finally:
+                with self._pending_lock:
+                    self._pending -= 1
+
+    def _render_locally(self, skins, grid_cols, profile=False):
+        self.fallbacks += 1
+        if self._fallback is None:
+            self._fallback = SkinGridRenderer(**self.renderer_options)
+        if not profile:
+            return self._fallback.render_bytes(skins, grid_cols)
+        # O fallback roda nas threads de renderização do bot, várias ao mesmo tempo;
+        # as grades perfiladas esperam a vez (as demais seguem sem esperar)
+        with self._fallback_profile_lock:
+            if self._fallback_profiler is None:
+                self._fallback_profiler = RenderProfiler(self.profile_dir)
+            return self._fallback_profiler.run(self._fallback.render_bytes, skins, grid_cols, skins=len(skins))
+
+    def _reset_executor(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,199 @@
+import io
+import logging
+import threading
+from collections import OrderedDict
+from PIL import Image, ImageDraw, ImageFont, features
+
+# --- Renderizador das grades de skins ---
+# Tudo o que não depende da conta é preparado uma vez: a fonte (e a altura da
+# linha), o fundo do cartão e o rótulo de cada nome de skin já desenhado com
+# sombra. Uma grade é só a composição desses pedaços numa tela pré-alocada por
+# thread, sem criar uma imagem intermediária por cartão.
+#
+# A saída é codificada no formato escolhido (PNG paletizado por padrão) e, se
+# passar do tamanho alvo, desce uma escada de formatos cada vez mais compactos
+# até caber: anexos menores deixam os envios ao Discord mais rápidos.
+
+log = logging.getLogger("valbot.render")
+
+CARD_BACKGROUND = (24, 25, 28, 255)
+GRID_BACKGROUND = (18, 18, 20, 255)  # Fundo bem escuro
+SHADOW_FILL = (0, 0, 0, 180)
+TEXT_FILL = (255, 255, 255, 255)
+
+GRID_FORMATS = ('png', 'png-optimized', 'png-palette', 'webp-lossless', 'webp')
+# Alternativas tentadas, em ordem, quando a saída passa do tamanho alvo
+FALLBACK_LADDER = (('png-palette', None), ('webp', 80), ('webp', 65), ('webp', 50))
+
+
+def load_card_font(path="arial.ttf", size=10):
+    """Carrega a fonte dos nomes das skins, com fallback para a padrão."""
+    try:
+        return ImageFont.truetype(path, size)  # Fonte menor para caber nomes longos
+    except IOError:
+        return ImageFont.load_default()
+
+
+def _encode(image, fmt, quality):
+    output = io.BytesIO()
+    if fmt == 'png':
+        image.save(output, format='PNG')
+    elif fmt == 'png-optimized':
+        image.save(output, format='PNG', optimize=True)
+    elif fmt == 'png-palette':
+        image.quantize(256, method=Image.Quantize.FASTOCTREE).save(output, format='PNG', optimize=True)
+    elif fmt == 'webp-lossless':
+        image.save(output, format='WEBP', lossless=True, method=4)
+    elif fmt == 'webp':
+        image.save(output, format='WEBP', quality=quality, method=4)
+    else:
+        raise ValueError(f"Formato de imagem desconhecido: {fmt}")
+    return output.getvalue()
+
+
+def encode_grid(image, fmt='png-palette', target_bytes=None, quality=85):
+    """Codifica a grade; retorna (bytes, descrição do formato escolhido).
+
+    Se o resultado passar de `target_bytes`, tenta as alternativas mais
+    compactas e fica com a primeira que couber (ou a menor de todas).
+    """
+    has_webp = features.check('webp')
+    if fmt.startswith('webp') and not has_webp:
+        fmt = 'png-palette'
+    # A grade é opaca: o canal alfa só ocuparia espaço
+    rgb = image.convert('RGB')
+    data = _encode(rgb, fmt, quality)
+    chosen = fmt if fmt != 'webp' else f"webp q{quality}"
+
+    if target_bytes and len(data) > target_bytes:
+        # Só o WebP com perdas usa a qualidade; o formato inicial não é codificado de novo
+        tried = {(fmt, quality if fmt == 'webp' else None)}
+        for candidate, candidate_quality in FALLBACK_LADDER:
+            if candidate.startswith('webp') and not has_webp:
+                continue
+            if (candidate, candidate_quality) in tried:
+                continue
+            encoded = _encode(rgb, candidate, candidate_quality)
+            if len(encoded) < len(data):
+                data = encoded
+                chosen = candidate if candidate_quality is None else f"{candidate} q{candidate_quality}"
+            if len(data) <= target_bytes:
+                break
+
+    log.debug("Grade codificada como %s: %.1f KB.", chosen, len(data) / 1024,
+              extra={'encoding': chosen, 'bytes': len(data), 'target_bytes': target_bytes})
+    return data, chosen
+
+
+def image_filename(data, stem="skin_grid"):
+    """Nome do anexo com a extensão certa para os bytes codificados."""
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return f"{stem}.webp"
+    return f"{stem}.png"
+
+
+class SkinGridRenderer:
+    """Compõe grades de cartões (ícone + nome) reaproveitando fonte, fundo, rótulos e tela."""
+
+    def __init__(self, card_width=150, card_height=90, padding=5, font_path="arial.ttf", font_size=10,
+                 max_labels=2048, output_format='png-palette', target_bytes=None, quality=85):
+        self.card_width = card_width
+        self.card_height = card_height
+        self.padding = padding
+        self.max_labels = max_labels
+        self.output_format = output_format
+        self.target_bytes = target_bytes
+        self.quality = quality
+        self.font = load_card_font(font_path, font_size)
+        self.card_template = Image.new('RGBA', (card_width, card_height), CARD_BACKGROUND)
+        # Altura da linha medida uma vez (o rótulo inclui o deslocamento de 1px da sombra)
+        _, top, _, bottom = self.font.getbbox("Ág")
+        self._label_height = bottom + 2
+        self._labels = OrderedDict()  # nome -> (rótulo RGBA, largura do texto)
+        self._labels_lock = threading.Lock()
+        self._local = threading.local()  # Tela reaproveitada por thread
+        self.label_hits = 0
+        self.label_misses = 0
+
+    # --- Rótulos ---
+    def label(self, name):
+        """Rótulo do nome (sombra + texto) já renderizado, em cache por nome."""
+        # Truncar texto se for muito longo
+        if len(name) > 20:
+            name = name[:18] + "..."
+        with self._labels_lock:
+            cached = self._labels.get(name)
+            if cached is not None:
+                self._labels.move_to_end(name)
+                self.label_hits += 1
+                return cached
+            self.label_misses += 1
+
+        text_width = self.font.getlength(name)
+        label = Image.new('RGBA', (int(text_width) + 2, self._label_height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(label)
+        # Desenhar o texto com sombra para legibilidade
+        draw.text((1, 1), name, font=self.font, fill=SHADOW_FILL)  # sombra
+        draw.text((0, 0), name, font=self.font, fill=TEXT_FILL)  # texto
+
+        with self._labels_lock:
+            self._labels[name] = (label, text_width)
+            while len(self._labels) > self.max_labels:
+                self._labels.popitem(last=False)
+        return label, text_width
+
+    # --- Composição ---
+    def grid_size(self, count, grid_cols):
+        grid_cols = min(grid_cols, count)
+        grid_rows = (count + grid_cols - 1) // grid_cols
+        width = (self.card_width * grid_cols) + (self.padding * (grid_cols + 1))
+        height = (self.card_height * grid_rows) + (self.padding * (grid_rows + 1))
+        return grid_cols, grid_rows, width, height
+
+    def _canvas(self, width, height):
+        """Tela da thread atual para o tamanho pedido, limpa com o fundo da grade."""
+        canvases = getattr(self._local, 'canvases', None)
+        if canvases is None:
+            canvases = self._local.canvases = {}
+        canvas = canvases.get((width, height))
+        if canvas is None:
+            canvas = canvases[(width, height)] = Image.new('RGBA', (width, height), GRID_BACKGROUND)
+        else:
+            canvas.paste(GRID_BACKGROUND, (0, 0, width, height))
+        return canvas
+
+    def render(self, skins, grid_cols=4):
+        """Compõe [(nome, miniatura RGBA)] numa grade.
+
+        A imagem retornada é a tela reaproveitada da thread: deve ser codificada
+        antes da próxima renderização na mesma thread.
+        """
+        if not skins:
+            return None
+        grid_cols, grid_rows, width, height = self.grid_size(len(skins), grid_cols)
+        canvas = self._canvas(width, height)
+
+        for i, (name, thumbnail) in enumerate(skins):
+            x = self.padding + (i % grid_cols) * (self.card_width + self.padding)
+            y = self.padding + (i // grid_cols) * (self.card_height + self.padding)
+            canvas.paste(self.card_template, (x, y))
+
+            # Ícone centralizado com margem superior pequena
+            x_offset = (self.card_width - thumbnail.width) // 2
+            canvas.paste(thumbnail, (x + x_offset, y + 5), thumbnail)
+
+            # Nome da skin na parte inferior
+            label, text_width = self.label(name)
+            text_x = int((self.card_width - text_width) // 2)
+            canvas.paste(label, (x + text_x, y + self.card_height - 18), label)
+
+        log.debug("Grade %dx%d de cartões criada.", grid_cols, grid_rows)
+        return canvas
+
+    def render_bytes(self, skins, grid_cols=4):
+        """Compõe a grade e retorna os bytes no formato de saída configurado (ou None sem skins)."""
+        canvas = self.render(skins, grid_cols)
+        if canvas is None:
+            return None
+        data, _ = encode_grid(canvas, self.output_format, self.target_bytes, self.quality)
+        return data
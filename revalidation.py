@@ -0,0 +1,95 @@
+import logging
+import time
+
+# --- Revalidação das contas já publicadas ---
+# Percorre os mapeamentos com mensagem publicada, do verificado há mais tempo ao
+# mais recente, e consulta cada conta na LZT com prioridade baixa e só enquanto
+# sobrar orçamento no limitador de taxa (o polling dos feeds sempre vem antes).
+# Contas vendidas, removidas ou com preço alterado são repassadas ao callback,
+# que edita ou retira a mensagem no Discord.
+#
+# A consulta usa o mesmo endpoint de detalhes da conta (/{item_id}) que o
+# pipeline: a LZT não oferece um endpoint só de estado/preço. Cada conta
+# verificada custa uma requisição completa, por isso o lote é pequeno e só
+# roda com folga no limitador.
+
+log = logging.getLogger("valbot.revalidate")
+
+STATUS_ACTIVE = 'active'
+STATUS_SOLD = 'sold'
+STATUS_REMOVED = 'removed'
+
+
+def classify_item(status_code, payload):
+    """Retorna o estado da conta pela resposta da LZT ou None se a consulta não foi conclusiva."""
+    if status_code == 404:
+        return STATUS_REMOVED, None
+    if status_code != 200 or not payload or 'item' not in payload:
+        return None, None
+    item_data = payload['item']
+    item_state = item_data.get('item_state')
+    if item_state == 'paid':
+        return STATUS_SOLD, item_data
+    if item_state and item_state != 'active':
+        return STATUS_REMOVED, item_data
+    return STATUS_ACTIVE, item_data
+
+
+def price_changed(old_price, new_price):
+    try:
+        return old_price is not None and abs(float(new_price) - float(old_price)) >= 0.01
+    except (TypeError, ValueError):
+        return False
+
+
+class ListingRevalidator:
+    """Verifica em segundo plano se as contas publicadas continuam à venda pelo mesmo preço."""
+
+    def __init__(self, client, limiter, store, on_change, batch_size=5, spare_tokens=3, min_age_seconds=1800,
+                 run_blocking=None):
+        self.client = client
+        self.limiter = limiter
+        self.store = store
+        self.on_change = on_change  # async (linha do mapeamento, estado, detalhes ou None) -> edita a mensagem
+        self.run_blocking = run_blocking  # async (fn, *args) -> roda a leitura do banco fora do loop (None = direto)
+        self.batch_size = batch_size
+        self.spare_tokens = spare_tokens  # Fichas que ficam reservadas para o polling
+        self.min_age_seconds = min_age_seconds  # Intervalo mínimo entre verificações da mesma conta
+        self.checked = 0
+        self.changed = 0
+
+    async def run_once(self):
+        """Verifica um lote de contas; retorna quantas foram consultadas."""
+        checked_before = time.time() - self.min_age_seconds
+        if self.run_blocking is not None:
+            rows = await self.run_blocking(self.store.load_revalidation_batch, self.batch_size, checked_before)
+        else:
+            rows = self.store.load_revalidation_batch(self.batch_size, checked_before)
+        probed = 0
+        for row in rows:
+            if self.limiter is not None and not self.limiter.has_spare(self.spare_tokens):
+                break  # Sem orçamento sobrando: o resto fica para a próxima rodada
+            client_id, item_id, namespace, price, currency, channel_id, message_id = row
+            status_code, payload = await self.client.probe_item(item_id)
+            probed += 1
+            self.checked += 1
+            status, item_data = classify_item(status_code, payload)
+            if status is None:
+                # Consulta inconclusiva: vai para o fim da fila e tenta de novo depois
+                self.store.mark_checked(client_id, STATUS_ACTIVE)
+                continue
+
+            new_price = item_data.get('price') if item_data else None
+            if status != STATUS_ACTIVE or price_changed(price, new_price):
+                self.changed += 1
+                log.info("Conta %s: %s, preço %s -> %s.", client_id, status, price, new_price,
+                         extra={'item_id': item_id, 'client_id': client_id, 'status': status})
+                try:
+                    await self.on_change(row, status, item_data)
+                except Exception as e:
+                    log.exception("Falha ao atualizar a mensagem da conta %s: %s", client_id, e, extra={'item_id': item_id})
+            self.store.mark_checked(
+                client_id, status,
+                price=new_price, currency=item_data.get('price_currency') if item_data else None,
+            )
+        return probed
@@ -0,0 +1,66 @@
+import time
+from collections import deque
+
+# --- Janela de IDs vistos ---
+# Os IDs ficam em baldes por hora dentro de um horizonte fixo (o tempo em que uma
+# conta ainda pode aparecer como nova na listagem). Baldes fora do horizonte são
+# descartados inteiros, e um teto de IDs descarta os baldes mais antigos antes
+# do prazo, então a memória não cresce com o tempo de execução do bot.
+
+
+class SeenIdWindow:
+    """Conjunto de IDs vistos com expiração por tempo e teto de memória."""
+
+    def __init__(self, horizon_seconds, max_ids, bucket_seconds=3600):
+        self.horizon_seconds = horizon_seconds
+        self.max_ids = max_ids
+        self.bucket_seconds = bucket_seconds
+        self._buckets = deque()  # (início do balde, set de IDs), do mais antigo ao mais novo
+        self._index = {}  # item_id -> início do balde (teste de pertinência O(1))
+
+    def __contains__(self, item_id):
+        return item_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def add(self, item_id, seen_at=None):
+        seen_at = time.time() if seen_at is None else seen_at
+        if item_id in self._index:
+            return
+        bucket_start = int(seen_at // self.bucket_seconds) * self.bucket_seconds
+        if self._buckets and self._buckets[-1][0] == bucket_start:
+            bucket = self._buckets[-1][1]
+        elif not self._buckets or self._buckets[-1][0] < bucket_start:
+            bucket = set()
+            self._buckets.append((bucket_start, bucket))
+        else:
+            # Carga fora de ordem (ex.: leitura do banco): procura o balde certo
+            bucket = self._bucket_for(bucket_start)
+        bucket.add(item_id)
+        self._index[item_id] = bucket_start
+        self.expire(seen_at)
+
+    def _bucket_for(self, bucket_start):
+        for index, (start, bucket) in enumerate(self._buckets):
+            if start == bucket_start:
+                return bucket
+            if start > bucket_start:
+                bucket = set()
+                self._buckets.insert(index, (bucket_start, bucket))
+                return bucket
+        bucket = set()
+        self._buckets.append((bucket_start, bucket))
+        return bucket
+
+    def expire(self, now=None):
+        """Descarta baldes fora do horizonte e, se preciso, os mais antigos para respeitar o teto."""
+        now = time.time() if now is None else now
+        cutoff = now - self.horizon_seconds
+        while self._buckets and (
+            self._buckets[0][0] + self.bucket_seconds <= cutoff
+            or (len(self._index) > self.max_ids and len(self._buckets) > 1)
+        ):
+            _, bucket = self._buckets.popleft()
+            for item_id in bucket:
+                del self._index[item_id]
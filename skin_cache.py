@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import threading
+import time
+import requests
+
+# --- Catálogo local de skins da valorant-api.com ---
+# Os metadados das skins são praticamente estáticos, então ficam em um arquivo
+# JSON indexado por UUID (de skin ou de nível de skin). UUIDs "standard" ou
+# desconhecidos entram em um cache negativo para não serem consultados de novo.
+
+log = logging.getLogger("valbot.skins")
+
+
+class SkinCatalog:
+    """Cache persistente (com TTL) de nome e ícone das skins, indexado por UUID."""
+
+    def __init__(self, path, base_url, ttl_seconds, negative_ttl_seconds, request_timeout=5):
+        self.path = path
+        self.base_url = base_url.rstrip('/')
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.request_timeout = request_timeout
+        self.preloaded_at = 0
+        self._entries = {}  # uuid -> {'name', 'icon_url', 'ts'} ou {'missing': True, 'ts'}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._http = requests.Session()  # Conexões keep-alive com a valorant-api.com
+
+    # --- Persistência ---
+    def load(self):
+        """Carrega o catálogo do disco."""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                with self._lock:
+                    self._entries = data.get('entries', {})
+                    self.preloaded_at = data.get('preloaded_at', 0)
+                log.info("Carregadas %d entradas do catálogo de skins.", len(self._entries))
+        except Exception as e:
+            log.warning("Falha ao carregar catálogo: %s", e)
+            self._entries = {}
+
+    def save(self):
+        """Grava o catálogo no disco (escrita atômica) se houver alterações."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'preloaded_at': self.preloaded_at, 'entries': dict(self._entries)}
+            self._dirty = False
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            log.warning("Falha ao salvar catálogo: %s", e)
+
+    # --- Consulta ---
+    def _store(self, skin_uuid, name, icon_url, now):
+        # Mesma regra da busca original: skins "standard" ou sem ícone não entram na grade
+        if name and 'standard' not in name.lower() and icon_url:
+            self._entries[skin_uuid] = {'name': name, 'icon_url': icon_url, 'ts': now}
+        else:
+            self._entries[skin_uuid] = {'missing': True, 'ts': now}
+        self._dirty = True
+
+    def _cached(self, skin_uuid, now):
+        """Retorna (encontrado, detalhes) a partir do cache, respeitando o TTL."""
+        entry = self._entries.get(skin_uuid)
+        if entry is None:
+            return False, None
+        if entry.get('missing'):
+            if now - entry['ts'] < self.negative_ttl_seconds:
+                return True, None
+            return False, None
+        if now - entry['ts'] < self.ttl_seconds:
+            return True, {'name': entry['name'], 'icon_url': entry['icon_url'], 'uuid': skin_uuid}
+        return False, None
+
+    def _fetch_json(self, url):
+        response = self._http.get(url, timeout=self.request_timeout)
+        if response.status_code != 200:
+            return response.status_code, None
+        payload = response.json()  # Parse único por resposta
+        if payload.get('status') != 200:
+            return response.status_code, None
+        return response.status_code, payload.get('data')
+
+    def lookup(self, skin_uuid):
+        """Busca NOME e URL do ÍCONE de uma skin, usando a rede só em cache miss."""
+        now = time.time()
+        with self._lock:
+            found, details = self._cached(skin_uuid, now)
+        if found:
+            return details
+
+        try:
+            status, skin_data = self._fetch_json(f"{self.base_url}/weapons/skins/{skin_uuid}")
+            if status == 404:
+                status, skin_data = self._fetch_json(f"{self.base_url}/weapons/skinlevels/{skin_uuid}")
+        except Exception as e:
+            # Erros de rede não são cacheados
+            log.warning("Erro ao buscar skin: %s", e, extra={'skin_uuid': skin_uuid})
+            return None
+
+        if skin_data is None and status not in (200, 404):
+            return None
+
+        with self._lock:
+            if skin_data:
+                self._store(skin_uuid, skin_data.get('displayName', 'Desconhecido'), skin_data.get('displayIcon'), now)
+            else:
+                self._store(skin_uuid, None, None, now)
+            _, details = self._cached(skin_uuid, now)
+        return details
+
+    # --- Pré-carga em lote ---
+    def needs_preload(self):
+        return time.time() - self.preloaded_at >= self.ttl_seconds
+
+    def preload(self):
+        """Carrega de uma vez todas as skins e níveis a partir de /weapons/skins."""
+        try:
+            status, skins = self._fetch_json(f"{self.base_url}/weapons/skins")
+        except Exception as e:
+            log.warning("Erro na pré-carga do catálogo: %s", e)
+            return False
+        if not skins:
+            log.warning("Pré-carga do catálogo falhou (status %s).", status)
+            return False
+
+        now = time.time()
+        with self._lock:
+            for skin in skins:
+                if skin.get('uuid'):
+                    self._store(skin['uuid'], skin.get('displayName'), skin.get('displayIcon'), now)
+                for level in skin.get('levels') or []:
+                    if level.get('uuid'):
+                        self._store(level['uuid'], level.get('displayName'), level.get('displayIcon'), now)
+            self.preloaded_at = now
+            total = len(self._entries)
+        self.save()
+        log.info("Catálogo pré-carregado: %d skins, %d entradas.", len(skins), total)
+        return True
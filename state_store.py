@@ -0,0 +1,275 @@
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from client_ids import CODE_ALPHABET
+
+# --- Armazenamento de estado em SQLite ---
+# Um único banco (modo WAL) guarda os IDs vistos por feed, os mapeamentos de ID de
+# cliente -> ID real (com a mensagem publicada e o estado da revalidação) e as
+# configurações (margem, cursores). As escritas são acumuladas em memória e
+# gravadas em lote numa única transação.
+
+log = logging.getLogger("valbot.state")
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_ids (
+    feed TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (feed, item_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_seen_ids_seen_at ON seen_ids (seen_at);
+
+CREATE TABLE IF NOT EXISTS account_mapping (
+    client_id TEXT PRIMARY KEY,
+    item_id INTEGER NOT NULL,
+    feed TEXT,
+    namespace TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    price REAL,
+    currency TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_account_mapping_item ON account_mapping (item_id);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Colunas adicionadas depois da primeira versão: (versão, tabela, coluna, declaração)
+MIGRATIONS = [
+    # v2: mensagem publicada no canal do cliente e estado da revalidação
+    (2, 'account_mapping', 'channel_id', 'INTEGER'),
+    (2, 'account_mapping', 'message_id', 'INTEGER'),
+    (2, 'account_mapping', 'status', "TEXT NOT NULL DEFAULT 'active'"),
+    (2, 'account_mapping', 'checked_at', 'REAL'),
+]
+
+
+class StateStore:
+    """Estado persistente do bot com escritas em lote."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._pending_seen = []
+        self._pending_mappings = []
+        self._pending_checks = []
+        self._pending_settings = {}
+
+    # --- Ciclo de vida ---
+    def open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                self._migrate(version)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        log.info("Banco de estado aberto: %s", self.path)
+
+    def _migrate(self, version):
+        for target, table, column, declaration in MIGRATIONS:
+            if version >= target:
+                continue
+            columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_account_mapping_check ON account_mapping (status, checked_at)"
+        )
+        log.info("Banco migrado da versão %d para %d.", version, SCHEMA_VERSION)
+
+    def close(self):
+        if self._conn is None:
+            return
+        self.flush()
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+    # --- Leitura (inicialização) ---
+    def load_seen_ids(self, feed, since=0):
+        """Retorna [(item_id, seen_at)] do feed vistos a partir de `since`, do mais antigo ao mais novo."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT item_id, seen_at FROM seen_ids WHERE feed = ? AND seen_at >= ? ORDER BY seen_at",
+                (feed, since),
+            ).fetchall()
+
+    def load_mappings(self):
+        """Retorna {namespace: {client_id: item_id}}."""
+        mappings = {}
+        with self._lock:
+            rows = self._conn.execute("SELECT namespace, client_id, item_id FROM account_mapping").fetchall()
+        for namespace, client_id, item_id in rows:
+            mappings.setdefault(namespace, {})[client_id] = item_id
+        return mappings
+
+    def load_revalidation_batch(self, limit, checked_before):
+        """Mapeamentos ativos com mensagem publicada, verificados há mais tempo primeiro.
+
+        Retorna [(client_id, item_id, namespace, price, currency, channel_id, message_id)].
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT client_id, item_id, namespace, price, currency, channel_id, message_id "
+                "FROM account_mapping WHERE status = 'active' AND message_id IS NOT NULL "
+                "AND COALESCE(checked_at, created_at) < ? "
+                "ORDER BY COALESCE(checked_at, created_at) LIMIT ?",
+                (checked_before, limit),
+            ).fetchall()
+
+    def get_setting(self, key, default=None):
+        if key in self._pending_settings:
+            return self._pending_settings[key]
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM settings WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    # --- Limpeza ---
+    def prune_seen(self, before):
+        """Apaga IDs vistos antes de `before` (fora do horizonte de listagem)."""
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM seen_ids WHERE seen_at < ?", (before,)).rowcount
+        if deleted:
+            log.info("%d IDs vistos expirados removidos do banco.", deleted)
+        return deleted
+
+    # --- Escrita (em lote) ---
+    def add_seen(self, feed, item_id):
+        self._pending_seen.append((feed, item_id, time.time()))
+
+    def add_mapping(self, client_id, item_id, feed, namespace, price=None, currency=None,
+                    channel_id=None, message_id=None):
+        now = time.time()
+        self._pending_mappings.append(
+            (client_id, item_id, feed, namespace, now, now, price, currency, channel_id, message_id, now)
+        )
+
+    def mark_checked(self, client_id, status, price=None, currency=None):
+        """Registra o resultado da revalidação de uma conta publicada."""
+        self._pending_checks.append((status, time.time(), price, currency, client_id))
+
+    def set_setting(self, key, value):
+        self._pending_settings[key] = value
+
+    def has_pending(self):
+        return bool(self._pending_seen or self._pending_mappings or self._pending_checks or self._pending_settings)
+
+    def flush(self):
+        """Grava as escritas acumuladas numa única transação (seguro para rodar no executor)."""
+        seen, self._pending_seen = self._pending_seen, []
+        mappings, self._pending_mappings = self._pending_mappings, []
+        checks, self._pending_checks = self._pending_checks, []
+        settings, self._pending_settings = self._pending_settings, {}
+        if not (seen or mappings or checks or settings):
+            return
+        try:
+            with self._lock, self._conn:
+                if seen:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO seen_ids (feed, item_id, seen_at) VALUES (?, ?, ?)", seen
+                    )
+                if mappings:
+                    self._conn.executemany(
+                        "INSERT INTO account_mapping "
+                        "(client_id, item_id, feed, namespace, created_at, updated_at, price, currency, "
+                        "channel_id, message_id, checked_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        # Conta relistada reaproveita o código: mantém created_at e atualiza o resto
+                        "ON CONFLICT (client_id) DO UPDATE SET item_id = excluded.item_id, "
+                        "feed = COALESCE(excluded.feed, feed), namespace = excluded.namespace, "
+                        "updated_at = excluded.updated_at, price = excluded.price, currency = excluded.currency, "
+                        "channel_id = excluded.channel_id, message_id = excluded.message_id, "
+                        "status = 'active', checked_at = excluded.checked_at",
+                        mappings,
+                    )
+                if checks:
+                    self._conn.executemany(
+                        "UPDATE account_mapping SET status = ?, checked_at = ?, "
+                        "price = COALESCE(?, price), currency = COALESCE(?, currency) WHERE client_id = ?",
+                        checks,
+                    )
+                if settings:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                        [(key, json.dumps(value)) for key, value in settings.items()],
+                    )
+        except Exception as e:
+            # Devolve as escritas para a próxima tentativa
+            log.error("Falha ao gravar lote: %s", e)
+            self._pending_seen[:0] = seen
+            self._pending_mappings[:0] = mappings
+            self._pending_checks[:0] = checks
+            for key, value in settings.items():
+                self._pending_settings.setdefault(key, value)
+
+    # --- Migração dos arquivos JSON antigos ---
+    @staticmethod
+    def _unused_code(used, length):
+        length = max(1, length)
+        while True:
+            for _ in range(20):
+                code = ''.join(secrets.choice(CODE_ALPHABET) for _ in range(length))
+                if code not in used:
+                    return code
+            length += 1
+
+    def migrate_json(self, seen_files, mapping_files, margin_file, cursors_file):
+        """Importa uma única vez o estado dos arquivos JSON usados antes do SQLite."""
+        if self.get_setting('migrated_json'):
+            return
+
+        def read_json(path):
+            if not os.path.exists(path):
+                return None
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                log.warning("Falha ao ler %s na migração: %s", path, e)
+                return None
+
+        for feed, path in seen_files.items():
+            for item_id in read_json(path) or []:
+                self.add_seen(feed, item_id)
+        # Os arquivos antigos eram separados por namespace e podiam repetir um código.
+        # O banco exige código único: a conta repetida ganha um código novo em vez de
+        # sobrescrever a outra.
+        with self._lock:
+            used = dict(self._conn.execute("SELECT client_id, item_id FROM account_mapping").fetchall())
+        for namespace, path in mapping_files.items():
+            for client_id, item_id in (read_json(path) or {}).items():
+                if client_id in used:
+                    if str(used[client_id]) == str(item_id):
+                        continue  # Mesma conta nos dois arquivos: um mapeamento basta
+                    new_id = self._unused_code(used, len(client_id))
+                    log.warning("Código %s repetido na migração (conta %s já usa); conta %s (%s) passa a ser %s.",
+                                client_id, used[client_id], item_id, namespace, new_id,
+                                extra={'client_id': new_id, 'item_id': item_id})
+                    client_id = new_id
+                used[client_id] = item_id
+                self.add_mapping(client_id, item_id, None, namespace)
+        margin = read_json(margin_file)
+        if margin:
+            self.set_setting('price_margin', margin.get('margin', 0))
+        for feed, cursor in (read_json(cursors_file) or {}).items():
+            self.set_setting(f"cursor:{feed}", cursor)
+
+        self.set_setting('migrated_json', True)
+        self.flush()
+        log.info("Estado dos arquivos JSON importado para o SQLite.")
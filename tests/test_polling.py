@@ -0,0 +1,32 @@
+from polling import AdaptiveSchedule
+
+
+def make_schedule(**overrides):
+    options = dict(initial_interval=90, min_interval=30, max_interval=300, budget_per_hour=1000, target_per_poll=1.0)
+    options.update(overrides)
+    return AdaptiveSchedule("teste", **options)
+
+
+def test_cold_start_with_new_items_polls_soon():
+    schedule = make_schedule()
+    assert schedule.record(25, now=1000) == 30
+    # Um ciclo vazio logo depois não joga o feed para o intervalo máximo
+    assert schedule.record(0, now=1030) == 30
+
+
+def test_cold_start_without_new_items_keeps_initial_interval():
+    schedule = make_schedule()
+    assert schedule.record(0, now=1000) == 90
+
+
+def test_idle_feed_backs_off_to_max_interval():
+    schedule = make_schedule()
+    schedule.record(0, now=1000)
+    assert schedule.record(0, now=1090) == 300
+
+
+def test_budget_caps_interval():
+    schedule = make_schedule(budget_per_hour=2)
+    schedule.record(25, now=1000)
+    # Orçamento esgotado: espera a primeira requisição sair da janela de uma hora
+    assert schedule.record(25, now=1030) == 3570
@@ -0,0 +1,201 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+# --- Rastreamento de latência ponta a ponta ---
+# Cada conta nova ganha um rastro desde o published_date da listagem até o
+# channel.send no canal do cliente. Os estágios registram intervalos (início e
+# fim em horário de relógio, para comparar com o published_date da LZT) e, quando
+# a conta é publicada, a duração de cada estágio entra numa janela por feed. Os
+# percentis saem dessas janelas (comando do bot) e de um histograma (/metrics).
+#
+# Estágios registrados:
+#   discovery      published_date -> fim do polling que encontrou a conta
+#   poll           duração do polling que encontrou a conta
+#   wait_<estágio> espera nas filas do pipeline (detail, render, send)
+#   detail         busca dos detalhes na LZT
+#   skins          metadados das skins (catálogo / valorant-api)
+#   icons          download/decodificação dos ícones
+#   render         composição e codificação da grade
+#   send           channel.send no canal do cliente
+#   pipeline       fim do polling -> mensagem enviada
+#   total          published_date -> mensagem enviada
+
+log = logging.getLogger("valbot.trace")
+
+QUANTILES = (0.5, 0.9, 0.99)
+STAGES = (
+    'discovery', 'poll', 'wait_detail', 'detail', 'wait_render', 'skins', 'icons', 'render',
+    'wait_send', 'send', 'pipeline', 'total',
+)
+
+
+def percentile(sorted_values, quantile):
+    """Percentil por posto mais próximo de uma lista já ordenada."""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(quantile * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class _Span:
+    def __init__(self, trace, stage):
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.add(self.stage, self.start, time.time())
+        return False
+
+
+class ItemTrace:
+    """Intervalos registrados para uma conta (seguro para uso a partir de threads)."""
+
+    def __init__(self, tracer, feed, item_id, published_at=None, polled_at=None):
+        self.tracer = tracer
+        self.feed = feed
+        self.item_id = item_id
+        self.published_at = published_at  # published_date da LZT (epoch) ou None
+        self.polled_at = polled_at  # Fim do polling que encontrou a conta
+        self.spans = []  # (estágio, início, fim)
+        self._lock = threading.Lock()
+
+    def span(self, stage):
+        """Context manager que registra a duração do bloco no estágio."""
+        return _Span(self, stage)
+
+    def add(self, stage, start, end):
+        with self._lock:
+            self.spans.append((stage, start, end))
+
+    def durations(self):
+        """Duração de cada estágio: do primeiro início ao último fim (skins em paralelo contam uma vez)."""
+        bounds = {}
+        with self._lock:
+            spans = list(self.spans)
+        for stage, start, end in spans:
+            first, last = bounds.get(stage, (start, end))
+            bounds[stage] = (min(first, start), max(last, end))
+        return {stage: max(0.0, end - start) for stage, (start, end) in bounds.items()}
+
+    def sent_at(self):
+        """Fim do último envio ao Discord, ou None se a conta não foi enviada."""
+        with self._lock:
+            ends = [end for stage, _, end in self.spans if stage == 'send']
+        return max(ends) if ends else None
+
+    def finish(self, success):
+        self.tracer.finish(self, success)
+
+
+class _NullTrace:
+    """Rastro vazio para contas fora do pipeline (/buscar, revalidação)."""
+
+    feed = None
+    item_id = None
+
+    def span(self, stage):
+        return _NullSpan()
+
+    def add(self, stage, start, end):
+        pass
+
+    def finish(self, success):
+        pass
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TRACE = _NullTrace()
+
+
+class LatencyTracer:
+    """Rastros ativos por item_id e janelas de durações por feed e estágio."""
+
+    def __init__(self, max_samples=500, histogram=None):
+        self.max_samples = max_samples
+        self.histogram = histogram  # Histograma (feed, stage) do registro de métricas, opcional
+        self.completed = {}  # feed -> contas publicadas
+        self.failed = {}  # feed -> contas que não chegaram ao envio
+        self._active = {}  # item_id -> ItemTrace
+        self._samples = {}  # feed -> {estágio: deque de durações}
+        self._lock = threading.Lock()
+
+    def start(self, feed, item_id, published_at=None, polled_at=None):
+        """Abre o rastro de uma conta nova (substitui um rastro anterior do mesmo item)."""
+        trace = ItemTrace(self, feed, item_id, published_at, polled_at)
+        with self._lock:
+            self._active[item_id] = trace
+        return trace
+
+    def get(self, item_id):
+        """Rastro ativo do item ou NULL_TRACE (nunca None)."""
+        with self._lock:
+            return self._active.get(item_id, NULL_TRACE)
+
+    def discard(self, item_id):
+        with self._lock:
+            self._active.pop(item_id, None)
+
+    def finish(self, trace, success):
+        with self._lock:
+            if self._active.get(trace.item_id) is trace:
+                del self._active[trace.item_id]
+            if not success:
+                self.failed[trace.feed] = self.failed.get(trace.feed, 0) + 1
+                return
+            self.completed[trace.feed] = self.completed.get(trace.feed, 0) + 1
+
+        durations = trace.durations()
+        sent_at = trace.sent_at()
+        if sent_at is not None:
+            if trace.polled_at is not None:
+                durations['pipeline'] = max(0.0, sent_at - trace.polled_at)
+            if trace.published_at:
+                durations['total'] = max(0.0, sent_at - trace.published_at)
+
+        with self._lock:
+            samples = self._samples.setdefault(trace.feed, {})
+            for stage, duration in durations.items():
+                window = samples.get(stage)
+                if window is None:
+                    window = samples[stage] = deque(maxlen=self.max_samples)
+                window.append(duration)
+        if self.histogram is not None:
+            for stage, duration in durations.items():
+                self.histogram.observe(duration, trace.feed, stage)
+
+        log.debug("Latência da conta registrada.", extra={
+            'item_id': trace.item_id,
+            'feed': trace.feed,
+            'stages_ms': {stage: round(duration * 1000, 1) for stage, duration in durations.items()},
+        })
+
+    def active(self):
+        with self._lock:
+            return len(self._active)
+
+    def feeds(self):
+        with self._lock:
+            return sorted(self._samples)
+
+    def percentiles(self, feed, quantiles=QUANTILES):
+        """{estágio: (amostras, [percentis em segundos])} da janela do feed."""
+        with self._lock:
+            samples = {stage: sorted(window) for stage, window in self._samples.get(feed, {}).items()}
+        return {
+            stage: (len(values), [percentile(values, quantile) for quantile in quantiles])
+            for stage, values in samples.items()
+        }